@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Ghost: Black Ops - Development cycle benchmarks
+
+Times every phase, every declared agent/helper task and the Unity
+integration step in throwaway workspaces, and compares the results with
+benchmarks/baseline.json.
+"""
+
+import argparse
+import asyncio
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+from harness import (compare, format_results, host_differences, load_baseline, load_config, measure,
+                     quiet_logger, save_baseline)
+
+from ai_director import AIDirector, DevelopmentPhase
+
+BASELINE_PATH = Path(__file__).resolve().parent / 'baseline.json'
+
+
+def component_for(director: AIDirector, owner: str):
+    if owner == 'task_manager':
+        return director.task_manager
+    return director.agents.get(owner) or director.helpers.get(owner)
+
+
+def ancestors(graph, names: List[str]) -> List[str]:
+    """Return every task the given tasks transitively depend on, in run order"""
+    needed = set()
+    pending = list(names)
+    while pending:
+        for dependency in graph.dependencies[pending.pop()]:
+            if dependency not in needed:
+                needed.add(dependency)
+                pending.append(dependency)
+    return [name for name in graph.order if name in needed]
+
+
+async def run_tasks(director: AIDirector, graph, names: List[str]):
+    for name in names:
+        spec = graph.specs[name]
+        await getattr(component_for(director, spec.owner), spec.method)()
+
+
+def benchmarks(config: Dict, logger) -> Dict:
+    """Map benchmark names to (setup, target) pairs"""
+    async def new_director(prerequisites=None):
+        director = AIDirector(config, logger)
+        await director.initialize_agents()
+        graph = director.build_task_graph()
+        if prerequisites:
+            await run_tasks(director, graph, prerequisites(graph))
+        return {'config': config, 'director': director, 'graph': graph}
+
+    cases = {}
+    for phase in DevelopmentPhase:
+        def phase_setup(phase=phase.value):
+            def prerequisites(graph):
+                tasks = graph.phase_tasks()[phase]
+                return [name for name in ancestors(graph, tasks) if graph.specs[name].phase != phase]
+            return new_director(prerequisites)
+
+        async def phase_target(state, phase=phase.value):
+            await state['director'].execute_phase(phase)
+
+        cases[f"phase:{phase.value}"] = (phase_setup, phase_target)
+
+    async def list_tasks():
+        state = await new_director()
+        return state['graph'].order
+
+    for name in asyncio.run(list_tasks()):
+        def task_setup(name=name):
+            return new_director(lambda graph: ancestors(graph, [name]))
+
+        async def task_target(state, name=name):
+            await run_tasks(state['director'], state['graph'], [name])
+
+        cases[f"task:{name}"] = (task_setup, task_target)
+
+    async def integration_noop_setup():
+        state = await new_director(lambda graph: ancestors(graph, ['unity_helper.integrate_assets']))
+        await run_tasks(state['director'], state['graph'], ['unity_helper.integrate_assets'])
+        return state
+
+    async def integration_noop_target(state):
+        await state['director'].helpers['unity_helper'].integrate_assets()
+
+    cases["unity:integrate_unchanged"] = (integration_noop_setup, integration_noop_target)
+    return cases
+
+
+async def run_benchmarks(cases: Dict, repeat: int, pattern: str):
+    results = []
+    for name, (setup, target) in cases.items():
+        if pattern and pattern not in name:
+            continue
+        results.append(await measure(name, setup, target, repeat))
+        print(f"  measured {name}", file=sys.stderr)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the Ghost: Black Ops development cycle')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per benchmark')
+    parser.add_argument('--filter', type=str, default='', help='Only run benchmarks whose name contains this')
+    parser.add_argument('--baseline', type=Path, default=BASELINE_PATH, help='Baseline JSON to compare against')
+    parser.add_argument('--tolerance', type=float, default=None,
+                        help='Allowed relative slowdown (default: the baseline\'s tolerance, else 0.5)')
+    parser.add_argument('--update-baseline', action='store_true', help='Write the results as the new baseline')
+    args = parser.parse_args()
+
+    config = load_config()
+    logger = quiet_logger()
+    results = asyncio.run(run_benchmarks(benchmarks(config, logger), args.repeat, args.filter))
+
+    baseline = load_baseline(args.baseline)
+    tolerance = args.tolerance if args.tolerance is not None else (baseline or {}).get('tolerance', 0.5)
+    print('\n'.join(format_results(results, baseline)))
+
+    if args.update_baseline:
+        save_baseline(args.baseline, results, tolerance)
+        print(f"Baseline written to {args.baseline}")
+        return
+    if baseline is None:
+        print(f"No baseline at {args.baseline}; run with --update-baseline to create one")
+        return
+
+    differences = host_differences(baseline)
+    if differences:
+        print(
+            f"\nWarning: baseline was recorded on a different host ({', '.join(differences)}); "
+            f"skipping time and allocation checks, comparing file counts only. "
+            f"Run with --update-baseline on this host for a full comparison."
+        )
+    regressions = compare(results, baseline, tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} regressions beyond {tolerance:.0%} tolerance:")
+        for regression in regressions:
+            print(f"  {regression}")
+        sys.exit(1)
+    print(f"\nNo regressions beyond {tolerance:.0%} tolerance")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Ghost: Black Ops - C# template rendering micro-benchmark
+
+Measures records per second for every compiled script template, rendered
+one record per call and in batches, at growing catalog sizes. Fails when
+the per-record cost at the largest size grows beyond --max-growth times
+the cost at the smallest, so rendering stays linear as catalogs grow.
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from scale_test import catalogs
+
+from game_agents.asset_generator import (render_gear_script, render_gear_scripts, render_weapon_script,
+                                         render_weapon_scripts)
+from game_agents.character_creator import render_character_script, render_character_scripts
+from game_agents.mission_planner import render_mission_script, render_mission_scripts
+
+# (template, catalog, render one record, render a batch)
+TEMPLATES = [
+    ('weapon', 'weapons', render_weapon_script, render_weapon_scripts),
+    ('gear', 'gear', render_gear_script, render_gear_scripts),
+    ('character', 'characters', lambda record: render_character_script(record, False), render_character_scripts),
+    ('mission', 'missions', render_mission_script, render_mission_scripts)
+]
+
+
+def best_time(target: Callable[[], List[str]], repeat: int) -> float:
+    """Fastest of repeat runs, the least noisy estimate for a pure function"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        target()
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark C# template rendering throughput')
+    parser.add_argument('--factors', type=str, default='10,100,1000',
+                        help='Comma-separated multipliers of the built-in catalogs')
+    parser.add_argument('--repeat', type=int, default=5, help='Timed runs per measurement')
+    parser.add_argument('--filter', type=str, default='', help='Only run templates whose name contains this')
+    parser.add_argument('--max-growth', type=float, default=1.5,
+                        help='Fail when per-record cost grows more than this between the smallest and largest size')
+    parser.add_argument('--output', type=Path, help='Write the raw measurements as JSON')
+    args = parser.parse_args()
+
+    factors = sorted(int(f) for f in args.factors.split(','))
+    results: Dict[str, List[Dict]] = {}
+
+    print(f"{'template':<10} {'records':>8} {'single rec/s':>13} {'batch rec/s':>12} {'per record':>11} {'bytes/rec':>10}")
+    for factor in factors:
+        catalog = catalogs(factor)
+        for name, key, render_one, render_many in TEMPLATES:
+            if args.filter not in name:
+                continue
+            records = catalog[key]
+            single = best_time(lambda: [render_one(record) for record in records], args.repeat)
+            batch = best_time(lambda: render_many(records), args.repeat)
+            size = sum(len(script) for script in render_many(records)) / len(records)
+            point = {
+                'records': len(records),
+                'single_rate': len(records) / single,
+                'batch_rate': len(records) / batch,
+                'per_record': min(single, batch) / len(records),
+                'bytes_per_record': size
+            }
+            results.setdefault(name, []).append(point)
+            print(
+                f"{name:<10} {point['records']:>8} {point['single_rate']:>13,.0f} {point['batch_rate']:>12,.0f} "
+                f"{point['per_record'] * 1e6:9.2f}us {size:>10,.0f}"
+            )
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    flagged = []
+    for name, points in results.items():
+        growth = points[-1]['per_record'] / points[0]['per_record']
+        if growth > args.max_growth:
+            flagged.append(f"{name}: per-record cost grew {growth:.2f}x from {points[0]['records']} "
+                           f"to {points[-1]['records']} records")
+    if flagged:
+        print(f"\nTemplates whose per-record cost grew beyond {args.max_growth}x:")
+        for line in flagged:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nPer-record cost stayed within {args.max_growth}x across catalog sizes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Shared benchmark harness: repo configs, host details and baseline
+comparison around the workspaces and repeated measurements of
+utils.measurement
+"""
+
+import json
+import os
+import platform
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT / 'src'))
+
+from utils.config_schema import load_config as load_validated_config
+from utils.logger import GameLogger
+from utils.measurement import BenchmarkResult, measure, workspace
+
+# Absolute slack added to the relative tolerance so sub-millisecond
+# benchmarks do not fail on scheduler noise
+MIN_TIME_SLACK = 0.002
+MIN_ALLOC_SLACK = 64 * 1024
+
+
+def load_config(system_type: str = 'ubuntu') -> Dict:
+    """Load a repo config with the build cache off so every run does real work"""
+    config, _ = load_validated_config(str(ROOT / 'config' / f'{system_type}_config.yaml'), cache_path=None)
+    config['build']['cache_enabled'] = False
+    return config
+
+
+def quiet_logger() -> GameLogger:
+    """Console errors only, no log file"""
+    return GameLogger(log_level='ERROR', log_file=os.devnull)
+
+
+def host_info() -> Dict:
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpus': os.cpu_count()
+    }
+
+
+def host_differences(baseline: Dict) -> List[str]:
+    """Describe how this host differs from the one the baseline was recorded on"""
+    recorded = baseline.get('host', {})
+    return [
+        f"{key} {recorded.get(key)} -> {value}"
+        for key, value in host_info().items()
+        if recorded.get(key) != value
+    ]
+
+
+def compare(results: List[BenchmarkResult], baseline: Dict, tolerance: float) -> List[str]:
+    """Return a description of every regression against the baseline.
+
+    Timings and allocations are only comparable on the host the baseline
+    was recorded on, so elsewhere only file counts are checked.
+    """
+    regressions = []
+    known = baseline.get('benchmarks', {})
+    same_host = not host_differences(baseline)
+    for result in results:
+        base = known.get(result.name)
+        if base is None:
+            continue
+        if result.files_written > base['files_written']:
+            regressions.append(
+                f"{result.name}: wrote {result.files_written} files (baseline {base['files_written']})"
+            )
+        if not same_host:
+            continue
+        time_limit = base['median'] * (1 + tolerance) + MIN_TIME_SLACK
+        if result.median > time_limit:
+            regressions.append(
+                f"{result.name}: median {result.median * 1000:.2f}ms > "
+                f"{time_limit * 1000:.2f}ms (baseline {base['median'] * 1000:.2f}ms)"
+            )
+        alloc_limit = base['peak_alloc'] * (1 + tolerance) + MIN_ALLOC_SLACK
+        if result.peak_alloc > alloc_limit:
+            regressions.append(
+                f"{result.name}: peak alloc {result.peak_alloc / 1024:.0f}KB > "
+                f"{alloc_limit / 1024:.0f}KB (baseline {base['peak_alloc'] / 1024:.0f}KB)"
+            )
+    return regressions
+
+
+def save_baseline(path: Path, results: List[BenchmarkResult], tolerance: float):
+    baseline = {
+        'tolerance': tolerance,
+        'host': host_info(),
+        'benchmarks': {
+            result.name: {key: value for key, value in asdict(result).items() if key not in ('name', 'samples')}
+            for result in results
+        }
+    }
+    with open(path, 'w') as f:
+        json.dump(baseline, f, indent=2, sort_keys=True)
+        f.write('\n')
+
+
+def load_baseline(path: Path) -> Optional[Dict]:
+    if not path.exists():
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def format_results(results: List[BenchmarkResult], baseline: Optional[Dict] = None) -> List[str]:
+    known = (baseline or {}).get('benchmarks', {})
+    lines = [
+        f"{'benchmark':<56} {'median':>9} {'p95':>9} {'vs base':>8} {'peak alloc':>11} {'files':>6}"
+    ]
+    for result in results:
+        base = known.get(result.name)
+        change = f"{(result.median / base['median'] - 1) * 100:+7.1f}%" if base and base['median'] else '      -'
+        lines.append(
+            f"{result.name:<56} {result.median * 1000:7.2f}ms {result.p95 * 1000:7.2f}ms {change:>8} "
+            f"{result.peak_alloc / 1024:9.0f}KB {result.files_written:>6}"
+        )
+    return lines
+
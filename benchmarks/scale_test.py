@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Ghost: Black Ops - Catalog scale test
+
+Feeds the content agents synthetic catalogs many times larger than the
+built-in content and fits time, memory and file-count scaling curves, so
+superlinear paths show up before production catalogs hit them.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import sys
+import time
+import tracemalloc
+from copy import deepcopy
+from pathlib import Path
+from typing import Callable, Dict, List
+
+from harness import load_config, quiet_logger, workspace
+
+from ai_director import AIDirector
+from game_agents.asset_generator import DEFAULT_GEAR, DEFAULT_WEAPONS
+from game_agents.character_creator import DEFAULT_TEAM_MEMBERS
+from game_agents.level_designer import DEFAULT_SCENES
+from game_agents.mission_planner import DEFAULT_MISSIONS
+from utils.artifact_writer import ArtifactWriter
+
+
+def scale_catalog(records: List[Dict], factor: int, unique_keys: Dict[str, Callable[[str, int], str]]) -> List[Dict]:
+    """Repeat a catalog factor times, making the keys that name output files unique"""
+    scaled = []
+    for copy in range(factor):
+        for record in records:
+            clone = deepcopy(record)
+            for key, rename in unique_keys.items():
+                clone[key] = rename(record[key], copy)
+            scaled.append(clone)
+    return scaled
+
+
+def catalogs(factor: int) -> Dict[str, List[Dict]]:
+    numbered = lambda value, copy: f"{value} {copy}" if copy else value
+    suffixed = lambda value, copy: f"{value}{copy}" if copy else value
+    return {
+        'characters': scale_catalog(DEFAULT_TEAM_MEMBERS, factor, {'callsign': suffixed}),
+        'weapons': scale_catalog(DEFAULT_WEAPONS, factor, {'name': numbered}),
+        'gear': scale_catalog(DEFAULT_GEAR, factor, {'name': numbered}),
+        'missions': scale_catalog(DEFAULT_MISSIONS, factor, {'mission_id': suffixed, 'name': numbered}),
+        'scenes': scale_catalog(DEFAULT_SCENES, factor, {'name': numbered})
+    }
+
+
+def write_pack(directory: Path, catalog: Dict[str, List[Dict]]):
+    """Write a catalog as a content pack of JSON Lines spec files"""
+    directory.mkdir(parents=True, exist_ok=True)
+    for kind, records in catalog.items():
+        with open(directory / f"{kind}.jsonl", 'w') as f:
+            for record in records:
+                f.write(json.dumps(record) + '\n')
+
+
+def stages(director: AIDirector, catalog: Dict[str, List[Dict]], streamed: bool = False):
+    """(stage name, item count, coroutine factory) in dependency order.
+
+    Streamed stages pass no records, so the agents read them from the
+    configured content pack instead of the in-memory catalog.
+    """
+    agents = director.agents
+    unity = director.helpers['unity_helper']
+    total = sum(len(records) for records in catalog.values())
+    records = lambda kind: None if streamed else catalog[kind]
+    return [
+        ('characters', len(catalog['characters']),
+         lambda: agents['character_creator'].create_ai_team_members(records('characters'))),
+        ('weapons', len(catalog['weapons']),
+         lambda: agents['asset_generator'].generate_weapons(records('weapons'))),
+        ('gear', len(catalog['gear']),
+         lambda: agents['asset_generator'].generate_gear(records('gear'))),
+        ('missions', len(catalog['missions']),
+         lambda: agents['mission_planner'].create_mission_structure(records('missions'))),
+        ('scenes', len(catalog['scenes']),
+         lambda: agents['level_designer'].create_main_scenes(records('scenes'))),
+        ('unity_setup', total, unity.setup_unity_project),
+        ('unity_integration', total, unity.integrate_assets)
+    ]
+
+
+async def run_factor(config: Dict, logger, factor: int, trace_memory: bool, streamed: bool = False) -> Dict[str, Dict]:
+    """Run every stage once at the given scale in a fresh workspace"""
+    results = {}
+    catalog = catalogs(factor)
+    with workspace() as root:
+        if streamed:
+            write_pack(root / 'content_pack', catalog)
+            config = dict(config, content=dict(config['content'], pack_dir=str(root / 'content_pack')))
+        director = AIDirector(config, logger)
+        await director.initialize_agents()
+        writer = ArtifactWriter.shared(config)
+        for stage, items, factory in stages(director, catalog, streamed):
+            files_before = writer.stats['files']
+            if trace_memory:
+                tracemalloc.start()
+            started = time.perf_counter()
+            await factory()
+            await writer.flush()
+            elapsed = time.perf_counter() - started
+            peak = 0
+            if trace_memory:
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            results[stage] = {
+                'items': items,
+                'time': elapsed,
+                'peak_alloc': peak,
+                'files': writer.stats['files'] - files_before
+            }
+    return results
+
+
+def scaling_exponent(points: List[tuple]) -> float:
+    """Least-squares slope of log(value) against log(items)"""
+    points = [(math.log(x), math.log(y)) for x, y in points if x > 0 and y > 0]
+    if len(points) < 2:
+        return float('nan')
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    spread = sum((x - mean_x) ** 2 for x, _ in points)
+    if spread == 0:
+        return float('nan')
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / spread
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Scale-test the content agents with synthetic catalogs')
+    parser.add_argument('--factors', type=str, default='1,10,100,1000',
+                        help='Comma-separated catalog multipliers (10000 takes several minutes)')
+    parser.add_argument('--max-exponent', type=float, default=1.15,
+                        help='Flag stages whose time or memory grows faster than items^N')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc pass')
+    parser.add_argument('--output', type=Path, help='Write the raw curves as JSON')
+    parser.add_argument('--render-mode', choices=('inline', 'process'), default='inline',
+                        help='Render scripts in the event loop or on a process pool')
+    parser.add_argument('--process-workers', type=int, default=0,
+                        help='Process pool size for --render-mode process (default: CPU count)')
+    parser.add_argument('--stream', action='store_true',
+                        help='Write each catalog as a JSON Lines content pack and stream it into the agents')
+    args = parser.parse_args()
+
+    factors = sorted(int(f) for f in args.factors.split(','))
+    config = load_config()
+    config['render'].update(mode=args.render_mode, process_workers=args.process_workers)
+    logger = quiet_logger()
+
+    curves: Dict[str, List[Dict]] = {}
+    for factor in factors:
+        timed = asyncio.run(run_factor(config, logger, factor, trace_memory=False, streamed=args.stream))
+        traced = {} if args.no_memory else asyncio.run(
+            run_factor(config, logger, factor, trace_memory=True, streamed=args.stream)
+        )
+        for stage, point in timed.items():
+            point = dict(point, factor=factor, peak_alloc=traced.get(stage, {}).get('peak_alloc', 0))
+            curves.setdefault(stage, []).append(point)
+        print(f"  scale {factor}x done", file=sys.stderr)
+
+    print(f"{'stage':<18} {'factor':>7} {'items':>8} {'time':>10} {'per item':>10} {'peak alloc':>11} {'files':>7}")
+    for stage, points in curves.items():
+        for point in points:
+            per_item = point['time'] / point['items'] * 1e6 if point['items'] else 0.0
+            print(
+                f"{stage:<18} {point['factor']:>6}x {point['items']:>8} {point['time'] * 1000:8.1f}ms "
+                f"{per_item:8.1f}us {point['peak_alloc'] / (1024 * 1024):9.1f}MB {point['files']:>7}"
+            )
+
+    print(f"\n{'stage':<18} {'time exp':>9} {'memory exp':>11} {'files exp':>10}")
+    flagged = []
+    summary = {}
+    for stage, points in curves.items():
+        exponents = {
+            metric: scaling_exponent([(p['items'], p[metric]) for p in points])
+            for metric in ('time', 'peak_alloc', 'files')
+        }
+        summary[stage] = exponents
+        print(f"{stage:<18} {exponents['time']:9.2f} {exponents['peak_alloc']:11.2f} {exponents['files']:10.2f}")
+        for metric in ('time', 'peak_alloc'):
+            if exponents[metric] > args.max_exponent:
+                flagged.append(f"{stage}: {metric} grows as items^{exponents[metric]:.2f}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'curves': curves, 'exponents': summary}, f, indent=2)
+
+    if flagged:
+        print(f"\nSuperlinear stages (exponent > {args.max_exponent}):")
+        for line in flagged:
+            print(f"  {line}")
+        sys.exit(1)
+    print(f"\nAll stages scale at or below items^{args.max_exponent}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Ghost: Black Ops - Log Analytics
+Rebuilds phase and task timelines from development cycle logs and reports
+duration percentiles across runs
+"""
+
+import argparse
+import json
+import os
+import sys
+
+# Add src to path
+sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+
+from utils.log_analytics import SpanStatistics, build_spans, find_log_files, iter_lines, parse_events, run_totals
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Analyze Ghost: Black Ops development cycle logs')
+    parser.add_argument('paths', nargs='*', default=['logs'], help='Log files or directories (default: logs/)')
+    parser.add_argument('--per-run', action='store_true', help='Print phase durations for every run as it is read')
+    parser.add_argument('--percentiles', type=str, default='50,90,95,99', help='Comma-separated percentiles to report')
+    parser.add_argument('--json', action='store_true', help='Print the summary as JSON')
+    args = parser.parse_args()
+    
+    files = find_log_files(args.paths)
+    if not files:
+        print(f"No log files found in {', '.join(args.paths)}", file=sys.stderr)
+        sys.exit(1)
+    percentiles = [float(p) for p in args.percentiles.split(',')]
+    
+    stats = SpanStatistics()
+    spans = stats.observe(build_spans(parse_events(iter_lines(files))))
+    for run, totals in run_totals(spans):
+        if args.per_run:
+            phases = '  '.join(f"{name} {duration:.3f}s" for name, duration in totals.items())
+            print(f"run {run:>5}: total {sum(totals.values()):8.3f}s  {phases}")
+    
+    if args.json:
+        print(json.dumps(stats.to_dict(percentiles), indent=2))
+    else:
+        print(f"Read {len(files)} log files")
+        print('\n'.join(stats.report(percentiles)))
+
+
+if __name__ == "__main__":
+    main()
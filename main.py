@@ -4,28 +4,62 @@ Ghost: Black Ops - Main AI Director System
 Coordinates AI agents and helpers to develop the complete game
 """
 
+import time
+
+STARTED = time.perf_counter()
+
 import asyncio
 import sys
 import os
 import platform
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 import yaml
 import argparse
 
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
-from ai_director import AIDirector
+from ai_director import AIDirector, DevelopmentPhase
+from utils.config_schema import ConfigError, load_config
 from utils.logger import GameLogger
-from utils.system_check import SystemValidator
+from utils.profiling import PhaseProfiler
+from utils.render_pool import RenderPool
+from utils.stall_detector import StallDetector
+from utils.tracing import Tracer
+
+IMPORT_TIME = time.perf_counter() - STARTED
 
 class GhostBlackOps:
-    def __init__(self):
-        self.logger = GameLogger()
-        self.validator = SystemValidator()
+    def __init__(self, async_logs: bool = False, json_logs: bool = False, content_pack: Optional[str] = None):
+        self.startup_timings: Dict[str, float] = {'imports': IMPORT_TIME}
+        with self._startup_step('logger'):
+            self.logger = GameLogger(
+                non_blocking=async_logs,
+                json_log="logs/ghost_black_ops.jsonl" if json_logs else None,
+                keep_text_logs=20 if json_logs else None
+            )
+        self.content_pack = content_pack
+        self._validator = None
         self.director = None
         self.system_config = None
+    
+    @contextmanager
+    def _startup_step(self, name: str):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.startup_timings[name] = time.perf_counter() - started
+    
+    @property
+    def validator(self):
+        """System validator, built on first use since gathering host info is slow"""
+        if self._validator is None:
+            from utils.system_check import SystemValidator
+            self._validator = SystemValidator()
+        return self._validator
         
     def load_configuration(self, system_type: str = None):
         """Load system-specific configuration"""
@@ -40,12 +74,50 @@ class GhostBlackOps:
             self.create_default_config(system_type)
             
         try:
-            with open(config_file, 'r') as f:
-                self.system_config = yaml.safe_load(f)
-            self.logger.info(f"Loaded configuration for {system_type}")
+            self.system_config, warnings = load_config(config_file)
+        except ConfigError as e:
+            self.logger.error(f"Configuration {e.source} is invalid:")
+            for problem in e.problems:
+                self.logger.error(f"  {problem}")
+            sys.exit(1)
         except Exception as e:
             self.logger.error(f"Failed to load config: {e}")
             sys.exit(1)
+        for warning in warnings:
+            self.logger.warning(warning)
+        self.logger.info(f"Loaded configuration for {system_type}")
+        
+        if self.content_pack:
+            if not os.path.isdir(self.content_pack):
+                self.logger.error(f"Content pack {self.content_pack} is not a directory")
+                sys.exit(1)
+            self.system_config['content']['pack_dir'] = self.content_pack
+            self.logger.info(f"Using content pack {self.content_pack}")
+        
+        perf_config = self.system_config['performance']
+        if perf_config['autotune'] and os.path.exists(perf_config['autotune_path']):
+            from utils.autotune import apply_profile, load_profile
+            profile = load_profile(self.system_config)
+            if profile:
+                changed = apply_profile(self.system_config, profile)
+                for key, (configured, tuned) in changed.items():
+                    self.logger.info(
+                        f"Autotune overrides {key}: {configured} -> {tuned} "
+                        f"(profile from {profile['calibrated']}; set performance.autotune: false to keep config values)"
+                    )
+    
+    async def autotune(self, rounds: int = 5) -> Dict:
+        """Calibrate worker counts on this machine and cache them for later runs"""
+        from utils.autotune import Autotuner, save_profile
+        self.load_configuration()
+        profile = await Autotuner(self.system_config, self.logger, rounds=rounds).run()
+        save_profile(self.system_config, profile)
+        settings = ', '.join(f"{key}={value}" for key, value in profile['settings'].items())
+        self.logger.success(
+            f"Autotune finished in {profile['duration']:.1f}s: {settings} "
+            f"(saved to {self.system_config['performance']['autotune_path']})"
+        )
+        return profile
     
     def create_default_config(self, system_type: str):
         """Create default configuration file"""
@@ -68,12 +140,55 @@ class GhostBlackOps:
                 'model_provider': 'openai',
                 'max_concurrent_tasks': 3,
                 'enable_learning': True,
-                'training_interval': 3600
+                'training_interval': 3600,
+                'task_timeout': 300,
+                'task_retries': 2,
+                'retry_backoff': 0.5,
+                'memory_admission': True,
+                'memory_headroom_gb': 0.5,
+                'default_task_memory_mb': 64,
+                'memory_history_path': 'output/.task_memory.json'
             },
             'unity': {
                 'project_path': './unity_project',
                 'assets_path': './unity_project/Assets',
-                'scripts_path': './unity_project/Assets/Scripts'
+                'scripts_path': './unity_project/Assets/Scripts',
+                'link_mode': 'auto',
+                'watch_debounce': 0.2
+            },
+            'performance': {
+                'sample_interval': 0.05,
+                'hotspot_count': 5,
+                'history_size': 10000,
+                'stall_threshold': 0.1,
+                'stall_check_interval': 0.02,
+                'memory_profile': False,
+                'memory_trace_frames': 1,
+                'memory_top_sites': 10,
+                'memory_task_budget_share': 0.25,
+                'autotune': True,
+                'autotune_path': 'output/.autotune.json'
+            },
+            'io': {
+                'max_workers': 8 if system_type == 'windows' else 4,
+                'batch_size': 32,
+                'batch_delay': 0.002,
+                'write_if_changed': True,
+                'manifest_path': 'output/.artifact_manifest.json'
+            },
+            'render': {
+                'mode': 'inline',
+                'process_workers': 0,
+                'batch_size': 64
+            },
+            'content': {
+                'pack_dir': '',
+                'batch_size': 256,
+                'strict': False
+            },
+            'build': {
+                'cache_enabled': True,
+                'cache_path': 'output/.build_cache.json'
             }
         }
         
@@ -84,46 +199,56 @@ class GhostBlackOps:
         self.logger.info(f"Created default configuration for {system_type}")
         self.system_config = default_config
     
-    async def initialize_system(self):
-        """Initialize the complete AI system"""
+    async def initialize_system(self, agents: Optional[List[str]] = None):
+        """Initialize the AI system, or only the given agents for a targeted run"""
         self.logger.info("=== Ghost: Black Ops AI System Initialization ===")
         
-        # Validate system requirements
-        if not self.validator.validate_system():
-            self.logger.error("System validation failed!")
-            return False
+        # Validate system requirements; targeted reruns come from tooling
+        # that has already run on this host
+        if agents:
+            self.logger.info("Skipping system validation for targeted agent run")
+        else:
+            with self._startup_step('validation'):
+                valid = self.validator.validate_system()
+            if not valid:
+                self.logger.error("System validation failed!")
+                return False
             
         # Load configuration
-        self.load_configuration()
+        with self._startup_step('config'):
+            self.load_configuration()
         
         # Initialize AI Director
-        self.director = AIDirector(self.system_config, self.logger)
+        with self._startup_step('director'):
+            self.director = AIDirector(self.system_config, self.logger)
         
         # Start AI agents
-        await self.director.initialize_agents()
+        with self._startup_step('components'):
+            await self.director.initialize_agents(agents)
         
         self.logger.success("AI System initialized successfully!")
+        self.report_startup()
         return True
     
+    def report_startup(self):
+        """Log where startup time went, slowest components first"""
+        total = time.perf_counter() - STARTED
+        steps = ', '.join(f"{name} {seconds * 1000:.1f}ms" for name, seconds in self.startup_timings.items())
+        self.logger.info(f"Startup took {total * 1000:.1f}ms: {steps}")
+        ranked = sorted(self.director.startup_timings.items(), key=lambda item: item[1], reverse=True)
+        for name, seconds in ranked:
+            self.logger.debug(f"  {name}: {seconds * 1000:.1f}ms")
+    
     async def run_development_cycle(self):
         """Run the complete game development cycle"""
         self.logger.info("Starting game development cycle...")
         
         try:
-            # Phase 1: Game Design and Planning
-            await self.director.execute_phase("design")
-            
-            # Phase 2: Character and Asset Creation
-            await self.director.execute_phase("creation")
-            
-            # Phase 3: Level and Mission Design
-            await self.director.execute_phase("level_design")
-            
-            # Phase 4: Code Generation
-            await self.director.execute_phase("coding")
-            
-            # Phase 5: Integration and Testing
-            await self.director.execute_phase("integration")
+            # Phases overlap: each task starts as soon as the tasks producing
+            # its inputs have finished
+            if not await self.director.run_development_cycle():
+                self.logger.warning("Development cycle finished with failed tasks")
+                return False
             
             self.logger.success("Game development cycle completed!")
             
@@ -160,22 +285,85 @@ async def main():
     parser = argparse.ArgumentParser(description='Ghost: Black Ops AI System')
     parser.add_argument('--phase', type=str, help='Specific phase to run')
     parser.add_argument('--agent', type=str, help='Run specific agent')
+    parser.add_argument('--rebuild', action='store_true', help='Ignore the build cache and regenerate everything')
+    parser.add_argument('--watch', action='store_true', help='Continuously sync generated output into the Unity project')
+    parser.add_argument('--async-logs', action='store_true', help='Write logs from a background thread in batches')
+    parser.add_argument('--trace', nargs='?', const='output/traces/cycle_trace.json', metavar='PATH',
+                        help='Write a Chrome/Perfetto trace of every task (default: output/traces/cycle_trace.json)')
+    parser.add_argument('--profile', action='store_true',
+                        help='Profile each phase separately, writing .pstats and folded stacks to profiles/')
+    parser.add_argument('--memory-profile', action='store_true',
+                        help='Trace Python allocations per task and phase against system.max_memory_gb')
+    parser.add_argument('--detect-stalls', action='store_true',
+                        help='Report event-loop stalls longer than performance.stall_threshold')
+    parser.add_argument('--json-logs', action='store_true', help='Write rotated JSON-lines logs to logs/ghost_black_ops.jsonl and keep only the last 20 text logs')
+    parser.add_argument('--content-pack', type=str, metavar='DIR',
+                        help='Stream weapons, gear, characters, missions and scenes from <kind>.jsonl or <kind>.csv spec files in DIR')
+    parser.add_argument('--autotune', action='store_true',
+                        help='Calibrate worker and concurrency sizes on this machine and cache them per host')
     args = parser.parse_args()
     
     # Initialize the system
-    game_system = GhostBlackOps()
-    game_system.print_banner()
+    game_system = GhostBlackOps(async_logs=args.async_logs, json_logs=args.json_logs, content_pack=args.content_pack)
+    if args.autotune:
+        await game_system.autotune()
+        return
     
-    if not await game_system.initialize_system():
+    # --agent initialises only that agent unless a mode needs the full system
+    targeted = args.agent and not (args.phase or args.watch or args.profile)
+    if not await game_system.initialize_system([args.agent] if targeted else None):
         sys.exit(1)
+    if not targeted:
+        game_system.print_banner()
+    
+    if args.rebuild:
+        game_system.director.build_cache.enabled = False
+    if args.trace:
+        Tracer.shared().enable()
+    if args.memory_profile and not targeted:
+        game_system.director.helpers['performance_optimizer'].enable_memory_profiling()
+    
+    stall_detector = None
+    if args.detect_stalls:
+        perf_config = game_system.system_config.get('performance', {})
+        stall_detector = StallDetector(
+            game_system.logger,
+            threshold=perf_config.get('stall_threshold', 0.1),
+            interval=perf_config.get('stall_check_interval', 0.02)
+        )
+        stall_detector.start()
     
-    # Run specific phase or complete cycle
-    if args.phase:
-        await game_system.director.execute_phase(args.phase)
-    elif args.agent:
-        await game_system.director.run_single_agent(args.agent)
-    else:
-        await game_system.run_development_cycle()
+    try:
+        # Run specific phase or complete cycle
+        if args.watch:
+            unity_helper = game_system.director.helpers['unity_helper']
+            await unity_helper.integrate_assets()
+            await unity_helper.watch()
+        elif args.profile:
+            # Phases run one after another so each profile covers a single phase
+            profiler = PhaseProfiler(game_system.logger)
+            phases = [args.phase] if args.phase else [phase.value for phase in DevelopmentPhase]
+            for phase in phases:
+                with profiler.profile(phase):
+                    await game_system.director.execute_phase(phase)
+        elif args.phase:
+            await game_system.director.execute_phase(args.phase)
+        elif args.agent:
+            await game_system.director.run_single_agent(args.agent)
+        else:
+            await game_system.run_development_cycle()
+    finally:
+        if stall_detector is not None:
+            stall_detector.stop()
+            stall_detector.report()
+        await game_system.director.shutdown()
+        RenderPool.shared(game_system.system_config).close()
+        if args.trace:
+            trace_path = Tracer.shared().save(args.trace)
+            if trace_path:
+                game_system.logger.info(f"Trace written to {trace_path} (open in ui.perfetto.dev)")
+        # Drain the async log queue now rather than at interpreter exit
+        game_system.logger.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
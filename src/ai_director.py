@@ -3,20 +3,19 @@ AI Director - Main coordinator for all AI agents and helpers
 """
 
 import asyncio
+import functools
+import importlib
 import json
 import time
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
 
-from game_agents.character_creator import CharacterCreator
-from game_agents.level_designer import LevelDesigner
-from game_agents.mission_planner import MissionPlanner
-from game_agents.asset_generator import AssetGenerator
-from ai_helpers.unity_helper import UnityHelper
-from ai_helpers.code_generator import CodeGenerator
-from ai_helpers.task_manager import TaskManager
-from ai_helpers.performance_optimizer import PerformanceOptimizer
+from task_graph import TaskGraph, TaskRecord, TaskSpec, collect_task_specs, format_critical_path
+from utils.artifact_writer import ArtifactWriter
+from utils.build_cache import BuildCache
+from utils.logger import log_context
+from utils.tracing import Tracer
 
 class DevelopmentPhase(Enum):
     DESIGN = "design"
@@ -25,6 +24,38 @@ class DevelopmentPhase(Enum):
     CODING = "coding"
     INTEGRATION = "integration"
 
+PHASE_TITLES = {
+    "design": "GAME DESIGN PHASE",
+    "creation": "ASSET CREATION PHASE",
+    "level_design": "LEVEL DESIGN PHASE",
+    "coding": "CODE GENERATION PHASE",
+    "integration": "INTEGRATION PHASE"
+}
+
+@dataclass(frozen=True)
+class ComponentSpec:
+    module: str
+    class_name: str
+    requires: Tuple[str, ...] = ()
+
+# Agents and helpers are imported on first use so a single-agent run only
+# pays for the modules it needs; requires names components that must be
+# initialised alongside
+AGENT_REGISTRY = {
+    'character_creator': ComponentSpec('game_agents.character_creator', 'CharacterCreator'),
+    'level_designer': ComponentSpec('game_agents.level_designer', 'LevelDesigner'),
+    'mission_planner': ComponentSpec('game_agents.mission_planner', 'MissionPlanner'),
+    'asset_generator': ComponentSpec('game_agents.asset_generator', 'AssetGenerator')
+}
+
+HELPER_REGISTRY = {
+    'unity_helper': ComponentSpec('ai_helpers.unity_helper', 'UnityHelper'),
+    'code_generator': ComponentSpec('ai_helpers.code_generator', 'CodeGenerator'),
+    'performance_optimizer': ComponentSpec('ai_helpers.performance_optimizer', 'PerformanceOptimizer')
+}
+
+TASK_MANAGER = ComponentSpec('ai_helpers.task_manager', 'TaskManager')
+
 @dataclass
 class AgentStatus:
     name: str
@@ -42,29 +73,72 @@ class AIDirector:
         self.task_manager = None
         self.phase_progress = {}
         self.agent_status = {}
+        self.last_cycle_report = []
+        self.build_cache = BuildCache.shared(config)
+        self.writer = ArtifactWriter.shared(config)
+        self.startup_timings: Dict[str, float] = {}
         
-    async def initialize_agents(self):
-        """Initialize all AI agents and helpers"""
-        self.logger.info("Initializing AI Agents and Helpers...")
+    def _construct(self, name: str, spec: ComponentSpec):
+        """Import a component's module and build it, timing both steps"""
+        started = time.perf_counter()
+        module = importlib.import_module(spec.module)
+        imported = time.perf_counter()
+        component = getattr(module, spec.class_name)(self.config, self.logger)
+        self.startup_timings[f"import {name}"] = imported - started
+        self.startup_timings[f"construct {name}"] = time.perf_counter() - imported
+        return component
+    
+    async def _initialize_component(self, name: str, component):
+        started = time.perf_counter()
+        try:
+            await component.initialize()
+        finally:
+            self.startup_timings[f"initialize {name}"] = time.perf_counter() - started
+    
+    def _resolve(self, names: List[str]) -> Tuple[List[str], List[str]]:
+        """Expand requested components with everything they require"""
+        agents, helpers = [], []
+        pending = list(names)
+        while pending:
+            name = pending.pop(0)
+            if name in agents or name in helpers:
+                continue
+            if name in AGENT_REGISTRY:
+                agents.append(name)
+                pending.extend(AGENT_REGISTRY[name].requires)
+            elif name in HELPER_REGISTRY:
+                helpers.append(name)
+                pending.extend(HELPER_REGISTRY[name].requires)
+            else:
+                self.logger.error(f"Unknown agent: {name}")
+        return agents, helpers
+    
+    async def initialize_agents(self, names: Optional[List[str]] = None):
+        """Initialize AI agents and helpers.
         
-        # Initialize task manager first
-        self.task_manager = TaskManager(self.config, self.logger)
+        With names, only those components and what they require are imported
+        and initialised; the task manager, which only the task graph needs,
+        is skipped.
+        """
+        self.logger.info("Initializing AI Agents and Helpers...")
         
-        # Initialize AI Agents
-        self.agents['character_creator'] = CharacterCreator(self.config, self.logger)
-        self.agents['level_designer'] = LevelDesigner(self.config, self.logger)
-        self.agents['mission_planner'] = MissionPlanner(self.config, self.logger)
-        self.agents['asset_generator'] = AssetGenerator(self.config, self.logger)
+        if names is None:
+            agent_names, helper_names = list(AGENT_REGISTRY), list(HELPER_REGISTRY)
+            self.task_manager = self._construct('task_manager', TASK_MANAGER)
+        else:
+            agent_names, helper_names = self._resolve(names)
         
-        # Initialize AI Helpers
-        self.helpers['unity_helper'] = UnityHelper(self.config, self.logger)
-        self.helpers['code_generator'] = CodeGenerator(self.config, self.logger)
-        self.helpers['performance_optimizer'] = PerformanceOptimizer(self.config, self.logger)
+        agent_names = [name for name in agent_names if name not in self.agents]
+        helper_names = [name for name in helper_names if name not in self.helpers]
+        for agent_name in agent_names:
+            self.agents[agent_name] = self._construct(agent_name, AGENT_REGISTRY[agent_name])
+        for helper_name in helper_names:
+            self.helpers[helper_name] = self._construct(helper_name, HELPER_REGISTRY[helper_name])
         
         # Initialize all components
         init_tasks = []
-        for agent_name, agent in self.agents.items():
-            init_tasks.append(agent.initialize())
+        for agent_name in agent_names:
+            init_tasks.append(self._initialize_component(agent_name, self.agents[agent_name]))
             self.agent_status[agent_name] = AgentStatus(
                 name=agent_name,
                 is_active=False,
@@ -73,100 +147,184 @@ class AIDirector:
                 performance=0.0
             )
         
-        for helper_name, helper in self.helpers.items():
-            init_tasks.append(helper.initialize())
+        for helper_name in helper_names:
+            init_tasks.append(self._initialize_component(helper_name, self.helpers[helper_name]))
+        if names is None:
+            init_tasks.append(self._initialize_component('task_manager', self.task_manager))
             
         await asyncio.gather(*init_tasks, return_exceptions=True)
         
         self.logger.success(f"Initialized {len(self.agents)} agents and {len(self.helpers)} helpers")
     
+    def build_task_graph(self) -> TaskGraph:
+        """Build the dependency graph from the tasks declared by agents and helpers"""
+        specs = []
+        for name, component in list(self.agents.items()) + list(self.helpers.items()):
+            specs.extend(collect_task_specs(name, component))
+        specs.extend(collect_task_specs('task_manager', self.task_manager))
+        return TaskGraph(specs)
+    
     async def execute_phase(self, phase: str):
         """Execute a specific development phase"""
         phase_enum = DevelopmentPhase(phase)
-        self.logger.info(f"Executing development phase: {phase_enum.value}")
-        
-        phase_methods = {
-            DevelopmentPhase.DESIGN: self._run_design_phase,
-            DevelopmentPhase.CREATION: self._run_creation_phase,
-            DevelopmentPhase.LEVEL_DESIGN: self._run_level_design_phase,
-            DevelopmentPhase.CODING: self._run_coding_phase,
-            DevelopmentPhase.INTEGRATION: self._run_integration_phase
-        }
-        
-        if phase_enum in phase_methods:
-            await phase_methods[phase_enum]()
-        else:
-            self.logger.error(f"Unknown phase: {phase}")
+        await self.run_task_graph([phase_enum.value])
     
-    async def _run_design_phase(self):
-        """Run game design phase"""
-        self.logger.info("=== GAME DESIGN PHASE ===")
-        
-        tasks = [
-            self.agents['mission_planner'].design_game_narrative(),
-            self.agents['character_creator'].design_character_system(),
-            self.agents['level_designer'].design_world_structure()
-        ]
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        await self._process_phase_results("design", results)
+    async def run_development_cycle(self):
+        """Run every phase, starting each task as soon as its inputs are ready"""
+        phases = [phase.value for phase in DevelopmentPhase]
+        records = await self.run_task_graph(phases)
+        for line in self.last_cycle_report:
+            self.logger.info(line)
+        return all(record.succeeded for record in records.values())
     
-    async def _run_creation_phase(self):
-        """Run asset creation phase"""
-        self.logger.info("=== ASSET CREATION PHASE ===")
+    async def run_task_graph(self, phases: List[str]) -> Dict[str, TaskRecord]:
+        """Schedule the tasks of the given phases on their dependency graph"""
+        graph = self.build_task_graph().restrict(phases)
+        dependents = graph.dependents()
+        downstream = graph.downstream_counts()
+        waiting_on = {name: set(deps) for name, deps in graph.dependencies.items()}
+        records = {name: TaskRecord(spec=spec) for name, spec in graph.specs.items()}
+        phase_remaining = {phase: set(names) for phase, names in graph.phase_tasks().items()}
+        running = {}
         
-        tasks = [
-            self.agents['character_creator'].create_player_character(),
-            self.agents['character_creator'].create_ai_team_members(),
-            self.agents['asset_generator'].generate_weapons(),
-            self.agents['asset_generator'].generate_gear(),
-            self.agents['asset_generator'].generate_environment_assets()
-        ]
+        cycle_start = time.perf_counter()
+        self.helpers['performance_optimizer'].begin_cycle()
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        await self._process_phase_results("creation", results)
-    
-    async def _run_level_design_phase(self):
-        """Run level design phase"""
-        self.logger.info("=== LEVEL DESIGN PHASE ===")
+        def skip_dependents(name: str):
+            for dependent in dependents[name]:
+                record = records[dependent]
+                if record.skipped or record.submitted is not None:
+                    continue
+                record.skipped = True
+                record.error = RuntimeError(f"dependency {name} failed")
+                waiting_on[dependent].clear()
+                self.logger.error(f"Task {dependent} skipped: dependency {name} failed")
+                finish(dependent)
+                skip_dependents(dependent)
         
-        tasks = [
-            self.agents['level_designer'].create_main_scenes(),
-            self.agents['mission_planner'].create_mission_structure(),
-            self.agents['level_designer'].optimize_level_performance()
-        ]
+        def finish(name: str):
+            phase = graph.specs[name].phase
+            phase_remaining[phase].discard(name)
+            if not phase_remaining[phase]:
+                self._process_phase_records(phase, [records[n] for n in graph.phase_tasks()[phase]])
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        await self._process_phase_results("level_design", results)
-    
-    async def _run_coding_phase(self):
-        """Run code generation phase"""
-        self.logger.info("=== CODE GENERATION PHASE ===")
+        def start_ready():
+            for name in graph.order:
+                record = records[name]
+                if record.submitted is not None or record.skipped or waiting_on[name]:
+                    continue
+                spec = record.spec
+                phase_names = graph.phase_tasks()[spec.phase]
+                if all(records[n].submitted is None and not records[n].skipped for n in phase_names):
+                    self.logger.info(f"Executing development phase: {spec.phase}")
+                    self.logger.info(f"=== {PHASE_TITLES[spec.phase]} ===")
+                    self.helpers['performance_optimizer'].begin_phase(spec.phase)
+                record.submitted = time.perf_counter()
+                self._mark_task_started(spec)
+                self.logger.info(f"Starting task {name}", agent=spec.owner, task=name, phase=spec.phase)
+                future = self.task_manager.submit(
+                    functools.partial(self._invoke_task, spec, record),
+                    name=name,
+                    agent=spec.owner,
+                    priority=-downstream[name]
+                )
+                running[future] = name
         
-        tasks = [
-            self.helpers['code_generator'].generate_character_systems(),
-            self.helpers['code_generator'].generate_ai_behavior(),
-            self.helpers['code_generator'].generate_game_mechanics(),
-            self.helpers['unity_helper'].setup_unity_project()
-        ]
+        start_ready()
+        while running:
+            done, _ = await asyncio.wait(running.keys(), return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                name = running.pop(future)
+                record = records[name]
+                record.finished = time.perf_counter()
+                try:
+                    record.result = future.result()
+                except Exception as e:
+                    record.error = e
+                
+                self._mark_task_finished(record.spec, running.values())
+                if record.error is None:
+                    self.logger.info(
+                        f"Task {name} completed in {record.duration:.3f}s{self._cache_summary(name)}",
+                        agent=record.spec.owner, task=name, phase=record.spec.phase, duration=record.duration
+                    )
+                    for dependent in dependents[name]:
+                        waiting_on[dependent].discard(name)
+                else:
+                    self.logger.error(
+                        f"Task {name} failed after {record.duration:.3f}s: {record.error}",
+                        agent=record.spec.owner, task=name, phase=record.spec.phase, duration=record.duration
+                    )
+                    skip_dependents(name)
+                finish(name)
+            start_ready()
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        await self._process_phase_results("coding", results)
+        self.last_cycle_report = format_critical_path(graph, records, cycle_start, time.perf_counter())
+        await self.writer.flush()
+        self.logger.info(f"Artifact writer: {self.writer.summary()}")
+        pruned = self.build_cache.prune(
+            name for name, record in records.items() if record.finished is not None and record.error is None
+        )
+        if pruned:
+            self.logger.info(f"Build cache: dropped {pruned} entries for content no longer generated")
+        self.build_cache.save()
+        self.writer.manifest.save()
+        self.task_manager.admission.save()
+        return records
     
-    async def _run_integration_phase(self):
-        """Run integration and testing phase"""
-        self.logger.info("=== INTEGRATION PHASE ===")
-        
-        tasks = [
-            self.helpers['unity_helper'].integrate_assets(),
-            self.helpers['performance_optimizer'].optimize_game_performance(),
-            self.task_manager.run_test_suite()
-        ]
-        
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-        await self._process_phase_results("integration", results)
+    async def _invoke_task(self, spec: TaskSpec, record: TaskRecord):
+        """Invoke the coroutine behind a task spec, stamping when it first actually runs"""
+        if record.started is None:
+            record.started = time.perf_counter()
+        if spec.owner == 'task_manager':
+            component = self.task_manager
+        else:
+            component = self.agents.get(spec.owner) or self.helpers.get(spec.owner)
+        with log_context(agent=spec.owner, task=spec.name, phase=spec.phase), \
+                Tracer.shared().span(spec.name, spec.phase, {'agent': spec.owner}):
+            async with self.helpers['performance_optimizer'].measure(spec.name, spec.owner, spec.phase) as metrics:
+                result = await getattr(component, spec.method)()
+        self.task_manager.admission.observe(spec.name, metrics.footprint)
+        return result
+    
+    def _cache_summary(self, task_name: str) -> str:
+        """Describe build cache usage for a finished task"""
+        stats = self.build_cache.task_stats(task_name)
+        if not stats:
+            return ""
+        return f" (cache: {stats['hits']} hit, {stats['misses']} miss)"
+    
+    def _mark_task_started(self, spec: TaskSpec):
+        """Flag the owning agent as busy with a task"""
+        status = self.agent_status.get(spec.owner)
+        if status is not None:
+            status.is_active = True
+            status.current_task = spec.method
+    
+    def _mark_task_finished(self, spec: TaskSpec, running_names):
+        """Clear the busy flag once an agent has no tasks left in flight"""
+        status = self.agent_status.get(spec.owner)
+        if status is None:
+            return
+        if not any(name.startswith(f"{spec.owner}.") for name in running_names):
+            status.is_active = False
+            status.current_task = None
     
-    async def _process_phase_results(self, phase: str, results: List):
+    def _process_phase_records(self, phase: str, records: List[TaskRecord]):
+        """Convert finished task records into phase results"""
+        results = [record.error if record.error is not None else record.result for record in records]
+        self._process_phase_results(phase, results)
+        started = [record.started for record in records if record.started is not None]
+        finished = [record.finished for record in records if record.finished is not None]
+        if started and finished:
+            Tracer.shared().add_span(
+                phase, 'phase', min(started), max(finished), 'phases',
+                {'success_rate': self.phase_progress[phase]}
+            )
+        self.helpers['performance_optimizer'].report_phase(phase)
+        self.helpers['performance_optimizer'].report_phase_memory(phase)
+    
+    def _process_phase_results(self, phase: str, results: List):
         """Process results from a development phase"""
         successful = 0
         for i, result in enumerate(results):
@@ -177,7 +335,7 @@ class AIDirector:
                 self._update_agent_status(result)
         
         self.phase_progress[phase] = successful / len(results) * 100
-        self.logger.info(f"Phase {phase} completed: {successful}/{len(results)} tasks successful")
+        self.logger.info(f"Phase {phase} completed: {successful}/{len(results)} tasks successful", phase=phase)
     
     def _update_agent_status(self, task_result: Dict):
         """Update agent status based on task results"""
@@ -185,24 +343,36 @@ class AIDirector:
             agent_name = task_result['agent']
             if agent_name in self.agent_status:
                 self.agent_status[agent_name].tasks_completed += 1
+                self.agent_status[agent_name].is_active = False
                 self.agent_status[agent_name].current_task = None
                 if 'performance' in task_result:
                     self.agent_status[agent_name].performance = task_result['performance']
     
     async def run_single_agent(self, agent_name: str):
         """Run a specific agent independently"""
+        if agent_name in AGENT_REGISTRY and agent_name not in self.agents:
+            await self.initialize_agents([agent_name])
         if agent_name in self.agents:
             self.logger.info(f"Running agent: {agent_name}")
             agent = self.agents[agent_name]
             await agent.execute_primary_task()
+            self.build_cache.save()
         else:
             self.logger.error(f"Unknown agent: {agent_name}")
     
+    async def shutdown(self):
+        """Stop any tasks still queued or running in the task manager"""
+        if self.task_manager is not None:
+            await self.task_manager.shutdown()
+    
     def get_system_status(self) -> Dict:
         """Get current system status"""
         return {
             'active_agents': len([a for a in self.agent_status.values() if a.is_active]),
             'total_tasks_completed': sum(a.tasks_completed for a in self.agent_status.values()),
             'phase_progress': self.phase_progress,
+            'build_cache': self.build_cache.stats,
+            'artifact_writer': dict(self.writer.stats, throughput=self.writer.throughput()),
+            'task_manager': self.task_manager.stats if self.task_manager else {},
             'agent_status': {name: status.__dict__ for name, status in self.agent_status.items()}
         }
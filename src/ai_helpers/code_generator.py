@@ -7,17 +7,25 @@ import json
 from pathlib import Path
 from typing import Dict, List, Any
 
+from task_graph import task_spec
+from utils.artifact_writer import ArtifactWriter
+from utils.build_cache import BuildCache
+from utils.tracing import traced
+
 class CodeGenerator:
     def __init__(self, config: Dict, logger):
         self.config = config
         self.logger = logger
         self.code_files_generated = 0
+        self.build_cache = BuildCache.shared(config)
+        self.writer = ArtifactWriter.shared(config)
         
     async def initialize(self):
         """Initialize code generator"""
         self.logger.info("Code Generator initialized")
         return True
     
+    @task_spec(phase='coding', inputs=['character_system'], outputs=['character_code'])
     async def generate_character_systems(self):
         """Generate character systems code"""
         self.logger.info("Generating character systems code...")
@@ -59,6 +67,7 @@ class CodeGenerator:
             'performance': 0.94
         }
     
+    @task_spec(phase='coding', outputs=['ai_code'])
     async def generate_ai_behavior(self):
         """Generate AI behavior systems"""
         self.logger.info("Generating AI behavior systems...")
@@ -100,6 +109,7 @@ class CodeGenerator:
             'performance': 0.91
         }
     
+    @task_spec(phase='coding', outputs=['mechanics_code'])
     async def generate_game_mechanics(self):
         """Generate core game mechanics"""
         self.logger.info("Generating core game mechanics...")
@@ -141,11 +151,17 @@ class CodeGenerator:
             'performance': 0.93
         }
     
+    @traced()
     async def _generate_character_system(self, system_data: Dict):
         """Generate character system code"""
         scripts_dir = Path("output/unity_scripts/core")
-        scripts_dir.mkdir(parents=True, exist_ok=True)
+        script_path = scripts_dir / f"{system_data['name']}.cs"
+        
+        cache_key = self.build_cache.key(self, 'character_system', system_data)
+        if await self.build_cache.lookup('code_generator.generate_character_systems', cache_key):
+            return
         
+        code = None
         if system_data['name'] == 'CharacterBase':
             code = """
 using UnityEngine;
@@ -280,16 +296,26 @@ public class PlayerCharacter : CharacterBase
 }
 """
         
-        with open(scripts_dir / f"{system_data['name']}.cs", 'w') as f:
-            f.write(code)
+        if code is None:
+            self.logger.warning(f"No code template for {script_path.stem}; skipping")
+            return
         
+        await self.writer.write_text(script_path, code)
+        
+        self.build_cache.store(cache_key, [script_path])
         self.code_files_generated += 1
     
+    @traced()
     async def _generate_ai_system(self, system_data: Dict):
         """Generate AI system code"""
         scripts_dir = Path("output/unity_scripts/ai")
-        scripts_dir.mkdir(parents=True, exist_ok=True)
+        script_path = scripts_dir / f"{system_data['name']}.cs"
+        
+        cache_key = self.build_cache.key(self, 'ai_system', system_data)
+        if await self.build_cache.lookup('code_generator.generate_ai_behavior', cache_key):
+            return
         
+        code = None
         if system_data['name'] == 'AIBehaviorTree':
             code = """
 using UnityEngine;
@@ -424,16 +450,26 @@ public class AIBehaviorTree : MonoBehaviour
 }
 """
         
-        with open(scripts_dir / f"{system_data['name']}.cs", 'w') as f:
-            f.write(code)
+        if code is None:
+            self.logger.warning(f"No code template for {script_path.stem}; skipping")
+            return
         
+        await self.writer.write_text(script_path, code)
+        
+        self.build_cache.store(cache_key, [script_path])
         self.code_files_generated += 1
     
+    @traced()
     async def _generate_game_mechanic(self, mechanic_data: Dict):
         """Generate game mechanic code"""
         scripts_dir = Path("output/unity_scripts/systems")
-        scripts_dir.mkdir(parents=True, exist_ok=True)
+        script_path = scripts_dir / f"{mechanic_data['name']}.cs"
+        
+        cache_key = self.build_cache.key(self, 'game_mechanic', mechanic_data)
+        if await self.build_cache.lookup('code_generator.generate_game_mechanics', cache_key):
+            return
         
+        code = None
         if mechanic_data['name'] == 'CombatSystem':
             code = """
 using UnityEngine;
@@ -503,7 +539,11 @@ public class CombatSystem : MonoBehaviour
 }
 """
         
-        with open(scripts_dir / f"{mechanic_data['name']}.cs", 'w') as f:
-            f.write(code)
+        if code is None:
+            self.logger.warning(f"No code template for {script_path.stem}; skipping")
+            return
         
-        self.code_files_generated +=
+        await self.writer.write_text(script_path, code)
+        
+        self.build_cache.store(cache_key, [script_path])
+        self.code_files_generated += 1
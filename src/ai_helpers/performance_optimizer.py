@@ -0,0 +1,299 @@
+"""
+Performance Optimizer Helper - Profiles agent tasks and reports hot spots
+"""
+
+import asyncio
+import json
+import time
+import tracemalloc
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import psutil
+
+from task_graph import task_spec
+from utils.artifact_writer import ArtifactWriter, track_writes
+
+
+@dataclass
+class TaskMetrics:
+    task: str
+    agent: str
+    phase: str
+    timestamp: float
+    wall_time: float = 0.0
+    # CPU the whole process used while the task ran, including overlapping tasks
+    process_cpu_time: float = 0.0
+    rss_start: int = 0
+    peak_rss: int = 0
+    # Bytes the artifact writer wrote for this task and the tasks it started
+    bytes_written: int = 0
+    traced_start: int = 0
+    traced_peak: int = 0
+    traced_growth: int = 0
+    succeeded: bool = True
+
+    @property
+    def footprint(self) -> int:
+        """Bytes the process grew by while the task ran (traced if available)"""
+        if self.traced_peak:
+            return self.traced_peak - self.traced_start
+        return self.peak_rss - self.rss_start
+
+
+def _format_bytes(count: float) -> str:
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if abs(count) < 1024 or unit == 'GB':
+            return f"{count:.1f}{unit}"
+        count /= 1024
+
+
+def _format_site(stat) -> str:
+    frame = stat.traceback[0]
+    return f"{Path(frame.filename).name}:{frame.lineno}"
+
+
+class PerformanceOptimizer:
+    def __init__(self, config: Dict, logger):
+        self.config = config
+        self.logger = logger
+
+        perf_config = config.get('performance', {})
+        self.sample_interval = perf_config.get('sample_interval', 0.05)
+        self.hotspot_count = perf_config.get('hotspot_count', 5)
+        self.samples = deque(maxlen=perf_config.get('history_size', 10000))
+        
+        # Opt-in tracemalloc profiling
+        self.memory_profiling = False
+        self.memory_frames = perf_config.get('memory_trace_frames', 1)
+        self.memory_top_sites = perf_config.get('memory_top_sites', 10)
+        self.memory_budget = config.get('system', {}).get('max_memory_gb', 6) * 1024 ** 3
+        self.memory_task_share = perf_config.get('memory_task_budget_share', 0.25)
+        self._phase_snapshots = {}
+        self._memory_profile_requested = perf_config.get('memory_profile', False)
+
+        self.process = psutil.Process()
+        self.writer = ArtifactWriter.shared(config)
+        self.cycle_started = 0.0
+        self.cycle_cpu_start = 0.0
+        self._active = []
+        self._sampler = None
+
+    async def initialize(self):
+        """Initialize performance optimizer"""
+        if self._memory_profile_requested:
+            self.enable_memory_profiling()
+        self.logger.info("Performance Optimizer initialized")
+        return True
+    
+    def enable_memory_profiling(self):
+        """Start tracemalloc so tasks and phases record Python allocations"""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.memory_frames)
+        self.memory_profiling = True
+        self.logger.info(
+            f"Memory profiling enabled (flagging tasks above {self.memory_task_share:.0%} "
+            f"of the {_format_bytes(self.memory_budget)} budget)"
+        )
+    
+    def _fold_traced_peak(self):
+        """Credit the traced peak since the last fold to every active task.
+        
+        Resetting the peak whenever a task starts or stops splits time into
+        windows, so each task sees the highest allocation level reached
+        while it was running even when tasks overlap.
+        """
+        current, peak = tracemalloc.get_traced_memory()
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        else:
+            peak = current
+        for metrics in self._active:
+            metrics.traced_peak = max(metrics.traced_peak, peak)
+        return current
+
+    def _process_cpu(self) -> float:
+        """User plus system CPU time of the whole process"""
+        cpu = self.process.cpu_times()
+        return cpu.user + cpu.system
+
+    async def _sample_rss(self):
+        """Track peak RSS for every task currently being measured"""
+        while self._active:
+            rss = self.process.memory_info().rss
+            for metrics in self._active:
+                metrics.peak_rss = max(metrics.peak_rss, rss)
+            if self.memory_profiling:
+                self._fold_traced_peak()
+            await asyncio.sleep(self.sample_interval)
+        self._sampler = None
+
+    @asynccontextmanager
+    async def measure(self, task: str, agent: str, phase: str):
+        """Measure a task's wall time, peak RSS, bytes written and process CPU time.
+
+        Bytes written are counted by the artifact writer for this task alone.
+        CPU time is a process-wide counter that overlapping tasks share, so
+        it is kept as process_cpu_time and left out of per-task rankings.
+        """
+        cpu_start = self._process_cpu()
+        rss_start = self.process.memory_info().rss
+        metrics = TaskMetrics(
+            task=task,
+            agent=agent,
+            phase=phase,
+            timestamp=time.time(),
+            rss_start=rss_start,
+            peak_rss=rss_start
+        )
+        if self.memory_profiling:
+            metrics.traced_start = metrics.traced_peak = self._fold_traced_peak()
+        self._active.append(metrics)
+        if self._sampler is None:
+            self._sampler = asyncio.ensure_future(self._sample_rss())
+
+        wall_start = time.perf_counter()
+        try:
+            with track_writes() as tally:
+                yield metrics
+        except BaseException:
+            metrics.succeeded = False
+            raise
+        finally:
+            metrics.wall_time = time.perf_counter() - wall_start
+            metrics.process_cpu_time = self._process_cpu() - cpu_start
+            metrics.peak_rss = max(metrics.peak_rss, self.process.memory_info().rss)
+            metrics.bytes_written = tally.bytes
+            if self.memory_profiling:
+                metrics.traced_growth = self._fold_traced_peak() - metrics.traced_start
+                self._check_task_memory(metrics)
+            self._active.remove(metrics)
+            self.samples.append(metrics)
+
+    def begin_cycle(self):
+        """Mark the start of a scheduling run for per-phase reports"""
+        self.cycle_started = time.time()
+        self.cycle_cpu_start = self._process_cpu()
+    
+    def begin_phase(self, phase: str):
+        """Snapshot allocations when a phase starts"""
+        if self.memory_profiling:
+            self._phase_snapshots[phase] = tracemalloc.take_snapshot()
+    
+    def _check_task_memory(self, metrics: TaskMetrics):
+        """Warn when a task's own allocations use too much of the memory budget"""
+        footprint = metrics.traced_peak - metrics.traced_start
+        limit = self.memory_budget * self.memory_task_share
+        if footprint > limit:
+            self.logger.warning(
+                f"Task {metrics.task} peaked at {_format_bytes(footprint)} above its starting level, "
+                f"over {self.memory_task_share:.0%} of the {_format_bytes(self.memory_budget)} memory budget"
+            )
+    
+    def report_phase_memory(self, phase: str):
+        """Log top allocation sites and net growth since the phase started"""
+        start = self._phase_snapshots.pop(phase, None)
+        if not self.memory_profiling or start is None:
+            return
+        end = tracemalloc.take_snapshot()
+        filters = [
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>')
+        ]
+        start = start.filter_traces(filters)
+        end = end.filter_traces(filters)
+        
+        growth = end.compare_to(start, 'lineno')
+        net = sum(stat.size_diff for stat in growth)
+        current, _ = tracemalloc.get_traced_memory()
+        self.logger.info(
+            f"=== Memory: {phase} === net growth {_format_bytes(net)}, traced now {_format_bytes(current)}"
+        )
+        for rank, stat in enumerate(sorted(growth, key=lambda s: s.size_diff, reverse=True)[:self.memory_top_sites], 1):
+            if stat.size_diff <= 0:
+                break
+            self.logger.info(
+                f"  {rank}. {_format_site(stat):<40} +{_format_bytes(stat.size_diff):>9} "
+                f"({stat.count_diff:+d} blocks)  live {_format_bytes(stat.size)}"
+            )
+        
+        top_tasks = sorted(
+            (m for m in self.samples if m.phase == phase and m.timestamp >= self.cycle_started),
+            key=lambda m: m.traced_peak - m.traced_start, reverse=True
+        )[:self.hotspot_count]
+        for metrics in top_tasks:
+            self.logger.info(
+                f"  task {metrics.task:<50} peak +{_format_bytes(metrics.traced_peak - metrics.traced_start)}  "
+                f"net {_format_bytes(metrics.traced_growth)}"
+            )
+
+    def hotspots(self, phase: Optional[str] = None, limit: Optional[int] = None,
+                 since: float = 0.0) -> List[TaskMetrics]:
+        """Rank recorded task runs by wall time"""
+        selected = [
+            m for m in self.samples
+            if (phase is None or m.phase == phase) and m.timestamp >= since
+        ]
+        selected.sort(key=lambda m: m.wall_time, reverse=True)
+        return selected[:limit] if limit else selected
+
+    def report_phase(self, phase: str):
+        """Log a ranked hot-spot summary for a phase"""
+        phase_runs = self.hotspots(phase, since=self.cycle_started)
+        ranked = phase_runs[:self.hotspot_count]
+        if not ranked:
+            return
+        total_wall = sum(m.wall_time for m in phase_runs)
+        self.logger.info(f"=== Hot spots: {phase} ===")
+        for rank, metrics in enumerate(ranked, 1):
+            share = metrics.wall_time / total_wall * 100 if total_wall else 0.0
+            self.logger.info(
+                f"  {rank}. {metrics.task:<50} wall {metrics.wall_time * 1000:8.1f}ms ({share:4.1f}%)  "
+                f"peak rss {_format_bytes(metrics.peak_rss)}  written {_format_bytes(metrics.bytes_written)}"
+            )
+
+    # Summarises every task's metrics, so it waits for every other task's output
+    @task_spec(
+        phase='integration',
+        inputs=['unity_integration', 'character_code', 'mechanics_code', 'level_optimization'],
+        outputs=['performance_report']
+    )
+    async def optimize_game_performance(self):
+        """Summarise collected task metrics into a performance report"""
+        self.logger.info("Analyzing development cycle performance...")
+
+        per_task = {}
+        for metrics in self.samples:
+            entry = per_task.setdefault(metrics.task, {
+                'agent': metrics.agent,
+                'phase': metrics.phase,
+                'runs': 0,
+                'wall_time': 0.0,
+                'peak_rss': 0,
+                'bytes_written': 0
+            })
+            entry['runs'] += 1
+            entry['wall_time'] += metrics.wall_time
+            entry['peak_rss'] = max(entry['peak_rss'], metrics.peak_rss)
+            entry['bytes_written'] += metrics.bytes_written
+
+        report = {
+            'generated_at': time.time(),
+            # Process-wide, since tasks overlap and share the CPU counters
+            'process_cpu_time': self._process_cpu() - self.cycle_cpu_start,
+            'tasks': per_task,
+            'hotspots': [asdict(m) for m in self.hotspots(limit=self.hotspot_count)]
+        }
+
+        await self.writer.write_json(Path("output/performance") / "performance_report.json", report)
+
+        return {
+            'helper': 'performance_optimizer',
+            'task': 'optimize_game_performance',
+            'result': 'success',
+            'tasks_profiled': len(per_task),
+            'performance': 0.9
+        }
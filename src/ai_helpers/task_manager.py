@@ -0,0 +1,277 @@
+"""
+Task Manager Helper - Bounded-concurrency scheduling for agent tasks
+"""
+
+import asyncio
+import functools
+import heapq
+import itertools
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+from task_graph import task_spec
+from utils.memory_admission import MemoryAdmission
+
+
+@dataclass(order=True)
+class QueuedTask:
+    priority: int
+    sequence: int
+    name: str = field(compare=False)
+    agent: str = field(compare=False)
+    factory: Callable[[], Awaitable[Any]] = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+    timeout: Optional[float] = field(compare=False, default=None)
+    retries: int = field(compare=False, default=0)
+    attempt: int = field(compare=False, default=0)
+    memory_delayed: bool = field(compare=False, default=False)
+    retry_handle: Optional[asyncio.TimerHandle] = field(compare=False, default=None)
+
+
+class TaskManager:
+    def __init__(self, config: Dict, logger):
+        self.config = config
+        self.logger = logger
+
+        ai_config = config.get('ai', {})
+        self.max_workers = max(1, config['system'].get('max_agents', 4))
+        self.agent_limit = max(1, ai_config.get('max_concurrent_tasks', 2))
+        self.agent_limits = ai_config.get('agent_concurrency', {})
+        self.task_timeout = ai_config.get('task_timeout', 300)
+        self.max_retries = ai_config.get('task_retries', 2)
+        self.retry_backoff = ai_config.get('retry_backoff', 0.5)
+
+        self._queue = []
+        self._sequence = itertools.count()
+        self._running = 0
+        self._agent_running = {}
+        self._running_names = []
+        # The event loop only keeps weak references to tasks, so running
+        # attempts and pending retries are held here until they finish
+        self._tasks: Set[asyncio.Task] = set()
+        self._retry_handles: Set[asyncio.TimerHandle] = set()
+        self.admission = MemoryAdmission(config)
+        self.stats = {
+            'submitted': 0,
+            'completed': 0,
+            'failed': 0,
+            'retried': 0,
+            'timed_out': 0,
+            'peak_running': 0,
+            'memory_delays': 0
+        }
+
+    async def initialize(self):
+        """Initialize task manager"""
+        self.logger.info(
+            f"Task Manager initialized ({self.max_workers} workers, "
+            f"{self.agent_limit} concurrent tasks per agent)"
+        )
+        return True
+
+    def limit_for(self, agent: str) -> int:
+        """Return the concurrency limit for an agent"""
+        return max(1, self.agent_limits.get(agent, self.agent_limit))
+
+    def submit(self, factory: Callable[[], Awaitable[Any]], name: str, agent: str,
+               priority: int = 0, timeout: Optional[float] = None,
+               retries: Optional[int] = None) -> asyncio.Future:
+        """Queue a coroutine factory; lower priority values run first.
+
+        A factory rather than a coroutine is taken so failed attempts can be
+        retried with a fresh coroutine.
+        """
+        future = asyncio.get_running_loop().create_future()
+        item = QueuedTask(
+            priority=priority,
+            sequence=next(self._sequence),
+            name=name,
+            agent=agent,
+            factory=factory,
+            future=future,
+            timeout=self.task_timeout if timeout is None else timeout,
+            retries=self.max_retries if retries is None else retries
+        )
+        self.stats['submitted'] += 1
+        heapq.heappush(self._queue, item)
+        self._dispatch()
+        return future
+
+    def _dispatch(self):
+        """Start queued tasks while worker and per-agent capacity allow"""
+        while self._running < self.max_workers and self._queue:
+            blocked = []
+            item = None
+            while self._queue:
+                candidate = heapq.heappop(self._queue)
+                if candidate.future.done():
+                    continue
+                if (self._agent_running.get(candidate.agent, 0) < self.limit_for(candidate.agent)
+                        and self._admits(candidate)):
+                    item = candidate
+                    break
+                blocked.append(candidate)
+            for candidate in blocked:
+                heapq.heappush(self._queue, candidate)
+            if item is None:
+                return
+
+            self._running += 1
+            self._agent_running[item.agent] = self._agent_running.get(item.agent, 0) + 1
+            self._running_names.append(item.name)
+            self.stats['peak_running'] = max(self.stats['peak_running'], self._running)
+            task = asyncio.ensure_future(self._run(item))
+            self._tasks.add(task)
+            task.add_done_callback(functools.partial(self._task_done, item))
+
+    def _task_done(self, item: QueuedTask, task: asyncio.Task):
+        """Forget a finished attempt, failing its future if _run itself was cancelled or raised"""
+        self._tasks.discard(task)
+        if item.future.done():
+            return
+        if task.cancelled():
+            item.future.cancel()
+        elif task.exception() is not None:
+            item.future.set_exception(task.exception())
+
+    async def _run(self, item: QueuedTask):
+        """Run one attempt of a queued task"""
+        error = None
+        result = None
+        try:
+            result = await asyncio.wait_for(item.factory(), timeout=item.timeout)
+        except asyncio.TimeoutError:
+            self.stats['timed_out'] += 1
+            error = TimeoutError(f"{item.name} timed out after {item.timeout}s")
+        except Exception as e:
+            error = e
+        finally:
+            self._running -= 1
+            self._agent_running[item.agent] -= 1
+            self._running_names.remove(item.name)
+
+        if item.future.done():
+            pass
+        elif error is None:
+            self.stats['completed'] += 1
+            item.future.set_result(result)
+        elif item.attempt < item.retries:
+            item.attempt += 1
+            self.stats['retried'] += 1
+            delay = self.retry_backoff * (2 ** (item.attempt - 1))
+            self.logger.warning(
+                f"Task {item.name} failed ({error}); retry {item.attempt}/{item.retries} in {delay:.2f}s"
+            )
+            handle = asyncio.get_running_loop().call_later(delay, self._requeue, item)
+            self._retry_handles.add(handle)
+            item.retry_handle = handle
+        else:
+            self.stats['failed'] += 1
+            item.future.set_exception(error)
+
+        self._dispatch()
+
+    def _admits(self, item: QueuedTask) -> bool:
+        """Check the memory budget; a task always starts when nothing else is running"""
+        if self._running == 0:
+            return True
+        admitted, projected, limit = self.admission.admits(item.name, self._running_names)
+        if not admitted and not item.memory_delayed:
+            item.memory_delayed = True
+            self.stats['memory_delays'] += 1
+            self.logger.info(
+                f"Delaying task {item.name}: projected {projected / 1024 ** 3:.2f}GB "
+                f"exceeds the {limit / 1024 ** 3:.2f}GB memory limit"
+            )
+        return admitted
+
+    def _requeue(self, item: QueuedTask):
+        """Put a task back on the queue after its backoff delay"""
+        self._retry_handles.discard(item.retry_handle)
+        heapq.heappush(self._queue, item)
+        self._dispatch()
+
+    async def shutdown(self):
+        """Cancel queued tasks, pending retries and running attempts, and wait for them to stop"""
+        for handle in self._retry_handles:
+            handle.cancel()
+        self._retry_handles.clear()
+        for item in self._queue:
+            if not item.future.done():
+                item.future.cancel()
+        self._queue.clear()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    # Checks the finished build, so it waits for every other task's output
+    @task_spec(
+        phase='integration',
+        inputs=['unity_integration', 'character_code', 'mechanics_code', 'level_optimization'],
+        outputs=['test_report']
+    )
+    async def run_test_suite(self):
+        """Validate generated artifacts in parallel"""
+        self.logger.info("Running generated artifact test suite...")
+
+        # Listing a large project walks thousands of paths, so it runs off the loop too
+        loop = asyncio.get_running_loop()
+        files = await loop.run_in_executor(None, self._list_artifacts)
+
+        chunk_count = min(self.max_workers, len(files)) or 1
+        chunks = [files[i::chunk_count] for i in range(chunk_count)]
+
+        chunk_results = await asyncio.gather(*[
+            loop.run_in_executor(None, self._check_artifacts, chunk) for chunk in chunks
+        ])
+        failures = [failure for chunk in chunk_results for failure in chunk]
+
+        for failure in failures:
+            self.logger.error(f"Artifact check failed: {failure}")
+
+        if failures:
+            raise RuntimeError(f"{len(failures)} of {len(files)} artifact checks failed")
+
+        self.logger.info(f"Artifact test suite passed: {len(files)} files checked")
+        return {
+            'helper': 'task_manager',
+            'task': 'run_test_suite',
+            'result': 'success',
+            'tests_run': len(files),
+            'performance': 1.0
+        }
+
+    def _list_artifacts(self) -> List[Path]:
+        """Generated JSON and C# files plus the Unity project's scripts, in a stable order"""
+        assets = Path(self.config['unity']['project_path']) / "Assets"
+        files = []
+        for root, pattern in ((Path("output"), "*.json"), (Path("output"), "*.cs"), (assets, "*.cs")):
+            files.extend(sorted(root.rglob(pattern), key=str))
+        return files
+
+    @staticmethod
+    def _check_artifacts(paths: List[Path]) -> List[str]:
+        """Check a batch of artifacts, returning failure descriptions"""
+        failures = []
+        for path in paths:
+            try:
+                content = path.read_text(encoding='utf-8')
+            except (OSError, UnicodeDecodeError) as e:
+                failures.append(f"{path}: unreadable ({e})")
+                continue
+
+            if path.suffix == '.json':
+                try:
+                    json.loads(content)
+                except ValueError as e:
+                    failures.append(f"{path}: invalid JSON ({e})")
+            elif path.suffix == '.cs':
+                if content.count('{') != content.count('}'):
+                    failures.append(f"{path}: unbalanced braces")
+                if not re.search(r'\b(class|interface|enum|struct)\s+\w+', content):
+                    failures.append(f"{path}: no type declaration")
+        return failures
@@ -3,22 +3,102 @@ Unity Helper - Manages Unity project integration
 """
 
 import asyncio
+import contextvars
 import json
+import os
 import shutil
+import time
 from pathlib import Path
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Set
+
+from ai_helpers.unity_meta import asset_folders, asset_meta, folder_meta, meta_path
+from task_graph import task_spec
+from utils.artifact_manifest import manifest_key
+from utils.artifact_writer import ArtifactWriter, files_identical
+from utils.build_cache import BuildCache
+from utils.inotify import InotifyWatcher
+from utils.tracing import traced
+
+# Generated output directory -> (Unity project directory, file suffix)
+INTEGRATION_TARGETS = {
+    'output/unity_scripts/characters': ('Assets/Scripts/Characters', '.cs'),
+    'output/unity_scripts/weapons': ('Assets/Scripts/Weapons', '.cs'),
+    'output/unity_scripts/missions': ('Assets/Scripts/Missions', '.cs'),
+    'output/unity_scripts/ai': ('Assets/Scripts/AI', '.cs'),
+    'output/game_assets/characters': ('Assets/Resources/GameData/Characters', '.json'),
+    'output/game_assets/weapons': ('Assets/Resources/GameData/Weapons', '.json'),
+    'output/game_assets/gear': ('Assets/Resources/GameData/Gear', '.json'),
+    'output/game_assets/missions': ('Assets/Resources/GameData/Missions', '.json'),
+    'output/game_assets/scenes': ('Assets/Resources/GameData/Scenes', '.json'),
+    'output/game_assets/environment': ('Assets/Resources/GameData/Environment', '.json')
+}
+
+WATCH_ROOTS = ['output/unity_scripts', 'output/game_assets']
+
+INTEGRATION_STATE_FILE = '.ghost_integration_state.json'
+
+FICLONE = 0x40049409
+
+# Link methods that failed once are not retried for the rest of the process
+_unsupported_methods = set()
+
+
+def _reflink(source: Path, target: Path) -> bool:
+    """Clone source into target with a copy-on-write reflink, if supported"""
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        target.unlink(missing_ok=True)
+        return False
+    shutil.copystat(source, target)
+    return True
+
+
+def link_or_copy(source: Path, target: Path, mode: str = 'auto') -> str:
+    """Place source at target by reflink, hardlink or copy; return the method used"""
+    temp_target = target.with_name(f".{target.name}.tmp")
+    if temp_target.exists():
+        temp_target.unlink()
+    
+    method = 'copy'
+    if mode in ('auto', 'reflink') and 'reflink' not in _unsupported_methods:
+        if _reflink(source, temp_target):
+            method = 'reflink'
+        else:
+            _unsupported_methods.add('reflink')
+    if method == 'copy' and mode in ('auto', 'hardlink') and 'hardlink' not in _unsupported_methods:
+        try:
+            os.link(source, temp_target)
+            method = 'hardlink'
+        except OSError:
+            _unsupported_methods.add('hardlink')
+    if method == 'copy':
+        shutil.copy2(source, temp_target)
+    
+    os.replace(temp_target, target)
+    return method
+
 
 class UnityHelper:
     def __init__(self, config: Dict, logger):
         self.config = config
         self.logger = logger
         self.unity_path = Path(config['unity']['project_path'])
+        self.build_cache = BuildCache.shared(config)
+        self.writer = ArtifactWriter.shared(config)
+        self.link_mode = config['unity'].get('link_mode', 'auto')
         
     async def initialize(self):
         """Initialize Unity helper"""
         self.logger.info("Unity Helper initialized")
         return True
     
+    @task_spec(phase='coding', outputs=['unity_project'])
     async def setup_unity_project(self):
         """Setup Unity project structure"""
         self.logger.info("Setting up Unity project structure...")
@@ -62,43 +142,243 @@ class UnityHelper:
             'performance': 0.95
         }
     
+    @task_spec(
+        phase='integration',
+        inputs=[
+            'unity_project', 'player_character', 'ai_team', 'weapons', 'gear',
+            'missions', 'scenes', 'environment_assets', 'ai_code'
+        ],
+        outputs=['unity_integration']
+    )
     async def integrate_assets(self):
         """Integrate generated assets into Unity project"""
         self.logger.info("Integrating assets into Unity project...")
         
-        integration_tasks = [
-            self._integrate_character_scripts(),
-            self._integrate_weapon_scripts(),
-            self._integrate_mission_scripts(),
-            self._integrate_ai_scripts()
-        ]
+        manifest = self.writer.manifest
+        if not manifest.loaded:
+            # No manifest from an earlier run: index what is already on disk
+            await asyncio.get_running_loop().run_in_executor(None, self._scan_sources, manifest)
+        
+        state = self._load_integration_state()
+        delta = await asyncio.get_running_loop().run_in_executor(None, self._integration_delta, manifest, state)
         
-        await asyncio.gather(*integration_tasks)
+        # Run in a copy of this task's context so the metas it writes count towards the task
+        counts = await asyncio.get_running_loop().run_in_executor(
+            None, contextvars.copy_context().run, self._apply_delta, delta, state
+        )
+        if delta:
+            self._save_integration_state(state)
+        
+        self.logger.info(
+            f"Integrated {len(delta)} changed assets "
+            f"({', '.join(f'{count} {method}' for method, count in counts.items() if count) or 'none'})"
+        )
         
         return {
             'helper': 'unity_helper',
             'task': 'integrate_assets',
             'result': 'success',
-            'assets_integrated': 'All generated assets',
+            'assets_integrated': len(delta),
             'performance': 0.92
         }
     
+    @staticmethod
+    def _scan_sources(manifest):
+        """Record integratable files that are on disk but not in the manifest"""
+        for source, (_, suffix) in INTEGRATION_TARGETS.items():
+            manifest.scan([Path(source)], f"*{suffix}")
+    
+    def _integration_target(self, source: str):
+        """Map a generated file path to its location in the Unity project"""
+        source_path = Path(source)
+        mapping = INTEGRATION_TARGETS.get(source_path.parent.as_posix())
+        if mapping is None or source_path.suffix != mapping[1]:
+            return None
+        return self.unity_path / mapping[0] / source_path.name
+    
+    def _integration_delta(self, manifest, state: Dict[str, str]) -> List:
+        """Sources changed since they were integrated, plus any whose Unity copy has been deleted"""
+        delta = []
+        for source, entry in manifest.items():
+            target = self._integration_target(source)
+            if target is not None and (state.get(source) != entry['sha256'] or not target.exists()):
+                delta.append((source, target, entry['sha256']))
+        return delta
+    
+    def _load_integration_state(self) -> Dict[str, str]:
+        """Load the manifest hashes integrated by the previous run"""
+        try:
+            with open(self.unity_path / INTEGRATION_STATE_FILE, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_integration_state(self, state: Dict[str, str]):
+        """Persist the integrated manifest hashes"""
+        state_path = self.unity_path / INTEGRATION_STATE_FILE
+        state_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(state_path, 'w') as f:
+            json.dump(state, f, indent=2, sort_keys=True)
+    
+    def _apply_delta(self, delta: List, state: Dict[str, str]) -> Dict[str, int]:
+        """Bring each changed asset into the project, cheapest method first"""
+        counts = {'unchanged': 0, 'reflink': 0, 'hardlink': 0, 'copy': 0}
+        # Assets share their ancestor folders, so each folder meta is written once per pass
+        written_folders = set()
+        for source, target, digest in delta:
+            source_path = Path(source)
+            if not source_path.exists():
+                continue
+            if files_identical(source_path, target):
+                counts['unchanged'] += 1
+            else:
+                target.parent.mkdir(parents=True, exist_ok=True)
+                counts[link_or_copy(source_path, target, self.link_mode)] += 1
+            self._write_asset_metas(target, written_folders)
+            state[source] = digest
+        return counts
+    
+    def _write_asset_metas(self, asset: Path, written_folders: Set[Path]):
+        """Write deterministic .meta files for an asset and any of its folders not yet written.
+
+        Metas are Unity bookkeeping rather than generated artifacts, so they
+        are kept out of the artifact manifest.
+        """
+        for folder in asset_folders(asset, self.unity_path):
+            if folder not in written_folders:
+                written_folders.add(folder)
+                self.writer.write_text_blocking(
+                    meta_path(folder), folder_meta(folder, self.unity_path), record=False
+                )
+        self.writer.write_text_blocking(meta_path(asset), asset_meta(asset, self.unity_path), record=False)
+    
+    async def watch(self, debounce: Optional[float] = None):
+        """Continuously sync changed generated files into the Unity project"""
+        debounce = self.config['unity'].get('watch_debounce', 0.2) if debounce is None else debounce
+        loop = asyncio.get_running_loop()
+        watcher = InotifyWatcher()
+        for root in WATCH_ROOTS:
+            Path(root).mkdir(parents=True, exist_ok=True)
+            watcher.add_tree(Path(root))
+        
+        changed = set()
+        flush_handle = None
+        syncing = asyncio.Lock()
+        # Running flushes, held so they are not garbage-collected and can be awaited on close
+        flushes = set()
+        
+        async def flush():
+            async with syncing:
+                if watcher.overflowed:
+                    watcher.overflowed = False
+                    self.logger.warning("inotify queue overflowed; rescanning generated output")
+                    for source in INTEGRATION_TARGETS:
+                        changed.update(str(path) for path in Path(source).glob("*"))
+                paths = sorted(changed)
+                changed.clear()
+                if not paths:
+                    return
+                started = time.perf_counter()
+                counts = await loop.run_in_executor(None, self._sync_paths, paths)
+                applied = sum(counts.values()) - counts['unchanged']
+                if applied:
+                    self.logger.info(
+                        f"Watch: synced {applied} files into Unity in "
+                        f"{(time.perf_counter() - started) * 1000:.1f}ms "
+                        f"({', '.join(f'{count} {method}' for method, count in counts.items() if count)})"
+                    )
+        
+        def flush_done(task: asyncio.Task):
+            flushes.discard(task)
+            if not task.cancelled() and task.exception() is not None:
+                self.logger.error(f"Watch: sync failed: {task.exception()!r}")
+        
+        def start_flush():
+            task = asyncio.ensure_future(flush())
+            flushes.add(task)
+            task.add_done_callback(flush_done)
+        
+        def on_events():
+            nonlocal flush_handle
+            for path, _ in watcher.read_events():
+                changed.add(path.as_posix())
+            if changed or watcher.overflowed:
+                if flush_handle is not None:
+                    flush_handle.cancel()
+                flush_handle = loop.call_later(debounce, start_flush)
+        
+        loop.add_reader(watcher.fileno(), on_events)
+        self.logger.info(f"Watching {', '.join(WATCH_ROOTS)} for changes (debounce {debounce * 1000:.0f}ms)")
+        try:
+            await asyncio.Event().wait()
+        finally:
+            loop.remove_reader(watcher.fileno())
+            if flush_handle is not None:
+                flush_handle.cancel()
+            # Let syncs already under way finish so the integration state is saved
+            await asyncio.gather(*flushes, return_exceptions=True)
+            watcher.close()
+    
+    def _sync_paths(self, paths: List[str]) -> Dict[str, int]:
+        """Apply changed or deleted generated files to the Unity project"""
+        state = self._load_integration_state()
+        delta = []
+        counts = {'removed': 0}
+        for source in paths:
+            target = self._integration_target(source)
+            if target is None:
+                continue
+            if not os.path.exists(source):
+                if state.pop(source, None) is not None or target.exists():
+                    target.unlink(missing_ok=True)
+                    meta_path(target).unlink(missing_ok=True)
+                    counts['removed'] += 1
+                continue
+            self.writer.manifest.record_file(source)
+            digest = self.writer.manifest.entries[manifest_key(source)]['sha256']
+            if state.get(source) != digest or not target.exists():
+                delta.append((source, target, digest))
+        
+        counts.update(self._apply_delta(delta, state))
+        if delta or counts['removed']:
+            self._save_integration_state(state)
+            self.writer.manifest.save()
+        return counts
+    
+    @traced()
     async def _create_project_structure(self, structure: Dict):
         """Create Unity project directory structure"""
+        folders = []
+        
         def create_dirs(base_path: Path, struct: Dict):
             for folder, subfolders in struct.items():
                 folder_path = base_path / folder
                 folder_path.mkdir(parents=True, exist_ok=True)
+                folders.append(folder_path)
                 if isinstance(subfolders, dict):
                     create_dirs(folder_path, subfolders)
         
         create_dirs(self.unity_path, structure)
+        
+        # Folders under Assets need stable .meta files too
+        assets_root = self.unity_path / "Assets"
+        await asyncio.gather(*[
+            self.writer.write_text(meta_path(folder), folder_meta(folder, self.unity_path), record=False)
+            for folder in folders
+            if assets_root in folder.parents
+        ])
         self.logger.info("Unity project structure created")
     
+    @traced()
     async def _generate_core_unity_scripts(self):
         """Generate core Unity scripts"""
         scripts_dir = self.unity_path / "Assets" / "Scripts" / "Managers"
-        scripts_dir.mkdir(parents=True, exist_ok=True)
+        script_path = scripts_dir / "GameManager.cs"
+        script_meta_path = meta_path(script_path)
+        
+        cache_key = self.build_cache.key(self, 'core_unity_scripts', {'scripts': ['GameManager']})
+        if await self.build_cache.lookup('unity_helper.setup_unity_project', cache_key):
+            return
         
         # Game Manager
         game_manager_script = """
@@ -162,50 +442,11 @@ public class GameManager : MonoBehaviour
 }
 """
         
-        with open(scripts_dir / "GameManager.cs", 'w') as f:
-            f.write(game_manager_script)
-    
-    async def _integrate_character_scripts(self):
-        """Integrate character scripts into Unity project"""
-        source_dir = Path("output/unity_scripts/characters")
-        target_dir = self.unity_path / "Assets" / "Scripts" / "Characters"
-        
-        if source_dir.exists():
-            # Copy all character scripts
-            for script_file in source_dir.glob("*.cs"):
-                shutil.copy2(script_file, target_dir / script_file.name)
-            
-            self.logger.info(f"Integrated {len(list(source_dir.glob('*.cs')))} character scripts")
-    
-    async def _integrate_weapon_scripts(self):
-        """Integrate weapon scripts into Unity project"""
-        source_dir = Path("output/unity_scripts/weapons")
-        target_dir = self.unity_path / "Assets" / "Scripts" / "Weapons"
-        
-        if source_dir.exists():
-            for script_file in source_dir.glob("*.cs"):
-                shutil.copy2(script_file, target_dir / script_file.name)
-            
-            self.logger.info(f"Integrated {len(list(source_dir.glob('*.cs')))} weapon scripts")
-    
-    async def _integrate_mission_scripts(self):
-        """Integrate mission scripts into Unity project"""
-        source_dir = Path("output/unity_scripts/missions")
-        target_dir = self.unity_path / "Assets" / "Scripts" / "Missions"
-        
-        if source_dir.exists():
-            for script_file in source_dir.glob("*.cs"):
-                shutil.copy2(script_file, target_dir / script_file.name)
-            
-            self.logger.info(f"Integrated {len(list(source_dir.glob('*.cs')))} mission scripts")
-    
-    async def _integrate_ai_scripts(self):
-        """Integrate AI scripts into Unity project"""
-        source_dir = Path("output/unity_scripts/ai")
-        target_dir = self.unity_path / "Assets" / "Scripts" / "AI"
-        
-        if source_dir.exists():
-            for script_file in source_dir.glob("*.cs"):
-                shutil.copy2(script_file, target_dir / script_file.name)
-            
-            self.logger.info(f"Integrated {len(list(source_dir.glob('*.cs')))} AI scripts")
+        await asyncio.gather(
+            self.writer.write_text(script_path, game_manager_script),
+            self.writer.write_text(
+                script_meta_path, asset_meta(script_path, self.unity_path, game_manager_script), record=False
+            )
+        )
+        
+        self.build_cache.store(cache_key, [script_path, script_meta_path])
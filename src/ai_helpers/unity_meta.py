@@ -0,0 +1,80 @@
+"""
+Unity .meta generation with deterministic GUIDs
+"""
+
+import hashlib
+import re
+from pathlib import Path
+
+_CLASS_PATTERN = re.compile(r'\b(?:class|struct|interface|enum)\s+(\w+)')
+
+MONO_SCRIPT_META = """fileFormatVersion: 2
+guid: {guid}
+MonoImporter:
+  externalObjects: {{}}
+  serializedVersion: 2
+  defaultReferences: []
+  executionOrder: 0
+  icon: {{instanceID: 0}}
+  userData: 
+  assetBundleName: 
+  assetBundleVariant: 
+"""
+
+TEXT_ASSET_META = """fileFormatVersion: 2
+guid: {guid}
+TextScriptImporter:
+  externalObjects: {{}}
+  userData: 
+  assetBundleName: 
+  assetBundleVariant: 
+"""
+
+FOLDER_META = """fileFormatVersion: 2
+guid: {guid}
+folderAsset: yes
+DefaultImporter:
+  externalObjects: {{}}
+  userData: 
+  assetBundleName: 
+  assetBundleVariant: 
+"""
+
+
+def unity_guid(asset_path: str, identity: str) -> str:
+    """Derive a stable 32-hex-digit Unity GUID from an asset path and identity"""
+    return hashlib.md5(f"{asset_path}:{identity}".encode('utf-8')).hexdigest()
+
+
+def script_class_name(source: str, fallback: str) -> str:
+    """Return the first type declared in a C# script"""
+    match = _CLASS_PATTERN.search(source)
+    return match.group(1) if match else fallback
+
+
+def meta_path(asset: Path) -> Path:
+    return asset.with_name(asset.name + '.meta')
+
+
+def asset_meta(asset: Path, project_root: Path, content: str = None) -> str:
+    """Build the .meta content for a script or text asset"""
+    asset_path = asset.relative_to(project_root).as_posix()
+    if asset.suffix == '.cs':
+        if content is None:
+            content = asset.read_text(encoding='utf-8')
+        identity = script_class_name(content, asset.stem)
+        return MONO_SCRIPT_META.format(guid=unity_guid(asset_path, identity))
+    return TEXT_ASSET_META.format(guid=unity_guid(asset_path, asset.stem))
+
+
+def folder_meta(folder: Path, project_root: Path) -> str:
+    """Build the .meta content for a folder under Assets"""
+    folder_path = folder.relative_to(project_root).as_posix()
+    return FOLDER_META.format(guid=unity_guid(folder_path, folder.name))
+
+
+def asset_folders(asset: Path, project_root: Path):
+    """Yield the folders between Assets/ (exclusive) and an asset"""
+    relative = asset.relative_to(project_root).parts
+    for depth in range(2, len(relative)):
+        yield project_root.joinpath(*relative[:depth])
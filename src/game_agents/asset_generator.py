@@ -4,116 +4,307 @@ Asset Generator AI Agent - Creates weapons, gear, and game assets
 
 import asyncio
 import json
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any, Optional
 from pathlib import Path
 
+from task_graph import task_spec
+from utils.artifact_writer import ArtifactWriter
+from utils.build_cache import BuildCache
+from utils.content_pack import ContentPack
+from utils.render_pool import RenderPool
+from utils.templates import compile_template, csharp_interpolated, csharp_string, csharp_string_list
+from utils.tracing import traced
+
+# Built-in weapon catalog
+DEFAULT_WEAPONS = [
+    {
+        'name': 'Phantom Rifle',
+        'type': 'Assault Rifle',
+        'damage': 45,
+        'fire_rate': 650,
+        'accuracy': 0.85,
+        'range': 300,
+        'special_features': ['Silenced', 'Custom Optics', 'Underbarrel Launcher'],
+        'unlock_requirement': 'Mission 3 Completion'
+    },
+    {
+        'name': 'Wraith Sniper',
+        'type': 'Sniper Rifle',
+        'damage': 95,
+        'fire_rate': 40,
+        'accuracy': 0.98,
+        'range': 800,
+        'special_features': ['Thermal Scope', 'Bipod', 'Armor Piercing'],
+        'unlock_requirement': 'Sniper Specialist Level 10'
+    },
+    {
+        'name': 'Spectre SMG',
+        'type': 'Submachine Gun',
+        'damage': 30,
+        'fire_rate': 900,
+        'accuracy': 0.75,
+        'range': 150,
+        'special_features': ['Integrated Suppressor', 'Rapid Fire', 'Laser Sight'],
+        'unlock_requirement': 'Default'
+    }
+]
+
+# Built-in gear catalog
+DEFAULT_GEAR = [
+    {
+        'name': 'Tactical Body Armor',
+        'type': 'Armor',
+        'protection': 0.6,
+        'mobility_penalty': 0.1,
+        'special_features': ['Ballistic Plates', 'Modular Attachments'],
+        'slots': 3
+    },
+    {
+        'name': 'Advanced Comms System',
+        'type': 'Gadget',
+        'function': 'Team Communication',
+        'special_features': ['Encrypted Channels', 'Long Range', 'Multi-Frequency'],
+        'unlock_requirement': 'Team Leader'
+    },
+    {
+        'name': 'Stealth Cloaking Device',
+        'type': 'Special Equipment',
+        'function': 'Temporary Invisibility',
+        'duration': 30,
+        'cooldown': 120,
+        'special_features': ['Heat Signature Masking', 'Sound Dampening'],
+        'unlock_requirement': 'Completion of Stealth Training'
+    }
+]
+
+WEAPON_SCRIPT = compile_template("""
+using UnityEngine;
+using System.Collections;
+
+public class {{class_name}} : WeaponBase
+{
+    [Header("{{name}} - {{type}}")]
+    public float baseDamage = {{damage}}f;
+    public float fireRate = {{fire_rate}}f;
+    public float accuracy = {{accuracy}}f;
+    public float effectiveRange = {{range}}f;
+    
+    [Header("Weapon Features")]
+    public string[] specialFeatures = new string[]
+    {
+        {{feature_list}}
+    };
+    
+    void Start()
+    {
+        weaponName = "{{name}}";
+        weaponType = WeaponType.{{type_enum}};
+        InitializeWeapon();
+    }
+    
+    public override void InitializeWeapon()
+    {
+        base.InitializeWeapon();
+        
+        // Setup weapon-specific parameters
+        ammoCapacity = 30;
+        reloadTime = 2.5f;
+        
+        Debug.Log($"{{log_name}} initialized and ready for combat");
+    }
+    
+    public override void FireWeapon()
+    {
+        if (CanFire())
+        {
+            base.FireWeapon();
+            
+            // Weapon-specific firing logic
+            ApplyRecoil();
+            PlayFireEffects();
+            
+            Debug.Log("Firing " + weaponName);
+        }
+    }
+    
+    public override void Reload()
+    {
+        base.Reload();
+        Debug.Log("Reloading " + weaponName);
+    }
+    
+    public void ApplySpecialFeature(string feature)
+    {
+        switch (feature)
+        {
+{{feature_cases}}
+        }
+    }
+}
+""")
+
+WEAPON_FEATURE_CASE = compile_template("""
+            case "{{feature}}":
+                // Implement {{feature}} functionality
+                break;
+""")
+
+GEAR_SCRIPT = compile_template("""
+using UnityEngine;
+using System.Collections;
+
+public class {{class_name}} : GearBase
+{
+    [Header("{{name}}")]
+    public string gearType = "{{type}}";
+    
+    {{protection_field}}
+    {{mobility_field}}
+    {{duration_field}}
+    {{cooldown_field}}
+    
+    [Header("Special Features")]
+    public string[] specialFeatures = new string[]
+    {
+        {{feature_list}}
+    };
+    
+    void Start()
+    {
+        gearName = "{{name}}";
+        InitializeGear();
+    }
+    
+    public override void InitializeGear()
+    {
+        base.InitializeGear();
+        Debug.Log("{{name}} equipped and ready");
+    }
+    
+    public override void UseGear()
+    {
+        base.UseGear();
+        
+        // Gear-specific usage logic
+        Debug.Log("Using " + gearName);
+        
+        {{cooldown_start}}
+    }
+    
+    {{cooldown_routine}}
+}
+""")
+
+GEAR_COOLDOWN_ROUTINE = """
+    IEnumerator CooldownRoutine()
+    {
+        yield return new WaitForSeconds(cooldown);
+        ReadyGear();
+    }
+    """
+
+def _float_field(data: Dict, key: str, field: str) -> str:
+    return f'public float {field} = {data[key]}f;' if key in data else ''
+
+def weapon_script_values(weapon_data: Dict) -> Dict:
+    """Template values for a weapon record"""
+    return {
+        'class_name': weapon_data['name'].replace(' ', ''),
+        'name': csharp_string(weapon_data['name']),
+        'log_name': csharp_interpolated(weapon_data['name']),
+        'type': csharp_string(weapon_data['type']),
+        'type_enum': weapon_data['type'].replace(' ', ''),
+        'damage': weapon_data['damage'],
+        'fire_rate': weapon_data['fire_rate'],
+        'accuracy': weapon_data['accuracy'],
+        'range': weapon_data['range'],
+        'feature_list': csharp_string_list(weapon_data['special_features']),
+        # Each case starts with its own newline, so the slot sits at column 0 in WEAPON_SCRIPT
+        'feature_cases': WEAPON_FEATURE_CASE.join_rows(zip(map(csharp_string, weapon_data['special_features'])))
+    }
+
+def gear_script_values(gear_data: Dict) -> Dict:
+    """Template values for a gear record"""
+    has_cooldown = 'cooldown' in gear_data
+    return {
+        'class_name': gear_data['name'].replace(' ', ''),
+        'name': csharp_string(gear_data['name']),
+        'type': csharp_string(gear_data['type']),
+        'protection_field': _float_field(gear_data, 'protection', 'protection'),
+        'mobility_field': _float_field(gear_data, 'mobility_penalty', 'mobilityPenalty'),
+        'duration_field': _float_field(gear_data, 'duration', 'duration'),
+        'cooldown_field': _float_field(gear_data, 'cooldown', 'cooldown'),
+        'feature_list': csharp_string_list(gear_data['special_features']),
+        'cooldown_start': 'StartCoroutine(CooldownRoutine());' if has_cooldown else '',
+        'cooldown_routine': GEAR_COOLDOWN_ROUTINE if has_cooldown else ''
+    }
+
+def render_weapon_script(weapon_data: Dict) -> str:
+    """Generate Unity C# script for weapon"""
+    return WEAPON_SCRIPT.render(weapon_script_values(weapon_data))
+
+def render_weapon_scripts(weapons: List[Dict]) -> List[str]:
+    """Generate Unity C# scripts for many weapons in one call"""
+    return WEAPON_SCRIPT.render_many(weapon_script_values(weapon) for weapon in weapons)
+
+def render_gear_script(gear_data: Dict) -> str:
+    """Generate Unity C# script for gear"""
+    return GEAR_SCRIPT.render(gear_script_values(gear_data))
+
+def render_gear_scripts(gear_items: List[Dict]) -> List[str]:
+    """Generate Unity C# scripts for many gear items in one call"""
+    return GEAR_SCRIPT.render_many(gear_script_values(gear) for gear in gear_items)
+
 class AssetGenerator:
     def __init__(self, config: Dict, logger):
         self.config = config
         self.logger = logger
         self.assets_created = 0
+        self.build_cache = BuildCache.shared(config)
+        self.writer = ArtifactWriter.shared(config)
+        self.content = ContentPack(config, logger)
+        self.renderer = RenderPool.shared(config)
         
     async def initialize(self):
         """Initialize the asset generator"""
         self.logger.info("Asset Generator initialized")
         return True
     
-    async def generate_weapons(self):
+    @task_spec(phase='creation', outputs=['weapons'])
+    async def generate_weapons(self, weapons: Optional[Iterable[Dict]] = None):
         """Generate weapon systems"""
         self.logger.info("Generating weapon systems...")
         
-        weapons = [
-            {
-                'name': 'Phantom Rifle',
-                'type': 'Assault Rifle',
-                'damage': 45,
-                'fire_rate': 650,
-                'accuracy': 0.85,
-                'range': 300,
-                'special_features': ['Silenced', 'Custom Optics', 'Underbarrel Launcher'],
-                'unlock_requirement': 'Mission 3 Completion'
-            },
-            {
-                'name': 'Wraith Sniper',
-                'type': 'Sniper Rifle',
-                'damage': 95,
-                'fire_rate': 40,
-                'accuracy': 0.98,
-                'range': 800,
-                'special_features': ['Thermal Scope', 'Bipod', 'Armor Piercing'],
-                'unlock_requirement': 'Sniper Specialist Level 10'
-            },
-            {
-                'name': 'Spectre SMG',
-                'type': 'Submachine Gun',
-                'damage': 30,
-                'fire_rate': 900,
-                'accuracy': 0.75,
-                'range': 150,
-                'special_features': ['Integrated Suppressor', 'Rapid Fire', 'Laser Sight'],
-                'unlock_requirement': 'Default'
-            }
-        ]
-        
-        generation_tasks = []
-        for weapon in weapons:
-            generation_tasks.append(self._generate_weapon(weapon))
+        weapons = self.content.records('weapons', DEFAULT_WEAPONS) if weapons is None else weapons
         
-        await asyncio.gather(*generation_tasks)
+        created = await self.content.run_batched(weapons, self._generate_weapon_batch)
         
         return {
             'agent': 'asset_generator',
             'task': 'generate_weapons',
             'result': 'success',
-            'weapons_created': len(weapons),
+            'weapons_created': created,
             'performance': 0.90
         }
     
-    async def generate_gear(self):
+    @task_spec(phase='creation', outputs=['gear'])
+    async def generate_gear(self, gear_items: Optional[Iterable[Dict]] = None):
         """Generate gear and equipment"""
         self.logger.info("Generating gear and equipment...")
         
-        gear_items = [
-            {
-                'name': 'Tactical Body Armor',
-                'type': 'Armor',
-                'protection': 0.6,
-                'mobility_penalty': 0.1,
-                'special_features': ['Ballistic Plates', 'Modular Attachments'],
-                'slots': 3
-            },
-            {
-                'name': 'Advanced Comms System',
-                'type': 'Gadget',
-                'function': 'Team Communication',
-                'special_features': ['Encrypted Channels', 'Long Range', 'Multi-Frequency'],
-                'unlock_requirement': 'Team Leader'
-            },
-            {
-                'name': 'Stealth Cloaking Device',
-                'type': 'Special Equipment',
-                'function': 'Temporary Invisibility',
-                'duration': 30,
-                'cooldown': 120,
-                'special_features': ['Heat Signature Masking', 'Sound Dampening'],
-                'unlock_requirement': 'Completion of Stealth Training'
-            }
-        ]
-        
-        generation_tasks = []
-        for gear in gear_items:
-            generation_tasks.append(self._generate_gear_item(gear))
+        gear_items = self.content.records('gear', DEFAULT_GEAR) if gear_items is None else gear_items
         
-        await asyncio.gather(*generation_tasks)
+        created = await self.content.run_batched(gear_items, self._generate_gear_batch)
         
         return {
             'agent': 'asset_generator',
             'task': 'generate_gear',
             'result': 'success',
-            'gear_created': len(gear_items),
+            'gear_created': created,
             'performance': 0.87
         }
     
+    @task_spec(phase='creation', inputs=['world_design'], outputs=['environment_assets'])
     async def generate_environment_assets(self):
         """Generate environment assets"""
         self.logger.info("Generating environment assets...")
@@ -136,189 +327,85 @@ class AssetGenerator:
             'performance': 0.84
         }
     
-    async def _generate_weapon(self, weapon_data: Dict):
-        """Generate individual weapon"""
-        # Generate Unity script for weapon
-        weapon_script = self._generate_weapon_script(weapon_data)
-        
-        # Save weapon data
-        weapons_dir = Path("output/game_assets/weapons")
-        weapons_dir.mkdir(parents=True, exist_ok=True)
+    async def _generate_weapon_batch(self, weapons: List[Dict]):
+        """Generate a batch of weapons, rendering the uncached ones in one call"""
+        keys = [self.build_cache.key(self, 'weapon', weapon_data) for weapon_data in weapons]
+        cached = await self.build_cache.lookup_many('asset_generator.generate_weapons', keys)
+        pending = [
+            (weapon_data, cache_key) for weapon_data, cache_key, hit in zip(weapons, keys, cached) if not hit
+        ]
         
-        with open(weapons_dir / f"{weapon_data['name'].lower().replace(' ', '_')}.json", 'w') as f:
-            json.dump(weapon_data, f, indent=2)
+        # Generate Unity scripts for the weapons
+        scripts = await self.renderer.render_many(render_weapon_scripts, [weapon for weapon, _ in pending])
         
-        # Save Unity weapon script
+        await asyncio.gather(*(
+            self._generate_weapon(weapon_data, cache_key, weapon_script)
+            for (weapon_data, cache_key), weapon_script in zip(pending, scripts)
+        ))
+    
+    @traced()
+    async def _generate_weapon(self, weapon_data: Dict, cache_key: str, weapon_script: str):
+        """Generate individual weapon"""
+        weapons_dir = Path("output/game_assets/weapons")
         scripts_dir = Path("output/unity_scripts/weapons")
-        scripts_dir.mkdir(parents=True, exist_ok=True)
+        data_path = weapons_dir / f"{weapon_data['name'].lower().replace(' ', '_')}.json"
+        script_path = scripts_dir / f"{weapon_data['name'].replace(' ', '')}.cs"
         
-        with open(scripts_dir / f"{weapon_data['name'].replace(' ', '')}.cs", 'w') as f:
-            f.write(weapon_script)
+        # Save weapon data and Unity weapon script
+        await asyncio.gather(
+            self.writer.write_json(data_path, weapon_data),
+            self.writer.write_text(script_path, weapon_script)
+        )
         
+        self.build_cache.store(cache_key, [data_path, script_path])
         self.assets_created += 1
     
-    async def _generate_gear_item(self, gear_data: Dict):
-        """Generate individual gear item"""
-        # Generate Unity script for gear
-        gear_script = self._generate_gear_script(gear_data)
-        
-        # Save gear data
-        gear_dir = Path("output/game_assets/gear")
-        gear_dir.mkdir(parents=True, exist_ok=True)
+    async def _generate_gear_batch(self, gear_items: List[Dict]):
+        """Generate a batch of gear items, rendering the uncached ones in one call"""
+        keys = [self.build_cache.key(self, 'gear', gear_data) for gear_data in gear_items]
+        cached = await self.build_cache.lookup_many('asset_generator.generate_gear', keys)
+        pending = [
+            (gear_data, cache_key) for gear_data, cache_key, hit in zip(gear_items, keys, cached) if not hit
+        ]
         
-        with open(gear_dir / f"{gear_data['name'].lower().replace(' ', '_')}.json", 'w') as f:
-            json.dump(gear_data, f, indent=2)
+        # Generate Unity scripts for the gear
+        scripts = await self.renderer.render_many(render_gear_scripts, [gear for gear, _ in pending])
         
-        # Save Unity gear script
+        await asyncio.gather(*(
+            self._generate_gear_item(gear_data, cache_key, gear_script)
+            for (gear_data, cache_key), gear_script in zip(pending, scripts)
+        ))
+    
+    @traced()
+    async def _generate_gear_item(self, gear_data: Dict, cache_key: str, gear_script: str):
+        """Generate individual gear item"""
+        gear_dir = Path("output/game_assets/gear")
         scripts_dir = Path("output/unity_scripts/gear")
-        scripts_dir.mkdir(parents=True, exist_ok=True)
+        data_path = gear_dir / f"{gear_data['name'].lower().replace(' ', '_')}.json"
+        script_path = scripts_dir / f"{gear_data['name'].replace(' ', '')}.cs"
         
-        with open(scripts_dir / f"{gear_data['name'].replace(' ', '')}.cs", 'w') as f:
-            f.write(gear_script)
+        # Save gear data and Unity gear script
+        await asyncio.gather(
+            self.writer.write_json(data_path, gear_data),
+            self.writer.write_text(script_path, gear_script)
+        )
         
+        self.build_cache.store(cache_key, [data_path, script_path])
         self.assets_created += 1
     
-    def _generate_weapon_script(self, weapon_data: Dict) -> str:
-        """Generate Unity C# script for weapon"""
-        script = f"""
-using UnityEngine;
-using System.Collections;
-
-public class {weapon_data['name'].replace(' ', '')} : WeaponBase
-{{
-    [Header("{weapon_data['name']} - {weapon_data['type']}")]
-    public float baseDamage = {weapon_data['damage']}f;
-    public float fireRate = {weapon_data['fire_rate']}f;
-    public float accuracy = {weapon_data['accuracy']}f;
-    public float effectiveRange = {weapon_data['range']}f;
-    
-    [Header("Weapon Features")]
-    public string[] specialFeatures = new string[]
-    {{
-        {', '.join(f'"{feature}"' for feature in weapon_data['special_features'])}
-    }};
-    
-    void Start()
-    {{
-        weaponName = "{weapon_data['name']}";
-        weaponType = WeaponType.{weapon_data['type'].replace(' ', '')};
-        InitializeWeapon();
-    }}
-    
-    public override void InitializeWeapon()
-    {{
-        base.InitializeWeapon();
-        
-        // Setup weapon-specific parameters
-        ammoCapacity = 30;
-        reloadTime = 2.5f;
-        
-        Debug.Log($"{weapon_data['name']} initialized and ready for combat");
-    }}
-    
-    public override void FireWeapon()
-    {{
-        if (CanFire())
-        {{
-            base.FireWeapon();
-            
-            // Weapon-specific firing logic
-            ApplyRecoil();
-            PlayFireEffects();
-            
-            Debug.Log("Firing " + weaponName);
-        }}
-    }}
-    
-    public override void Reload()
-    {{
-        base.Reload();
-        Debug.Log("Reloading " + weaponName);
-    }}
-    
-    public void ApplySpecialFeature(string feature)
-    {{
-        switch (feature)
-        {{
-"""
-        
-        # Add special feature logic
-        for feature in weapon_data['special_features']:
-            script += f"""
-            case "{feature}":
-                // Implement {feature} functionality
-                break;
-"""
-        
-        script += """
-        }
-    }
-}
-"""
-        return script
-    
-    def _generate_gear_script(self, gear_data: Dict) -> str:
-        """Generate Unity C# script for gear"""
-        script = f"""
-using UnityEngine;
-using System.Collections;
-
-public class {gear_data['name'].replace(' ', '')} : GearBase
-{{
-    [Header("{gear_data['name']}")]
-    public string gearType = "{gear_data['type']}";
-    
-    {f'public float protection = {gear_data["protection"]}f;' if 'protection' in gear_data else ''}
-    {f'public float mobilityPenalty = {gear_data["mobility_penalty"]}f;' if 'mobility_penalty' in gear_data else ''}
-    {f'public float duration = {gear_data["duration"]}f;' if 'duration' in gear_data else ''}
-    {f'public float cooldown = {gear_data["cooldown"]}f;' if 'cooldown' in gear_data else ''}
-    
-    [Header("Special Features")]
-    public string[] specialFeatures = new string[]
-    {{
-        {', '.join(f'"{feature}"' for feature in gear_data['special_features'])}
-    }};
-    
-    void Start()
-    {{
-        gearName = "{gear_data['name']}";
-        InitializeGear();
-    }}
-    
-    public override void InitializeGear()
-    {{
-        base.InitializeGear();
-        Debug.Log("{gear_data['name']} equipped and ready");
-    }}
-    
-    public override void UseGear()
-    {{
-        base.UseGear();
-        
-        // Gear-specific usage logic
-        Debug.Log("Using " + gearName);
-        
-        {f'StartCoroutine(CooldownRoutine());' if 'cooldown' in gear_data else ''}
-    }}
-    
-    {f'''
-    IEnumerator CooldownRoutine()
-    {{
-        yield return new WaitForSeconds(cooldown);
-        ReadyGear();
-    }}
-    ''' if 'cooldown' in gear_data else ''}
-}}
-"""
-        return script
-    
+    @traced()
     async def _generate_environment_configs(self, environment_assets: Dict):
         """Generate environment asset configurations"""
         env_dir = Path("output/game_assets/environment")
-        env_dir.mkdir(parents=True, exist_ok=True)
+        config_path = env_dir / "environment_assets.json"
+        
+        cache_key = self.build_cache.key(self, 'environment', environment_assets)
+        if await self.build_cache.lookup('asset_generator.generate_environment_assets', cache_key):
+            return
+        
+        await self.writer.write_json(config_path, environment_assets)
         
-        with open(env_dir / "environment_assets.json", 'w') as f:
-            json.dump(environment_assets, f, indent=2)
+        self.build_cache.store(cache_key, [config_path])
     
     async def execute_primary_task(self):
         """Execute primary asset generation task"""
@@ -4,8 +4,17 @@ Character Creator AI Agent - Creates player and AI characters
 
 import asyncio
 import json
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any, Optional
 from dataclasses import dataclass
+from pathlib import Path
+
+from task_graph import task_spec
+from utils.artifact_writer import ArtifactWriter
+from utils.build_cache import BuildCache
+from utils.content_pack import ContentPack
+from utils.render_pool import RenderPool
+from utils.templates import compile_template, csharp_interpolated, csharp_string, csharp_string_list
+from utils.tracing import traced
 
 @dataclass
 class CharacterAttributes:
@@ -25,18 +34,148 @@ class CharacterPersonality:
     aggression: float
     loyalty: float
 
+# Built-in AI squad
+DEFAULT_TEAM_MEMBERS = [
+    {
+        'callsign': 'Viper',
+        'role': 'Demolitions Expert',
+        'specialization': 'demolitions',
+        'attributes': CharacterAttributes(9.0, 6.5, 7.0, 7.5, 10.0, 5.0, 8.5).__dict__,
+        'personality': CharacterPersonality(0.8, 0.7, 0.9, 0.8, 0.9).__dict__,
+        'quotes': ["I make things go boom!", "That's not a problem, it's a target."]
+    },
+    {
+        'callsign': 'Spectre', 
+        'role': 'Sniper Specialist',
+        'specialization': 'sniper',
+        'attributes': CharacterAttributes(7.0, 8.5, 8.0, 10.0, 6.0, 7.0, 7.0).__dict__,
+        'personality': CharacterPersonality(0.4, 0.6, 0.8, 0.3, 0.95).__dict__,
+        'quotes': ["One shot, one kill.", "Patience is a weapon."]
+    },
+    {
+        'callsign': 'Cipher',
+        'role': 'Hacking Specialist', 
+        'specialization': 'hacker',
+        'attributes': CharacterAttributes(5.5, 7.0, 10.0, 6.5, 5.0, 10.0, 7.5).__dict__,
+        'personality': CharacterPersonality(0.6, 0.9, 0.7, 0.4, 0.8).__dict__,
+        'quotes': ["I speak firewall.", "Your security is my playground."]
+    },
+    {
+        'callsign': 'Titan',
+        'role': 'Assault Specialist',
+        'specialization': 'assault', 
+        'attributes': CharacterAttributes(10.0, 7.0, 6.5, 8.0, 7.5, 5.0, 9.0).__dict__,
+        'personality': CharacterPersonality(0.7, 0.5, 0.95, 0.9, 1.0).__dict__,
+        'quotes': ["I'll draw their fire!", "Nothing stops the Titan!"]
+    }
+]
+
+CHARACTER_SCRIPT = compile_template("""
+using UnityEngine;
+using System.Collections;
+
+public class {{class_name}}Character : {{base_class}}
+{
+    [Header("Character Attributes")]
+    public string callsign = "{{callsign}}";
+    public string role = "{{role}}";
+    
+    [Header("Base Stats")]
+    public float strength = {{strength}}f;
+    public float agility = {{agility}}f;
+    public float intelligence = {{intelligence}}f;
+    public float accuracy = {{accuracy}}f;
+    public float demolitionSkill = {{demolition}}f;
+    public float hackingSkill = {{hacking}}f;
+    public float breachSkill = {{breach}}f;
+    
+    [Header("Personality")]
+    public float humorFactor = {{humor_level}}f;
+    public float witFactor = {{wit_level}}f;
+    public float teamwork = {{teamwork}}f;
+    
+    private string[] wittyRemarks = new string[] {
+        {{quote_list}}
+    };
+    
+    void Start()
+    {
+        InitializeCharacter();
+    }
+    
+    public override void InitializeCharacter()
+    {
+        base.InitializeCharacter();
+        Debug.Log($"{{log_callsign}} reporting for duty. Role: {{log_role}}");
+    }
+    
+    public string GetCombatQuote()
+    {
+        if (wittyRemarks.Length > 0 && Random.Range(0f, 1f) < humorFactor)
+        {
+            return wittyRemarks[Random.Range(0, wittyRemarks.Length)];
+        }
+        return "Engaging target!";
+    }
+    
+    public override void UseSpecialAbility()
+    {
+        // Special ability implementation for {{role}}
+        Debug.Log("{{callsign}} using special ability!");
+    }
+}
+""")
+
+def character_script_values(character_data: Dict, is_player: bool) -> Dict:
+    """Template values for a character record"""
+    attributes = character_data['attributes']
+    personality = character_data['personality']
+    callsign = 'Ghost' if is_player else character_data['callsign']
+    return {
+        'class_name': callsign,
+        'callsign': csharp_string(callsign),
+        'log_callsign': csharp_interpolated(callsign),
+        'base_class': 'PlayerCharacter' if is_player else 'AICharacter',
+        'role': csharp_string(character_data['role']),
+        'log_role': csharp_interpolated(character_data['role']),
+        'strength': attributes['strength'],
+        'agility': attributes['agility'],
+        'intelligence': attributes['intelligence'],
+        'accuracy': attributes['accuracy'],
+        'demolition': attributes['demolition'],
+        'hacking': attributes['hacking'],
+        'breach': attributes['breach'],
+        'humor_level': personality['humor_level'],
+        'wit_level': personality['wit_level'],
+        'teamwork': personality['teamwork'],
+        'quote_list': csharp_string_list(character_data.get('quotes', ['Mission accomplished!']))
+    }
+
+def render_character_script(character_data: Dict, is_player: bool) -> str:
+    """Generate Unity C# script for character"""
+    return CHARACTER_SCRIPT.render(character_script_values(character_data, is_player))
+
+def render_character_scripts(characters: List[Dict], is_player: bool = False) -> List[str]:
+    """Generate Unity C# scripts for many characters in one call"""
+    return CHARACTER_SCRIPT.render_many(character_script_values(character, is_player) for character in characters)
+
 class CharacterCreator:
     def __init__(self, config: Dict, logger):
         self.config = config
         self.logger = logger
         self.characters_created = 0
         self.specializations = ['assault', 'sniper', 'demolitions', 'hacker', 'medic']
+        self.build_cache = BuildCache.shared(config)
+        self.writer = ArtifactWriter.shared(config)
+        self.content = ContentPack(config, logger)
+        self.renderer = RenderPool.shared(config)
         
     async def initialize(self):
         """Initialize the character creator"""
         self.logger.info("Character Creator initialized")
         return True
     
+    @task_spec(phase='design', outputs=['character_system'])
     async def design_character_system(self):
         """Design the complete character system"""
         self.logger.info("Designing character system...")
@@ -64,6 +203,7 @@ class CharacterCreator:
             'performance': 0.95
         }
     
+    @task_spec(phase='creation', inputs=['character_system'], outputs=['player_character'])
     async def create_player_character(self):
         """Create the main player character"""
         self.logger.info("Creating player character...")
@@ -91,11 +231,14 @@ class CharacterCreator:
             'backstory': 'Former special forces operator with exceptional leadership skills and tactical brilliance.'
         }
         
-        # Generate Unity C# script for player character
-        unity_script = self._generate_unity_character_script(player_character, is_player=True)
-        await self._save_character_assets(player_character, unity_script, 'player_ghost')
-        
-        self.characters_created += 1
+        cache_key = self.build_cache.key(self, 'player_character', player_character)
+        if not await self.build_cache.lookup('character_creator.create_player_character', cache_key):
+            # Generate Unity C# script for player character
+            unity_script = await self.renderer.render(render_character_script, player_character, True)
+            outputs = await self._save_character_assets(player_character, unity_script, 'player_ghost')
+            self.build_cache.store(cache_key, outputs)
+            
+            self.characters_created += 1
         
         return {
             'agent': 'character_creator',
@@ -105,149 +248,72 @@ class CharacterCreator:
             'performance': 0.98
         }
     
-    async def create_ai_team_members(self):
+    @task_spec(phase='creation', inputs=['character_system'], outputs=['ai_team'])
+    async def create_ai_team_members(self, team_members: Optional[Iterable[Dict]] = None):
         """Create AI team members"""
         self.logger.info("Creating AI team members...")
         
-        team_members = [
-            {
-                'callsign': 'Viper',
-                'role': 'Demolitions Expert',
-                'specialization': 'demolitions',
-                'attributes': CharacterAttributes(9.0, 6.5, 7.0, 7.5, 10.0, 5.0, 8.5).__dict__,
-                'personality': CharacterPersonality(0.8, 0.7, 0.9, 0.8, 0.9).__dict__,
-                'quotes': ["I make things go boom!", "That's not a problem, it's a target."]
-            },
-            {
-                'callsign': 'Spectre', 
-                'role': 'Sniper Specialist',
-                'specialization': 'sniper',
-                'attributes': CharacterAttributes(7.0, 8.5, 8.0, 10.0, 6.0, 7.0, 7.0).__dict__,
-                'personality': CharacterPersonality(0.4, 0.6, 0.8, 0.3, 0.95).__dict__,
-                'quotes': ["One shot, one kill.", "Patience is a weapon."]
-            },
-            {
-                'callsign': 'Cipher',
-                'role': 'Hacking Specialist', 
-                'specialization': 'hacker',
-                'attributes': CharacterAttributes(5.5, 7.0, 10.0, 6.5, 5.0, 10.0, 7.5).__dict__,
-                'personality': CharacterPersonality(0.6, 0.9, 0.7, 0.4, 0.8).__dict__,
-                'quotes': ["I speak firewall.", "Your security is my playground."]
-            },
-            {
-                'callsign': 'Titan',
-                'role': 'Assault Specialist',
-                'specialization': 'assault', 
-                'attributes': CharacterAttributes(10.0, 7.0, 6.5, 8.0, 7.5, 5.0, 9.0).__dict__,
-                'personality': CharacterPersonality(0.7, 0.5, 0.95, 0.9, 1.0).__dict__,
-                'quotes': ["I'll draw their fire!", "Nothing stops the Titan!"]
-            }
-        ]
-        
-        creation_tasks = []
-        for member in team_members:
-            creation_tasks.append(self._create_ai_team_member(member))
+        team_members = self.content.records('characters', DEFAULT_TEAM_MEMBERS) if team_members is None else team_members
         
-        results = await asyncio.gather(*creation_tasks)
+        created = await self.content.run_batched(team_members, self._create_ai_team_batch)
         
         return {
             'agent': 'character_creator',
             'task': 'create_ai_team_members', 
             'result': 'success',
-            'team_members_created': len(team_members),
+            'team_members_created': created,
             'performance': 0.92
         }
     
-    async def _create_ai_team_member(self, member_data: Dict):
-        """Create individual AI team member"""
-        unity_script = self._generate_unity_character_script(member_data, is_player=False)
-        await self._save_character_assets(member_data, unity_script, f"ai_{member_data['callsign'].lower()}")
-        self.characters_created += 1
-    
-    def _generate_unity_character_script(self, character_data: Dict, is_player: bool) -> str:
-        """Generate Unity C# script for character"""
-        character_class = "PlayerCharacter" if is_player else "AICharacter"
+    async def _create_ai_team_batch(self, team_members: List[Dict]):
+        """Create a batch of AI team members, rendering the uncached ones in one call"""
+        keys = [self.build_cache.key(self, 'ai_team_member', member_data) for member_data in team_members]
+        cached = await self.build_cache.lookup_many('character_creator.create_ai_team_members', keys)
+        pending = [
+            (member_data, cache_key) for member_data, cache_key, hit in zip(team_members, keys, cached) if not hit
+        ]
         
-        script = f"""
-using UnityEngine;
-using System.Collections;
-
-public class {character_data['callsign'] if not is_player else 'Ghost'}Character : {character_class}
-{{
-    [Header("Character Attributes")]
-    public string callsign = "{character_data['callsign'] if not is_player else 'Ghost'}";
-    public string role = "{character_data['role']}";
-    
-    [Header("Base Stats")]
-    public float strength = {character_data['attributes']['strength']}f;
-    public float agility = {character_data['attributes']['agility']}f;
-    public float intelligence = {character_data['attributes']['intelligence']}f;
-    public float accuracy = {character_data['attributes']['accuracy']}f;
-    public float demolitionSkill = {character_data['attributes']['demolition']}f;
-    public float hackingSkill = {character_data['attributes']['hacking']}f;
-    public float breachSkill = {character_data['attributes']['breach']}f;
-    
-    [Header("Personality")]
-    public float humorFactor = {character_data['personality']['humor_level']}f;
-    public float witFactor = {character_data['personality']['wit_level']}f;
-    public float teamwork = {character_data['personality']['teamwork']}f;
-    
-    private string[] wittyRemarks = new string[] {{
-        {', '.join(f'"{quote}"' for quote in character_data.get('quotes', ['Mission accomplished!']))}
-    }};
-    
-    void Start()
-    {{
-        InitializeCharacter();
-    }}
-    
-    public override void InitializeCharacter()
-    {{
-        base.InitializeCharacter();
-        Debug.Log($"{character_data['callsign']} reporting for duty. Role: {character_data['role']}");
-    }}
-    
-    public string GetCombatQuote()
-    {{
-        if (wittyRemarks.Length > 0 && Random.Range(0f, 1f) < humorFactor)
-        {{
-            return wittyRemarks[Random.Range(0, wittyRemarks.Length)];
-        }}
-        return "Engaging target!";
-    }}
+        scripts = await self.renderer.render_many(render_character_scripts, [member for member, _ in pending])
+        
+        await asyncio.gather(*(
+            self._create_ai_team_member(member_data, cache_key, unity_script)
+            for (member_data, cache_key), unity_script in zip(pending, scripts)
+        ))
     
-    public override void UseSpecialAbility()
-    {{
-        // Special ability implementation for {character_data['role']}
-        Debug.Log("{character_data['callsign']} using special ability!");
-    }}
-}}
-"""
-        return script
+    @traced()
+    async def _create_ai_team_member(self, member_data: Dict, cache_key: str, unity_script: str):
+        """Create individual AI team member"""
+        outputs = await self._save_character_assets(member_data, unity_script, f"ai_{member_data['callsign'].lower()}")
+        self.build_cache.store(cache_key, outputs)
+        self.characters_created += 1
     
+    @traced()
     async def _save_character_system(self, system_design: Dict):
         """Save character system design"""
         output_dir = Path("output/game_design")
-        output_dir.mkdir(parents=True, exist_ok=True)
+        design_path = output_dir / "character_system.json"
+        
+        cache_key = self.build_cache.key(self, 'character_system', system_design)
+        if await self.build_cache.lookup('character_creator.design_character_system', cache_key):
+            return
         
-        with open(output_dir / "character_system.json", 'w') as f:
-            json.dump(system_design, f, indent=2)
+        await self.writer.write_json(design_path, system_design)
+        
+        self.build_cache.store(cache_key, [design_path])
     
-    async def _save_character_assets(self, character_data: Dict, unity_script: str, filename: str):
+    @traced()
+    async def _save_character_assets(self, character_data: Dict, unity_script: str, filename: str) -> List[Path]:
         """Save character assets"""
-        # Save character data
-        chars_dir = Path("output/game_assets/characters")
-        chars_dir.mkdir(parents=True, exist_ok=True)
-        
-        with open(chars_dir / f"{filename}.json", 'w') as f:
-            json.dump(character_data, f, indent=2)
+        data_path = Path("output/game_assets/characters") / f"{filename}.json"
+        script_path = Path("output/unity_scripts/characters") / f"{filename}.cs"
         
-        # Save Unity script
-        scripts_dir = Path("output/unity_scripts/characters")
-        scripts_dir.mkdir(parents=True, exist_ok=True)
+        # Save character data and Unity script
+        await asyncio.gather(
+            self.writer.write_json(data_path, character_data),
+            self.writer.write_text(script_path, unity_script)
+        )
         
-        with open(scripts_dir / f"{filename}.cs", 'w') as f:
-            f.write(unity_script)
+        return [data_path, script_path]
     
     async def execute_primary_task(self):
         """Execute primary character creation task"""
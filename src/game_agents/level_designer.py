@@ -4,20 +4,61 @@ Level Designer AI Agent - Creates game levels and environments
 
 import asyncio
 import json
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any, Optional
 from pathlib import Path
 
+from task_graph import task_spec
+from utils.artifact_writer import ArtifactWriter
+from utils.build_cache import BuildCache
+from utils.content_pack import ContentPack
+from utils.tracing import traced
+
+# Built-in scene catalog
+DEFAULT_SCENES = [
+    {
+        'name': 'Operation Black Dawn',
+        'type': 'stealth_infiltration',
+        'environment': 'Urban',
+        'difficulty': 'Medium',
+        'objectives': 4,
+        'enemy_count': 25,
+        'special_features': ['Hacking Points', 'Alternative Routes', 'Stealth Options']
+    },
+    {
+        'name': 'Jungle Strike',
+        'type': 'direct_assault', 
+        'environment': 'Jungle',
+        'difficulty': 'Hard',
+        'objectives': 3,
+        'enemy_count': 40,
+        'special_features': ['Ambush Points', 'Vertical Combat', 'Environmental Hazards']
+    },
+    {
+        'name': 'Arctic Extraction',
+        'type': 'extraction_mission',
+        'environment': 'Arctic', 
+        'difficulty': 'Expert',
+        'objectives': 2,
+        'enemy_count': 35,
+        'special_features': ['Blizzard Conditions', 'Limited Visibility', 'Thermal Imaging']
+    }
+]
+
 class LevelDesigner:
     def __init__(self, config: Dict, logger):
         self.config = config
         self.logger = logger
         self.levels_created = 0
+        self.build_cache = BuildCache.shared(config)
+        self.writer = ArtifactWriter.shared(config)
+        self.content = ContentPack(config, logger)
         
     async def initialize(self):
         """Initialize the level designer"""
         self.logger.info("Level Designer initialized")
         return True
     
+    @task_spec(phase='design', outputs=['world_design'])
     async def design_world_structure(self):
         """Design the game world structure"""
         self.logger.info("Designing world structure...")
@@ -53,54 +94,24 @@ class LevelDesigner:
             'performance': 0.88
         }
     
-    async def create_main_scenes(self):
+    @task_spec(phase='level_design', inputs=['world_design', 'environment_assets'], outputs=['scenes'])
+    async def create_main_scenes(self, main_scenes: Optional[Iterable[Dict]] = None):
         """Create main game scenes"""
         self.logger.info("Creating main game scenes...")
         
-        main_scenes = [
-            {
-                'name': 'Operation Black Dawn',
-                'type': 'stealth_infiltration',
-                'environment': 'Urban',
-                'difficulty': 'Medium',
-                'objectives': 4,
-                'enemy_count': 25,
-                'special_features': ['Hacking Points', 'Alternative Routes', 'Stealth Options']
-            },
-            {
-                'name': 'Jungle Strike',
-                'type': 'direct_assault', 
-                'environment': 'Jungle',
-                'difficulty': 'Hard',
-                'objectives': 3,
-                'enemy_count': 40,
-                'special_features': ['Ambush Points', 'Vertical Combat', 'Environmental Hazards']
-            },
-            {
-                'name': 'Arctic Extraction',
-                'type': 'extraction_mission',
-                'environment': 'Arctic', 
-                'difficulty': 'Expert',
-                'objectives': 2,
-                'enemy_count': 35,
-                'special_features': ['Blizzard Conditions', 'Limited Visibility', 'Thermal Imaging']
-            }
-        ]
-        
-        creation_tasks = []
-        for scene in main_scenes:
-            creation_tasks.append(self._create_scene(scene))
+        main_scenes = self.content.records('scenes', DEFAULT_SCENES) if main_scenes is None else main_scenes
         
-        await asyncio.gather(*creation_tasks)
+        created = await self.content.run_batched(main_scenes, self._create_scene_batch)
         
         return {
             'agent': 'level_designer',
             'task': 'create_main_scenes',
             'result': 'success',
-            'scenes_created': len(main_scenes),
+            'scenes_created': created,
             'performance': 0.91
         }
     
+    @task_spec(phase='level_design', inputs=['scenes'], outputs=['level_optimization'])
     async def optimize_level_performance(self):
         """Optimize levels for performance"""
         self.logger.info("Optimizing level performance...")
@@ -134,8 +145,20 @@ class LevelDesigner:
             'performance': 0.85
         }
     
+    async def _create_scene_batch(self, scenes: List[Dict]):
+        """Create a batch of scenes"""
+        await asyncio.gather(*(self._create_scene(scene) for scene in scenes))
+    
+    @traced()
     async def _create_scene(self, scene_data: Dict):
         """Create individual scene"""
+        scenes_dir = Path("output/game_assets/scenes")
+        scene_path = scenes_dir / f"{scene_data['name'].lower().replace(' ', '_')}.json"
+        
+        cache_key = self.build_cache.key(self, 'scene', scene_data)
+        if await self.build_cache.lookup('level_designer.create_main_scenes', cache_key):
+            return
+        
         # Generate scene configuration
         scene_config = {
             'scene_name': scene_data['name'],
@@ -158,26 +181,34 @@ class LevelDesigner:
         }
         
         # Save scene configuration
-        scenes_dir = Path("output/game_assets/scenes")
-        scenes_dir.mkdir(parents=True, exist_ok=True)
-        
-        with open(scenes_dir / f"{scene_data['name'].lower().replace(' ', '_')}.json", 'w') as f:
-            json.dump(scene_config, f, indent=2)
+        await self.writer.write_json(scene_path, scene_config)
         
+        self.build_cache.store(cache_key, [scene_path])
         self.levels_created += 1
     
+    @traced()
     async def _save_world_design(self, world_design: Dict):
         """Save world design document"""
         design_dir = Path("output/game_design")
-        design_dir.mkdir(parents=True, exist_ok=True)
+        design_path = design_dir / "world_design.json"
+        
+        cache_key = self.build_cache.key(self, 'world_design', world_design)
+        if await self.build_cache.lookup('level_designer.design_world_structure', cache_key):
+            return
+        
+        await self.writer.write_json(design_path, world_design)
         
-        with open(design_dir / "world_design.json", 'w') as f:
-            json.dump(world_design, f, indent=2)
+        self.build_cache.store(cache_key, [design_path])
     
+    @traced()
     async def _generate_optimization_scripts(self, optimization_rules: Dict):
         """Generate optimization scripts"""
         scripts_dir = Path("output/unity_scripts/optimization")
-        scripts_dir.mkdir(parents=True, exist_ok=True)
+        script_path = scripts_dir / "LevelOptimizer.cs"
+        
+        cache_key = self.build_cache.key(self, 'optimization', optimization_rules)
+        if await self.build_cache.lookup('level_designer.optimize_level_performance', cache_key):
+            return
         
         # Generate performance optimizer script
         optimizer_script = """
@@ -224,8 +255,9 @@ public class LevelOptimizer : MonoBehaviour
 }
 """
         
-        with open(scripts_dir / "LevelOptimizer.cs", 'w') as f:
-            f.write(optimizer_script)
+        await self.writer.write_text(script_path, optimizer_script)
+        
+        self.build_cache.store(cache_key, [script_path])
     
     async def execute_primary_task(self):
         """Execute primary level design task"""
@@ -4,20 +4,188 @@ Mission Planner AI Agent - Creates missions and objectives
 
 import asyncio
 import json
-from typing import Dict, List, Any
+from typing import Dict, Iterable, List, Any, Optional
 from pathlib import Path
 
+from task_graph import task_spec
+from utils.artifact_writer import ArtifactWriter
+from utils.build_cache import BuildCache
+from utils.content_pack import ContentPack
+from utils.render_pool import RenderPool
+from utils.templates import compile_template, csharp_interpolated, csharp_string, csharp_string_list
+from utils.tracing import traced
+
+# Built-in mission catalog
+DEFAULT_MISSIONS = [
+    {
+        'mission_id': 'M01',
+        'name': 'Operation Silent Entry',
+        'type': 'stealth_infiltration',
+        'location': 'Urban Facility',
+        'primary_objectives': [
+            'Infiltrate the compound undetected',
+            'Hack the security system',
+            'Retrieve intelligence data'
+        ],
+        'secondary_objectives': [
+            'Do not trigger alarms',
+            'Collect additional evidence',
+            'Extract without casualties'
+        ],
+        'enemy_types': ['Guards', 'Security Cameras', 'Drones'],
+        'special_conditions': ['Night operation', 'Time limit: 30 minutes']
+    },
+    {
+        'mission_id': 'M02',
+        'name': 'Jungle Ambush',
+        'type': 'direct_assault',
+        'location': 'Jungle Outpost',
+        'primary_objectives': [
+            'Eliminate enemy commander',
+            'Destroy weapon cache',
+            'Secure extraction point'
+        ],
+        'secondary_objectives': [
+            'Rescue hostages',
+            'Destroy communication array',
+            'Collect enemy intel'
+        ],
+        'enemy_types': ['Heavy Soldiers', 'Snipers', 'Technical Vehicles'],
+        'special_conditions': ['Daytime assault', 'Reinforcements possible']
+    }
+]
+
+MISSION_SCRIPT = compile_template("""
+using UnityEngine;
+using System.Collections;
+using System.Collections.Generic;
+
+public class Mission{{class_id}} : MissionBase
+{
+    [Header("Mission: {{name}}")]
+    public string missionType = "{{type}}";
+    public string location = "{{location}}";
+    
+    [Header("Objectives")]
+    public List<string> primaryObjectives = new List<string>()
+    {
+        {{primary_objectives}}
+    };
+    
+    public List<string> secondaryObjectives = new List<string>()
+    {
+        {{secondary_objectives}}
+    };
+    
+    [Header("Enemy Forces")]
+    public List<string> enemyTypes = new List<string>()
+    {
+        {{enemy_types}}
+    };
+    
+    [Header("Special Conditions")]
+    public List<string> specialConditions = new List<string>()
+    {
+        {{special_conditions}}
+    };
+    
+    void Start()
+    {
+        missionName = "{{name}}";
+        missionID = "{{mission_id}}";
+        InitializeMission();
+    }
+    
+    public override void InitializeMission()
+    {
+        base.InitializeMission();
+        
+        // Setup mission-specific parameters
+        SetTimeLimit(1800); // 30 minutes in seconds
+        SetExtractionPoints(3);
+        
+        Debug.Log($"Mission {{log_mission_id}} initialized: {{log_name}}");
+    }
+    
+    public override void CompletePrimaryObjective(int objectiveIndex)
+    {
+        base.CompletePrimaryObjective(objectiveIndex);
+        
+        // Mission-specific completion logic
+        switch (objectiveIndex)
+        {
+{{objective_cases}}
+        }
+    }
+    
+    public override void MissionSuccess()
+    {
+        base.MissionSuccess();
+        
+        // Mission success rewards
+        GrantTokens(100);
+        UnlockNextMission();
+        
+        Debug.Log("Mission accomplished! Excellent work, Ghost team.");
+    }
+    
+    public override void MissionFailure()
+    {
+        base.MissionFailure();
+        
+        Debug.Log("Mission failed. Regroup and try again.");
+    }
+}
+""")
+
+MISSION_OBJECTIVE_CASE = compile_template("""
+            case {{index}}:
+                // {{objective}}
+                GrantTeamExperience(500);
+                break;
+""")
+
+def mission_script_values(mission_data: Dict) -> Dict:
+    """Template values for a mission record"""
+    return {
+        'class_id': mission_data['mission_id'],
+        'mission_id': csharp_string(mission_data['mission_id']),
+        'log_mission_id': csharp_interpolated(mission_data['mission_id']),
+        'name': csharp_string(mission_data['name']),
+        'log_name': csharp_interpolated(mission_data['name']),
+        'type': csharp_string(mission_data['type']),
+        'location': csharp_string(mission_data['location']),
+        'primary_objectives': csharp_string_list(mission_data['primary_objectives']),
+        'secondary_objectives': csharp_string_list(mission_data['secondary_objectives']),
+        'enemy_types': csharp_string_list(mission_data['enemy_types']),
+        'special_conditions': csharp_string_list(mission_data['special_conditions']),
+        'objective_cases': MISSION_OBJECTIVE_CASE.join_rows(enumerate(map(csharp_string, mission_data['primary_objectives'])))
+    }
+
+def render_mission_script(mission_data: Dict) -> str:
+    """Generate Unity C# script for mission"""
+    return MISSION_SCRIPT.render(mission_script_values(mission_data))
+
+def render_mission_scripts(missions: List[Dict]) -> List[str]:
+    """Generate Unity C# scripts for many missions in one call"""
+    return MISSION_SCRIPT.render_many(mission_script_values(mission) for mission in missions)
+
 class MissionPlanner:
     def __init__(self, config: Dict, logger):
         self.config = config
         self.logger = logger
         self.missions_created = 0
+        self.build_cache = BuildCache.shared(config)
+        self.writer = ArtifactWriter.shared(config)
+        self.content = ContentPack(config, logger)
+        self.renderer = RenderPool.shared(config)
         
     async def initialize(self):
         """Initialize the mission planner"""
         self.logger.info("Mission Planner initialized")
         return True
     
+    @task_spec(phase='design', outputs=['narrative_design'])
     async def design_game_narrative(self):
         """Design the game narrative and story"""
         self.logger.info("Designing game narrative...")
@@ -62,188 +230,69 @@ class MissionPlanner:
             'performance': 0.89
         }
     
-    async def create_mission_structure(self):
+    @task_spec(phase='level_design', inputs=['narrative_design'], outputs=['missions'])
+    async def create_mission_structure(self, missions: Optional[Iterable[Dict]] = None):
         """Create mission structure and objectives"""
         self.logger.info("Creating mission structure...")
         
-        missions = [
-            {
-                'mission_id': 'M01',
-                'name': 'Operation Silent Entry',
-                'type': 'stealth_infiltration',
-                'location': 'Urban Facility',
-                'primary_objectives': [
-                    'Infiltrate the compound undetected',
-                    'Hack the security system',
-                    'Retrieve intelligence data'
-                ],
-                'secondary_objectives': [
-                    'Do not trigger alarms',
-                    'Collect additional evidence',
-                    'Extract without casualties'
-                ],
-                'enemy_types': ['Guards', 'Security Cameras', 'Drones'],
-                'special_conditions': ['Night operation', 'Time limit: 30 minutes']
-            },
-            {
-                'mission_id': 'M02',
-                'name': 'Jungle Ambush',
-                'type': 'direct_assault',
-                'location': 'Jungle Outpost',
-                'primary_objectives': [
-                    'Eliminate enemy commander',
-                    'Destroy weapon cache',
-                    'Secure extraction point'
-                ],
-                'secondary_objectives': [
-                    'Rescue hostages',
-                    'Destroy communication array',
-                    'Collect enemy intel'
-                ],
-                'enemy_types': ['Heavy Soldiers', 'Snipers', 'Technical Vehicles'],
-                'special_conditions': ['Daytime assault', 'Reinforcements possible']
-            }
-        ]
+        missions = self.content.records('missions', DEFAULT_MISSIONS) if missions is None else missions
         
-        creation_tasks = []
-        for mission in missions:
-            creation_tasks.append(self._create_mission(mission))
-        
-        await asyncio.gather(*creation_tasks)
+        created = await self.content.run_batched(missions, self._create_mission_batch)
         
         return {
             'agent': 'mission_planner',
             'task': 'create_mission_structure', 
             'result': 'success',
-            'missions_created': len(missions),
+            'missions_created': created,
             'performance': 0.93
         }
     
-    async def _create_mission(self, mission_data: Dict):
-        """Create individual mission"""
-        # Generate mission script
-        mission_script = self._generate_mission_script(mission_data)
-        
-        # Save mission data
-        missions_dir = Path("output/game_assets/missions")
-        missions_dir.mkdir(parents=True, exist_ok=True)
+    async def _create_mission_batch(self, missions: List[Dict]):
+        """Create a batch of missions, rendering the uncached ones in one call"""
+        keys = [self.build_cache.key(self, 'mission', mission_data) for mission_data in missions]
+        cached = await self.build_cache.lookup_many('mission_planner.create_mission_structure', keys)
+        pending = [
+            (mission_data, cache_key) for mission_data, cache_key, hit in zip(missions, keys, cached) if not hit
+        ]
         
-        with open(missions_dir / f"{mission_data['mission_id']}.json", 'w') as f:
-            json.dump(mission_data, f, indent=2)
+        # Generate mission scripts
+        scripts = await self.renderer.render_many(render_mission_scripts, [mission for mission, _ in pending])
         
-        # Save Unity mission script
+        await asyncio.gather(*(
+            self._create_mission(mission_data, cache_key, mission_script)
+            for (mission_data, cache_key), mission_script in zip(pending, scripts)
+        ))
+    
+    @traced()
+    async def _create_mission(self, mission_data: Dict, cache_key: str, mission_script: str):
+        """Create individual mission"""
+        missions_dir = Path("output/game_assets/missions")
         scripts_dir = Path("output/unity_scripts/missions")
-        scripts_dir.mkdir(parents=True, exist_ok=True)
+        data_path = missions_dir / f"{mission_data['mission_id']}.json"
+        script_path = scripts_dir / f"Mission_{mission_data['mission_id']}.cs"
         
-        with open(scripts_dir / f"Mission_{mission_data['mission_id']}.cs", 'w') as f:
-            f.write(mission_script)
+        # Save mission data and Unity mission script
+        await asyncio.gather(
+            self.writer.write_json(data_path, mission_data),
+            self.writer.write_text(script_path, mission_script)
+        )
         
+        self.build_cache.store(cache_key, [data_path, script_path])
         self.missions_created += 1
     
-    def _generate_mission_script(self, mission_data: Dict) -> str:
-        """Generate Unity C# script for mission"""
-        script = f"""
-using UnityEngine;
-using System.Collections;
-using System.Collections.Generic;
-
-public class Mission{mission_data['mission_id']} : MissionBase
-{{
-    [Header("Mission: {mission_data['name']}")]
-    public string missionType = "{mission_data['type']}";
-    public string location = "{mission_data['location']}";
-    
-    [Header("Objectives")]
-    public List<string> primaryObjectives = new List<string>()
-    {{
-        {', '.join(f'"{obj}"' for obj in mission_data['primary_objectives'])}
-    }};
-    
-    public List<string> secondaryObjectives = new List<string>()
-    {{
-        {', '.join(f'"{obj}"' for obj in mission_data['secondary_objectives'])}
-    }};
-    
-    [Header("Enemy Forces")]
-    public List<string> enemyTypes = new List<string>()
-    {{
-        {', '.join(f'"{enemy}"' for enemy in mission_data['enemy_types'])}
-    }};
-    
-    [Header("Special Conditions")]
-    public List<string> specialConditions = new List<string>()
-    {{
-        {', '.join(f'"{cond}"' for cond in mission_data['special_conditions'])}
-    }};
-    
-    void Start()
-    {{
-        missionName = "{mission_data['name']}";
-        missionID = "{mission_data['mission_id']}";
-        InitializeMission();
-    }}
-    
-    public override void InitializeMission()
-    {{
-        base.InitializeMission();
-        
-        // Setup mission-specific parameters
-        SetTimeLimit(1800); // 30 minutes in seconds
-        SetExtractionPoints(3);
-        
-        Debug.Log($"Mission {mission_data['mission_id']} initialized: {mission_data['name']}");
-    }}
-    
-    public override void CompletePrimaryObjective(int objectiveIndex)
-    {{
-        base.CompletePrimaryObjective(objectiveIndex);
-        
-        // Mission-specific completion logic
-        switch (objectiveIndex)
-        {{
-"""
-        
-        # Add objective-specific logic
-        for i, objective in enumerate(mission_data['primary_objectives']):
-            script += f"""
-            case {i}:
-                // {objective}
-                GrantTeamExperience(500);
-                break;
-"""
-        
-        script += """
-        }
-    }
-    
-    public override void MissionSuccess()
-    {
-        base.MissionSuccess();
-        
-        // Mission success rewards
-        GrantTokens(100);
-        UnlockNextMission();
-        
-        Debug.Log("Mission accomplished! Excellent work, Ghost team.");
-    }
-    
-    public override void MissionFailure()
-    {
-        base.MissionFailure();
-        
-        Debug.Log("Mission failed. Regroup and try again.");
-    }
-}
-"""
-        return script
-    
+    @traced()
     async def _save_narrative_design(self, narrative: Dict):
         """Save narrative design document"""
         design_dir = Path("output/game_design")
-        design_dir.mkdir(parents=True, exist_ok=True)
+        design_path = design_dir / "narrative_design.json"
+        
+        cache_key = self.build_cache.key(self, 'narrative', narrative)
+        if await self.build_cache.lookup('mission_planner.design_game_narrative', cache_key):
+            return
+        
+        await self.writer.write_json(design_path, narrative)
         
-        with open(design_dir / "narrative_design.json", 'w') as f:
-            json.dump(narrative, f, indent=2)
+        self.build_cache.store(cache_key, [design_path])
     
     async def execute_primary_task(self):
         """Execute primary mission planning task"""
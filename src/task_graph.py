@@ -0,0 +1,228 @@
+"""
+Task Graph - Dependency-aware scheduling data for AI Director tasks
+"""
+
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+
+@dataclass
+class TaskSpec:
+    """Declared shape of a single agent/helper task"""
+    name: str
+    owner: str
+    method: str
+    phase: str
+    inputs: Tuple[str, ...] = ()
+    outputs: Tuple[str, ...] = ()
+
+
+@dataclass
+class TaskRecord:
+    """Timing and outcome of a scheduled task.
+
+    submitted is when the task was handed to the TaskManager; started is
+    when its coroutine first began running, after queueing, the per-agent
+    limit and memory admission.
+    """
+    spec: TaskSpec
+    submitted: Optional[float] = None
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    result: Any = None
+    error: Optional[BaseException] = None
+    skipped: bool = False
+
+    @property
+    def duration(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+    @property
+    def queued(self) -> float:
+        if self.submitted is None or self.started is None:
+            return 0.0
+        return self.started - self.submitted
+
+    @property
+    def succeeded(self) -> bool:
+        return self.finished is not None and self.error is None and not self.skipped
+
+
+def task_spec(phase: str, inputs: Iterable[str] = (), outputs: Iterable[str] = ()):
+    """Declare the phase, inputs and outputs of an agent/helper task method"""
+    def decorator(func: Callable) -> Callable:
+        func._task_spec = {
+            'phase': phase,
+            'inputs': tuple(inputs),
+            'outputs': tuple(outputs)
+        }
+        return func
+    return decorator
+
+
+def collect_task_specs(owner_name: str, component: Any) -> List[TaskSpec]:
+    """Collect declared task specs from a component, in definition order"""
+    specs = []
+    seen = set()
+    for cls in type(component).__mro__:
+        for attr_name, attr in vars(cls).items():
+            declared = getattr(attr, '_task_spec', None)
+            if declared is None or attr_name in seen:
+                continue
+            seen.add(attr_name)
+            specs.append(TaskSpec(
+                name=f"{owner_name}.{attr_name}",
+                owner=owner_name,
+                method=attr_name,
+                phase=declared['phase'],
+                inputs=declared['inputs'],
+                outputs=declared['outputs']
+            ))
+    return specs
+
+
+class TaskGraph:
+    def __init__(self, specs: List[TaskSpec]):
+        self.specs = {spec.name: spec for spec in specs}
+        self.producers = {}
+        for spec in specs:
+            for output in spec.outputs:
+                if output in self.producers:
+                    raise ValueError(
+                        f"Output '{output}' declared by both {self.producers[output]} and {spec.name}"
+                    )
+                self.producers[output] = spec.name
+
+        self.dependencies = {}
+        for spec in specs:
+            deps = []
+            for item in spec.inputs:
+                if item not in self.producers:
+                    raise ValueError(f"Task {spec.name} requires '{item}' but no task produces it")
+                producer = self.producers[item]
+                if producer not in deps:
+                    deps.append(producer)
+            self.dependencies[spec.name] = deps
+
+        self.order = self._topological_order()
+
+    def _topological_order(self) -> List[str]:
+        """Return task names in dependency order (Kahn's algorithm)"""
+        remaining = {name: len(deps) for name, deps in self.dependencies.items()}
+        dependents = self.dependents()
+        ready = [name for name in self.specs if remaining[name] == 0]
+        order = []
+
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for dependent in dependents[name]:
+                remaining[dependent] -= 1
+                if remaining[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(self.specs):
+            cyclic = sorted(name for name, count in remaining.items() if count > 0)
+            raise ValueError(f"Task graph contains a cycle: {', '.join(cyclic)}")
+        return order
+
+    def dependents(self) -> Dict[str, List[str]]:
+        """Map each task to the tasks that consume its outputs"""
+        dependents = {name: [] for name in self.specs}
+        for name, deps in self.dependencies.items():
+            for dep in deps:
+                dependents[dep].append(name)
+        return dependents
+
+    def downstream_counts(self) -> Dict[str, int]:
+        """Count the tasks that transitively depend on each task"""
+        dependents = self.dependents()
+        reachable = {}
+        for name in reversed(self.order):
+            below = set()
+            for dependent in dependents[name]:
+                below.add(dependent)
+                below |= reachable[dependent]
+            reachable[name] = below
+        return {name: len(below) for name, below in reachable.items()}
+
+    def restrict(self, phases: Optional[Iterable[str]] = None) -> 'TaskGraph':
+        """Return the subgraph for the given phases.
+
+        Inputs produced outside the selected phases are treated as already
+        available, which is how single-phase reruns reuse earlier output.
+        """
+        if phases is None:
+            return self
+        phases = set(phases)
+        kept = [spec for name, spec in self.specs.items() if spec.phase in phases]
+        kept_outputs = {output for spec in kept for output in spec.outputs}
+        return TaskGraph([
+            TaskSpec(
+                name=spec.name,
+                owner=spec.owner,
+                method=spec.method,
+                phase=spec.phase,
+                inputs=tuple(item for item in spec.inputs if item in kept_outputs),
+                outputs=spec.outputs
+            )
+            for spec in kept
+        ])
+
+    def phase_tasks(self) -> Dict[str, List[str]]:
+        """Group task names by phase, preserving declaration order"""
+        phases = {}
+        for name, spec in self.specs.items():
+            phases.setdefault(spec.phase, []).append(name)
+        return phases
+
+    def critical_path(self, records: Dict[str, TaskRecord]) -> List[str]:
+        """Return the chain of tasks whose summed durations bound the cycle time"""
+        longest = {}
+        previous = {}
+        for name in self.order:
+            best_dep = None
+            best_length = 0.0
+            for dep in self.dependencies[name]:
+                if longest[dep] > best_length or best_dep is None:
+                    best_dep, best_length = dep, longest[dep]
+            record = records.get(name)
+            longest[name] = best_length + (record.duration if record else 0.0)
+            previous[name] = best_dep
+
+        if not longest:
+            return []
+
+        tail = max(self.order, key=lambda name: longest[name])
+        path = []
+        while tail is not None:
+            path.append(tail)
+            tail = previous[tail]
+        return list(reversed(path))
+
+
+def format_critical_path(graph: TaskGraph, records: Dict[str, TaskRecord],
+                         cycle_start: float, cycle_end: float) -> List[str]:
+    """Format a human readable critical-path report"""
+    path = graph.critical_path(records)
+    path_time = sum(records[name].duration for name in path if name in records)
+    busy_time = sum(record.duration for record in records.values())
+    wall_time = cycle_end - cycle_start
+
+    lines = [
+        f"=== Critical Path: {path_time:.3f}s of {wall_time:.3f}s cycle "
+        f"({busy_time:.3f}s total task time) ==="
+    ]
+    for name in path:
+        record = records.get(name)
+        if record is None or record.started is None:
+            lines.append(f"  {name:<55} skipped")
+            continue
+        status = "ok" if record.succeeded else "failed"
+        lines.append(
+            f"  {name:<55} {record.duration:8.3f}s  "
+            f"start +{record.started - cycle_start:.3f}s  queued {record.queued:.3f}s  [{status}]"
+        )
+    return lines
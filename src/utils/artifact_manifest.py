@@ -0,0 +1,80 @@
+"""
+Generated artifact manifest (path, size, hash)
+"""
+
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+MANIFEST_FORMAT_VERSION = 1
+
+
+def manifest_key(path) -> str:
+    """Normalise a path into a manifest key"""
+    return Path(path).as_posix()
+
+
+class ArtifactManifest:
+    def __init__(self, manifest_path: str):
+        self.manifest_path = Path(manifest_path)
+        self.entries = {}
+        self.loaded = False
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        """Load the manifest written by a previous run"""
+        try:
+            with open(self.manifest_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('format') == MANIFEST_FORMAT_VERSION:
+            self.entries = data.get('entries', {})
+            self.loaded = True
+
+    def record(self, path, size: int, digest: str):
+        """Record an artifact's current size and SHA-256"""
+        key = manifest_key(path)
+        entry = {'size': size, 'sha256': digest}
+        with self._lock:
+            if self.entries.get(key) != entry:
+                self.entries[key] = entry
+                self._dirty = True
+
+    def record_file(self, path):
+        """Hash a file on disk and record it"""
+        with open(path, 'rb') as f:
+            data = f.read()
+        self.record(path, len(data), hashlib.sha256(data).hexdigest())
+
+    def scan(self, directories: Iterable[Path], pattern: str = "*"):
+        """Record files on disk that the manifest does not know about yet"""
+        for directory in directories:
+            if not directory.exists():
+                continue
+            for path in directory.glob(pattern):
+                if path.is_file() and manifest_key(path) not in self.entries:
+                    self.record_file(path)
+
+    def items(self) -> List[Tuple[str, Dict]]:
+        """Return a snapshot of every entry"""
+        with self._lock:
+            return list(self.entries.items())
+
+    def save(self):
+        """Persist the manifest if it changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = dict(self.entries)
+            self._dirty = False
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.manifest_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump({'format': MANIFEST_FORMAT_VERSION, 'entries': snapshot}, f)
+        os.replace(temp_path, self.manifest_path)
@@ -0,0 +1,292 @@
+"""
+Non-blocking artifact writer shared by all agents and helpers
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from utils.artifact_manifest import ArtifactManifest, manifest_key
+
+
+@dataclass
+class WriteTally:
+    """Files and bytes written to disk on behalf of one task"""
+    files: int = 0
+    bytes: int = 0
+
+
+# Tally of the task currently running; tasks it starts inherit it
+_current_tally: ContextVar[Optional[WriteTally]] = ContextVar('artifact_write_tally', default=None)
+
+
+@contextmanager
+def track_writes() -> Iterator[WriteTally]:
+    """Count what the writer writes for the current task and the tasks it starts.
+
+    Writes are attributed when they are requested, so concurrent tasks
+    sharing the writer's batches and threads each see only their own files.
+    Unchanged files are not counted.
+    """
+    tally = WriteTally()
+    token = _current_tally.set(tally)
+    try:
+        yield tally
+    finally:
+        _current_tally.reset(token)
+
+
+DIGEST_BLOCK = 1024 * 1024
+
+
+def file_digest(path: Path) -> str:
+    """Return the SHA-256 of a file's bytes"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        # A read allocates its full size up front, so small files are read at their own size
+        block_size = min(DIGEST_BLOCK, os.fstat(f.fileno()).st_size + 1)
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def files_identical(source: Path, target: Path) -> bool:
+    """Return True when target exists with exactly the bytes of source"""
+    try:
+        if os.path.getsize(source) != os.path.getsize(target):
+            return False
+    except OSError:
+        return False
+    return file_digest(source) == file_digest(target)
+
+
+class ArtifactWriter:
+    _instance = None
+
+    def __init__(self, max_workers: int = 4, batch_size: int = 32,
+                 batch_bytes: int = 256 * 1024, small_write_bytes: int = 16 * 1024,
+                 batch_delay: float = 0.002, write_if_changed: bool = True,
+                 manifest_path: str = 'output/.artifact_manifest.json'):
+        self.write_if_changed = write_if_changed
+        self.manifest = ArtifactManifest(manifest_path)
+        # (size, sha256) of every file written or confirmed unchanged, recorded or not
+        self.digests: Dict[str, Tuple[int, str]] = {}
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.batch_bytes = batch_bytes
+        self.small_write_bytes = small_write_bytes
+        self.batch_delay = batch_delay
+
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="artifact-writer")
+        self._known_dirs = set()
+        self._pending = []
+        self._pending_bytes = 0
+        self._flush_handle = None
+        self._stats_lock = threading.Lock()
+
+        self.stats = {
+            'files': 0,
+            'unchanged': 0,
+            'bytes': 0,
+            'batches': 0,
+            'io_time': 0.0
+        }
+
+    @classmethod
+    def shared(cls, config: Dict) -> 'ArtifactWriter':
+        """Return the process-wide writer configured from the io section"""
+        if cls._instance is None:
+            io_config = config.get('io', {})
+            cls._instance = cls(
+                max_workers=io_config.get('max_workers', 4),
+                batch_size=io_config.get('batch_size', 32),
+                batch_bytes=io_config.get('batch_bytes', 256 * 1024),
+                small_write_bytes=io_config.get('small_write_bytes', 16 * 1024),
+                batch_delay=io_config.get('batch_delay', 0.002),
+                write_if_changed=io_config.get('write_if_changed', True),
+                manifest_path=io_config.get('manifest_path', 'output/.artifact_manifest.json')
+            )
+        return cls._instance
+
+    async def write_json(self, path: Path, data: Any):
+        """Write data as indented JSON"""
+        await self.write_text(path, json.dumps(data, indent=2))
+
+    async def write_text(self, path: Path, content: str, record: bool = True):
+        """Write text to path without blocking the event loop.
+
+        Small writes are collected into batches that a single pool thread
+        writes together; larger writes go straight to the pool. Files
+        written with record=False, such as Unity .meta files, are left out
+        of the artifact manifest.
+        """
+        loop = asyncio.get_running_loop()
+        item = (Path(path), content, record, _current_tally.get())
+        if len(content) >= self.small_write_bytes:
+            await loop.run_in_executor(self._executor, self._write_batch, [item])
+            return
+
+        future = loop.create_future()
+        self._pending.append((*item, future))
+        self._pending_bytes += len(content)
+
+        if len(self._pending) >= self.batch_size or self._pending_bytes >= self.batch_bytes:
+            self._flush_pending()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_delay, self._flush_pending)
+
+        await future
+
+    def write_text_blocking(self, path: Path, content: str, record: bool = True):
+        """Write text from a worker thread with the same semantics as write_text"""
+        error = self._write_batch([(Path(path), content, record, _current_tally.get())])[0]
+        if error is not None:
+            raise error
+
+    def digest(self, path: Path) -> Optional[Tuple[int, str]]:
+        """(size, sha256) of a file this writer wrote, without reading it back"""
+        return self.digests.get(manifest_key(path))
+
+    async def flush(self):
+        """Write out any batched content immediately"""
+        if self._pending:
+            futures = [future for *_, future in self._pending]
+            self._flush_pending()
+            await asyncio.gather(*futures, return_exceptions=True)
+
+    def _flush_pending(self):
+        """Hand the current batch to the thread pool"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, []
+        self._pending_bytes = 0
+        loop = asyncio.get_running_loop()
+        job = loop.run_in_executor(
+            self._executor, self._write_batch, [item[:4] for item in batch]
+        )
+        job.add_done_callback(lambda done: self._resolve_batch(done, batch))
+
+    @staticmethod
+    def _resolve_batch(job: asyncio.Future, batch: List[Tuple[Path, str, bool, Optional[WriteTally], asyncio.Future]]):
+        """Complete the futures of a written batch"""
+        if job.exception() is not None:
+            errors = [job.exception()] * len(batch)
+        else:
+            errors = job.result()
+        for (*_, future), error in zip(batch, errors):
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(error)
+
+    def _write_batch(self, items: List[Tuple[Path, str, bool, Optional[WriteTally]]]) -> List[Optional[Exception]]:
+        """Write a batch of (path, content, record, tally) on a pool thread, returning per-file errors"""
+        started = time.perf_counter()
+        errors = []
+        written = 0
+        unchanged = 0
+        for path, content, record, tally in items:
+            try:
+                encoded = self._encode(content)
+                digest = hashlib.sha256(encoded).hexdigest()
+                if self.write_if_changed and self._matches_existing(path, encoded):
+                    unchanged += 1
+                else:
+                    self._replace_file(path, encoded)
+                    written += len(encoded)
+                    if tally is not None:
+                        with self._stats_lock:
+                            tally.files += 1
+                            tally.bytes += len(encoded)
+                if record:
+                    self.manifest.record(path, len(encoded), digest)
+                self.digests[manifest_key(path)] = (len(encoded), digest)
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+
+        with self._stats_lock:
+            self.stats['files'] += sum(1 for error in errors if error is None) - unchanged
+            self.stats['unchanged'] += unchanged
+            self.stats['bytes'] += written
+            self.stats['batches'] += 1
+            self.stats['io_time'] += time.perf_counter() - started
+        return errors
+
+    @staticmethod
+    def _encode(content: str) -> bytes:
+        """Encode text the way a text-mode write on this platform would"""
+        if os.linesep != '\n':
+            content = content.replace('\n', os.linesep)
+        return content.encode('utf-8')
+
+    def _replace_file(self, path: Path, encoded: bytes):
+        """Write via a temporary file and atomically move it into place.
+
+        Replacing rather than truncating gives the path a new inode, so
+        readers never see a partial file and hardlinked copies elsewhere
+        keep their old content until they are relinked.
+        """
+        self._ensure_dir(path.parent)
+        temp_path = path.with_name(f".{path.name}.tmp")
+        try:
+            handle = open(temp_path, 'wb')
+        except FileNotFoundError:
+            # Directory removed since it was first created
+            self._known_dirs.discard(path.parent)
+            self._ensure_dir(path.parent)
+            handle = open(temp_path, 'wb')
+        with handle:
+            handle.write(encoded)
+        os.replace(temp_path, path)
+
+    @staticmethod
+    def _matches_existing(path: Path, encoded: bytes) -> bool:
+        """Check whether path already holds exactly the encoded content"""
+        try:
+            if os.path.getsize(path) != len(encoded):
+                return False
+            with open(path, 'rb') as f:
+                existing = f.read()
+        except OSError:
+            return False
+        return existing == encoded
+
+    def _ensure_dir(self, directory: Path):
+        """Create a directory once per process"""
+        if directory not in self._known_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._known_dirs.add(directory)
+
+    def close(self):
+        """Shut down the writer's thread pool"""
+        self._executor.shutdown(wait=True)
+
+    def throughput(self) -> float:
+        """Return bytes written per second of pool I/O time"""
+        if self.stats['io_time'] == 0:
+            return 0.0
+        return self.stats['bytes'] / self.stats['io_time']
+
+    def summary(self) -> str:
+        """Describe write volume and throughput"""
+        return (
+            f"{self.stats['files']} files ({self.stats['unchanged']} unchanged), "
+            f"{self.stats['bytes'] / 1024:.1f}KB "
+            f"in {self.stats['batches']} batches, {self.throughput() / (1024 * 1024):.1f}MB/s"
+        )
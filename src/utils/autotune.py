@@ -0,0 +1,234 @@
+"""
+Hardware calibration of worker pools and task concurrency, cached per host
+"""
+
+import asyncio
+import copy
+import json
+import logging
+import os
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from utils.artifact_writer import ArtifactWriter
+from utils.measurement import measure, workspace
+from utils.render_pool import RenderPool
+from utils.system_check import host_fingerprint
+
+# Config settings a tuning profile overrides: (section, key, profile field)
+TUNED_SETTINGS = [
+    ('system', 'max_agents', 'max_agents'),
+    ('ai', 'max_concurrent_tasks', 'max_concurrent_tasks'),
+    ('io', 'max_workers', 'io_workers'),
+    ('render', 'process_workers', 'process_workers')
+]
+
+WRITER_SMALL_FILES = 400
+WRITER_LARGE_FILES = 40
+RENDER_ITEMS_PER_CPU = 2000
+
+
+def candidates(limit: int) -> List[int]:
+    """Powers of two up to limit, plus limit itself"""
+    sizes = []
+    size = 1
+    while size < limit:
+        sizes.append(size)
+        size *= 2
+    sizes.append(max(1, limit))
+    return sizes
+
+
+def knee(timings: Dict[int, float], tolerance: float) -> int:
+    """Smallest size whose time is within tolerance of the fastest"""
+    best = min(timings.values())
+    return min(size for size, elapsed in timings.items() if elapsed <= best * (1 + tolerance))
+
+
+def load_profile(config: Dict) -> Optional[Dict]:
+    """Return the cached tuning profile for this host, if one was calibrated"""
+    path = Path(config.get('performance', {}).get('autotune_path', 'output/.autotune.json'))
+    try:
+        with open(path, 'r') as f:
+            profiles = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return profiles.get(host_fingerprint()) if isinstance(profiles, dict) else None
+
+
+def save_profile(config: Dict, profile: Dict):
+    """Store a tuning profile for this host next to those of other hosts"""
+    path = Path(config.get('performance', {}).get('autotune_path', 'output/.autotune.json'))
+    try:
+        with open(path, 'r') as f:
+            profiles = json.load(f)
+    except (OSError, ValueError):
+        profiles = {}
+    profiles[host_fingerprint()] = profile
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_suffix('.tmp')
+    with open(temp_path, 'w') as f:
+        json.dump(profiles, f, indent=2, sort_keys=True)
+    os.replace(temp_path, path)
+
+
+def apply_profile(config: Dict, profile: Dict) -> Dict[str, Tuple[Any, int]]:
+    """Override config settings with tuned values.
+
+    Returns {setting: (config value, tuned value)} for every value that
+    changed, so callers can report each override.
+    """
+    changed = {}
+    settings = profile.get('settings', {})
+    for section, key, field in TUNED_SETTINGS:
+        if field in settings:
+            values = config.setdefault(section, {})
+            if values.get(key) != settings[field]:
+                changed[f"{section}.{key}"] = (values.get(key), settings[field])
+            values[key] = settings[field]
+    return changed
+
+
+class Autotuner:
+    """Measure representative workloads at several pool sizes and pick the knee.
+
+    Each size is timed rounds times and the median kept; development cycles
+    are timed with the benchmarks' measure, each in a fresh workspace after
+    a discarded warm-up cycle. The chosen size is the smallest within
+    tolerance of the fastest, so extra workers are only added when they pay
+    for themselves on this machine.
+    """
+
+    def __init__(self, config: Dict, logger, rounds: int = 5, tolerance: float = 0.1):
+        self.config = config
+        self.logger = logger
+        self.rounds = rounds
+        self.tolerance = tolerance
+        self.cpus = os.cpu_count() or 1
+        self.measurements: Dict[str, Dict[int, float]] = {}
+
+    @contextmanager
+    def _quiet(self):
+        """Silence component logging while calibration runs repeat the cycle"""
+        logger = logging.getLogger("GhostBlackOps")
+        level = logger.level
+        logger.setLevel(logging.ERROR)
+        try:
+            yield
+        finally:
+            logger.setLevel(level)
+
+    async def _median(self, run: Callable[[int], Awaitable[float]], size: int) -> float:
+        return statistics.median([await run(size) for _ in range(self.rounds)])
+
+    async def _sweep(self, name: str, sizes: List[int], run: Callable[[int], Awaitable[float]]) -> int:
+        """Time each size with run, which returns the median over the rounds, and pick the knee"""
+        timings = {}
+        for size in sizes:
+            timings[size] = await run(size)
+        self.measurements[name] = timings
+        chosen = knee(timings, self.tolerance)
+        summary = ', '.join(f"{size}: {elapsed * 1000:.1f}ms" for size, elapsed in timings.items())
+        self.logger.info(f"Autotune {name}: {summary} -> {chosen}")
+        return chosen
+
+    async def _time_renderer(self, workers: int) -> float:
+        from game_agents.asset_generator import DEFAULT_WEAPONS, render_weapon_scripts
+        from utils.content_pack import batched
+
+        renderer = RenderPool(mode='process', process_workers=workers,
+                              batch_size=self.config['render']['batch_size'])
+        weapons = DEFAULT_WEAPONS * (RENDER_ITEMS_PER_CPU * self.cpus // len(DEFAULT_WEAPONS))
+        try:
+            # Start every worker before timing so spawn cost is not measured
+            await renderer.render_many(render_weapon_scripts, weapons[:workers])
+            started = time.perf_counter()
+            # The agents render one content batch per call
+            await asyncio.gather(*(
+                renderer.render_many(render_weapon_scripts, batch)
+                for batch in batched(weapons, self.config['content']['batch_size'])
+            ))
+            return time.perf_counter() - started
+        finally:
+            renderer.close()
+
+    async def _time_writer(self, workers: int) -> float:
+        with workspace(prefix='ghost_autotune_') as root:
+            writer = ArtifactWriter(max_workers=workers, write_if_changed=False,
+                                    manifest_path=str(root / 'manifest.json'))
+            small = 'x' * 2048
+            large = 'y' * (64 * 1024)
+            started = time.perf_counter()
+            await asyncio.gather(
+                *(writer.write_text(root / 'small' / f"{i}.json", small) for i in range(WRITER_SMALL_FILES)),
+                *(writer.write_text(root / 'large' / f"{i}.cs", large) for i in range(WRITER_LARGE_FILES))
+            )
+            await writer.flush()
+            elapsed = time.perf_counter() - started
+            writer.close()
+            return elapsed
+
+    async def _time_cycle(self, max_agents: int, per_agent: int, io_workers: int) -> float:
+        """Median development cycle time over rounds fresh workspaces"""
+        from ai_director import AIDirector
+
+        config = copy.deepcopy(self.config)
+        config['system']['max_agents'] = max_agents
+        config['ai']['max_concurrent_tasks'] = per_agent
+        config['ai']['memory_admission'] = False
+        config['io']['max_workers'] = io_workers
+        config['build']['cache_enabled'] = False
+
+        async def setup() -> Dict:
+            director = AIDirector(config, self.logger)
+            await director.initialize_agents()
+            return {'config': config, 'director': director}
+
+        async def run_cycle(state: Dict):
+            await state['director'].run_development_cycle()
+            await state['director'].shutdown()
+
+        with self._quiet():
+            result = await measure('development_cycle', setup, run_cycle, self.rounds,
+                                   warmup=1, trace_memory=False)
+        return result.median
+
+    async def run(self) -> Dict:
+        """Calibrate every tuned setting and return the profile for this host"""
+        started = time.perf_counter()
+        self.logger.info(f"Autotuning on {self.cpus} CPUs ({self.rounds} rounds per size)...")
+
+        process_workers = await self._sweep(
+            'process_workers', candidates(self.cpus), lambda size: self._median(self._time_renderer, size)
+        )
+        io_workers = await self._sweep(
+            'io_workers', candidates(min(32, self.cpus * 4)), lambda size: self._median(self._time_writer, size)
+        )
+        max_agents = await self._sweep(
+            'max_agents', candidates(max(4, self.cpus * 2)),
+            lambda size: self._time_cycle(size, size, io_workers)
+        )
+        max_concurrent_tasks = await self._sweep(
+            'max_concurrent_tasks', candidates(max_agents),
+            lambda size: self._time_cycle(max_agents, size, io_workers)
+        )
+
+        return {
+            'calibrated': datetime.now().isoformat(timespec='seconds'),
+            'duration': time.perf_counter() - started,
+            'cpus': self.cpus,
+            'settings': {
+                'max_agents': max_agents,
+                'max_concurrent_tasks': max_concurrent_tasks,
+                'io_workers': io_workers,
+                'process_workers': process_workers
+            },
+            'measurements': {
+                name: {str(size): elapsed for size, elapsed in timings.items()}
+                for name, timings in self.measurements.items()
+            }
+        }
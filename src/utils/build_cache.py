@@ -0,0 +1,195 @@
+"""
+Incremental build cache for generated game artifacts
+"""
+
+import asyncio
+import hashlib
+import inspect
+import json
+import os
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from utils.artifact_writer import ArtifactWriter, file_digest
+
+CACHE_FORMAT_VERSION = 2
+
+# Generators are fingerprinted together with the project modules they use
+SOURCE_ROOT = Path(__file__).resolve().parent.parent
+
+
+class BuildCache:
+    _shared = {}
+    _fingerprints = {}
+
+    def __init__(self, cache_path: str, enabled: bool = True, writer: Optional[ArtifactWriter] = None):
+        self.cache_path = Path(cache_path)
+        self.enabled = enabled
+        # Supplies the digests of outputs it just wrote, so store need not re-read them
+        self.writer = writer
+        self.entries = {}
+        self.stats = {}
+        self._touched: Dict[str, Set[str]] = {}
+        self._dirty = False
+        self._load()
+
+    @classmethod
+    def shared(cls, config: Dict) -> 'BuildCache':
+        """Return the process-wide cache for the configured cache file"""
+        build_config = config.get('build', {})
+        cache_path = build_config.get('cache_path', 'output/.build_cache.json')
+        key = os.path.abspath(cache_path)
+        if key not in cls._shared:
+            cls._shared[key] = cls(cache_path, build_config.get('cache_enabled', True), ArtifactWriter.shared(config))
+        return cls._shared[key]
+
+    def _load(self):
+        """Load cache entries from disk, discarding unreadable or stale formats"""
+        if not self.cache_path.exists():
+            return
+        try:
+            with open(self.cache_path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get('format') == CACHE_FORMAT_VERSION:
+            self.entries = data.get('entries', {})
+
+    @staticmethod
+    def _project_file(module: Optional[ModuleType]) -> Optional[Path]:
+        """The source file of a module that belongs to this project, else None"""
+        source_file = getattr(module, '__file__', None)
+        if not source_file:
+            return None
+        path = Path(source_file).resolve()
+        return path if SOURCE_ROOT in path.parents else None
+
+    @classmethod
+    def _dependencies(cls, module: ModuleType) -> List[Path]:
+        """Source files of a module and every project module it uses, directly or indirectly"""
+        found = {}
+        pending = [module]
+        while pending:
+            current = pending.pop()
+            path = cls._project_file(current)
+            if path is None or path in found:
+                continue
+            found[path] = current
+            for value in vars(current).values():
+                used = value if inspect.ismodule(value) else sys.modules.get(getattr(value, '__module__', None) or '')
+                if used is not None:
+                    pending.append(used)
+        return sorted(found)
+
+    @classmethod
+    def generator_version(cls, generator: Any) -> str:
+        """Fingerprint a generator by its module's source and the project modules it uses.
+
+        Templates, escaping helpers and Unity meta writers live in other
+        modules, so a change to any of them must invalidate the outputs too.
+        """
+        generator_class = generator if inspect.isclass(generator) else type(generator)
+        if generator_class not in cls._fingerprints:
+            digest = hashlib.sha256()
+            for path in cls._dependencies(inspect.getmodule(generator_class)):
+                digest.update(path.relative_to(SOURCE_ROOT).as_posix().encode('utf-8'))
+                digest.update(path.read_bytes())
+            cls._fingerprints[generator_class] = digest.hexdigest()[:16]
+        return cls._fingerprints[generator_class]
+
+    def key(self, generator: Any, kind: str, data: Any) -> str:
+        """Build a cache key from the input data and generator version"""
+        payload = json.dumps({
+            'generator': type(generator).__name__,
+            'version': self.generator_version(generator),
+            'kind': kind,
+            'data': data
+        }, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _output_intact(path: str, recorded: Dict) -> bool:
+        """Check that an output still holds exactly the bytes that were generated"""
+        try:
+            if os.path.getsize(path) != recorded['size']:
+                return False
+            return file_digest(Path(path)) == recorded['sha256']
+        except OSError:
+            return False
+
+    @classmethod
+    def _entries_intact(cls, entries: List[Optional[Dict]]) -> List[bool]:
+        return [
+            entry is not None and all(cls._output_intact(path, recorded) for path, recorded in entry['outputs'].items())
+            for entry in entries
+        ]
+
+    async def lookup(self, task: str, key: str) -> bool:
+        """Return True when the outputs recorded for key are still on disk, unmodified"""
+        return (await self.lookup_many(task, [key]))[0]
+
+    async def lookup_many(self, task: str, keys: List[str]) -> List[bool]:
+        """Look up several keys of a task, hashing their outputs on a worker thread"""
+        task_stats = self.stats.setdefault(task, {'hits': 0, 'misses': 0})
+        self._touched.setdefault(task, set()).update(keys)
+        entries = [self.entries.get(key) if self.enabled else None for key in keys]
+        if any(entry is not None for entry in entries):
+            hits = await asyncio.get_running_loop().run_in_executor(None, self._entries_intact, entries)
+        else:
+            hits = [False] * len(keys)
+        task_stats['hits'] += sum(hits)
+        task_stats['misses'] += len(hits) - sum(hits)
+        return hits
+
+    def _recorded_output(self, path: Path) -> Dict:
+        """Size and digest of an output, taken from the writer when it wrote the file"""
+        written = self.writer.digest(path) if self.writer is not None else None
+        if written is None:
+            return {'size': os.path.getsize(path), 'sha256': file_digest(Path(path))}
+        size, digest = written
+        return {'size': size, 'sha256': digest}
+
+    def store(self, key: str, outputs: Iterable[Path]):
+        """Record the outputs produced for a cache key"""
+        task = next((task for task, keys in self._touched.items() if key in keys), None)
+        self.entries[key] = {
+            'task': task,
+            'outputs': {str(path): self._recorded_output(path) for path in outputs}
+        }
+        self._dirty = True
+
+    def prune(self, tasks: Iterable[str]) -> int:
+        """Drop the entries of completed tasks that this run no longer looked up.
+
+        Renamed or removed content records would otherwise stay in the
+        cache file forever. Returns the number of entries dropped.
+        """
+        stale = []
+        for task in tasks:
+            touched = self._touched.pop(task, None)
+            if touched is None:
+                continue
+            stale.extend(key for key, entry in self.entries.items()
+                         if entry.get('task') == task and key not in touched)
+        for key in stale:
+            del self.entries[key]
+        if stale:
+            self._dirty = True
+        return len(stale)
+
+    def task_stats(self, task: str) -> Optional[Dict[str, int]]:
+        """Return hit/miss counters for a task, if it used the cache"""
+        return self.stats.get(task)
+
+    def save(self):
+        """Persist cache entries if anything changed"""
+        if not self._dirty:
+            return
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.cache_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump({'format': CACHE_FORMAT_VERSION, 'entries': self.entries}, f)
+        os.replace(temp_path, self.cache_path)
+        self._dirty = False
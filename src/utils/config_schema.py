@@ -0,0 +1,261 @@
+"""
+Typed configuration schema with defaults, validation and a compiled cache
+"""
+
+import copy
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+# The libyaml loader parses several times faster when PyYAML was built with it
+YamlLoader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+CONFIG_CACHE_PATH = 'output/.config_cache.json'
+
+
+class ConfigError(ValueError):
+    """Raised when a configuration file cannot be used"""
+
+    def __init__(self, source: str, problems: List[str]):
+        self.source = source
+        self.problems = problems
+        super().__init__(f"Invalid configuration {source}: " + '; '.join(problems))
+
+
+@dataclass(frozen=True)
+class Field:
+    types: Tuple[type, ...]
+    default: Any = None
+    minimum: Optional[float] = None
+    choices: Optional[Tuple] = None
+
+
+def _int(default: int, minimum: Optional[int] = None) -> Field:
+    return Field((int,), default, minimum)
+
+
+def _float(default: float, minimum: Optional[float] = None) -> Field:
+    return Field((int, float), default, minimum)
+
+
+def _bool(default: bool) -> Field:
+    return Field((bool,), default)
+
+
+def _str(default: str, choices: Optional[Tuple[str, ...]] = None) -> Field:
+    return Field((str,), default, choices=choices)
+
+
+SCHEMA: Dict[str, Dict[str, Field]] = {
+    'system': {
+        'type': _str('linux'),
+        'max_agents': _int(4, minimum=1),
+        'max_memory_gb': _float(6, minimum=0.1),
+        'enable_gpu': _bool(False),
+        'gpu_priority': _bool(False)
+    },
+    'game': {
+        'name': _str('Ghost: Black Ops'),
+        'version': _str('1.0.0'),
+        'target_platforms': Field((list,), ['ubuntu', 'windows'])
+    },
+    'ai': {
+        'model_provider': _str('openai'),
+        'max_concurrent_tasks': _int(2, minimum=1),
+        'enable_learning': _bool(True),
+        'training_interval': _float(3600, minimum=0),
+        'task_timeout': _float(300, minimum=0),
+        'task_retries': _int(2, minimum=0),
+        'retry_backoff': _float(0.5, minimum=0),
+        'agent_concurrency': Field((dict,), {}),
+        'memory_admission': _bool(True),
+        'memory_headroom_gb': _float(0.5, minimum=0),
+        'default_task_memory_mb': _float(64, minimum=0),
+        'memory_estimate_smoothing': _float(0.3, minimum=0),
+        'memory_history_path': _str('output/.task_memory.json')
+    },
+    'unity': {
+        'project_path': _str('./unity_project'),
+        'assets_path': _str('./unity_project/Assets'),
+        'scripts_path': _str('./unity_project/Assets/Scripts'),
+        'link_mode': _str('auto', choices=('auto', 'reflink', 'hardlink', 'copy')),
+        'watch_debounce': _float(0.2, minimum=0)
+    },
+    'performance': {
+        'texture_quality': _str('medium'),
+        'shadow_quality': _str('low'),
+        'anti_aliasing': _str('fxaa'),
+        'target_fps': _int(60, minimum=1),
+        'sample_interval': _float(0.05, minimum=0.001),
+        'hotspot_count': _int(5, minimum=0),
+        'history_size': _int(10000, minimum=1),
+        'stall_threshold': _float(0.1, minimum=0.001),
+        'stall_check_interval': _float(0.02, minimum=0.001),
+        'memory_profile': _bool(False),
+        'memory_trace_frames': _int(1, minimum=1),
+        'memory_top_sites': _int(10, minimum=0),
+        'memory_task_budget_share': _float(0.25, minimum=0),
+        'autotune': _bool(True),
+        'autotune_path': _str('output/.autotune.json')
+    },
+    'io': {
+        'max_workers': _int(4, minimum=1),
+        'batch_size': _int(32, minimum=1),
+        'batch_delay': _float(0.002, minimum=0),
+        'batch_bytes': _int(256 * 1024, minimum=1),
+        'small_write_bytes': _int(16 * 1024, minimum=0),
+        'write_if_changed': _bool(True),
+        'manifest_path': _str('output/.artifact_manifest.json')
+    },
+    'render': {
+        'mode': _str('inline', choices=('inline', 'process')),
+        'process_workers': _int(0, minimum=0),
+        'batch_size': _int(64, minimum=1)
+    },
+    'content': {
+        'pack_dir': _str(''),
+        'batch_size': _int(256, minimum=1),
+        'strict': _bool(False)
+    },
+    'build': {
+        'cache_enabled': _bool(True),
+        'cache_path': _str('output/.build_cache.json')
+    },
+    'development': {
+        'auto_save': _bool(True),
+        'backup_interval': _float(300, minimum=0),
+        'version_control': _bool(True)
+    }
+}
+
+
+def check_field(section: str, key: str, field: Field, value: Any) -> Optional[str]:
+    """Describe why a value does not fit its field, or None if it does"""
+    name = f"{section}.{key}"
+    # bool is an int subclass, so it has to be ruled out explicitly
+    if isinstance(value, bool) and bool not in field.types:
+        return f"{name} must be {field.types[-1].__name__}, got {value!r}"
+    if not isinstance(value, field.types):
+        return f"{name} must be {field.types[-1].__name__}, got {type(value).__name__} {value!r}"
+    if field.minimum is not None and value < field.minimum:
+        return f"{name} must be at least {field.minimum}, got {value!r}"
+    if field.choices is not None and value not in field.choices:
+        return f"{name} must be one of {', '.join(field.choices)}, got {value!r}"
+    return None
+
+
+def validate_config(raw: Any, source: str = 'config') -> Tuple[Dict, List[str]]:
+    """Fill defaults and type-check a parsed config.
+
+    Returns the validated config and a warning for every key the schema
+    does not know, which is usually a typo. Every problem is collected
+    before raising, so one run reports them all.
+    """
+    if raw is None:
+        raw = {}
+    if not isinstance(raw, dict):
+        raise ConfigError(source, [f"top level must be a mapping, got {type(raw).__name__}"])
+
+    config = copy.deepcopy(raw)
+    problems = []
+    warnings = []
+    for section, fields in SCHEMA.items():
+        values = config.setdefault(section, {})
+        if values is None:
+            values = config[section] = {}
+        if not isinstance(values, dict):
+            problems.append(f"{section} must be a mapping, got {type(values).__name__}")
+            continue
+        for key, field in fields.items():
+            if key not in values:
+                values[key] = copy.deepcopy(field.default)
+                continue
+            problem = check_field(section, key, field, values[key])
+            if problem:
+                problems.append(problem)
+        warnings.extend(f"Unknown config key {section}.{key}" for key in values if key not in fields)
+
+    if problems:
+        raise ConfigError(source, problems)
+    return config, warnings
+
+
+def schema_version() -> str:
+    """Fingerprint of this module, so cached configs are rebuilt when the schema changes"""
+    with open(__file__, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+def _load_cache(cache_path: Path) -> Dict:
+    try:
+        with open(cache_path, 'r') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def _save_cache(cache_path: Path, cache: Dict):
+    try:
+        content = json.dumps(cache)
+    except (TypeError, ValueError):
+        # Configs holding values JSON cannot represent are simply not cached
+        return
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            f.write(content)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass
+
+
+def load_config(config_file: str, cache_path: Optional[str] = CONFIG_CACHE_PATH) -> Tuple[Dict, List[str]]:
+    """Load and validate a YAML config, reusing the compiled cache when possible.
+
+    A cache entry is used without reading the file when its mtime and size
+    are unchanged, and without parsing it when only the mtime moved but
+    the content hash still matches. Invalid configs are never cached.
+    """
+    source = Path(config_file)
+    stat = source.stat()
+    key = str(source.resolve())
+    version = schema_version()
+
+    cache_file = Path(cache_path) if cache_path else None
+    cache = _load_cache(cache_file) if cache_file else {}
+    entry = cache.get(key)
+    if not isinstance(entry, dict) or entry.get('schema') != version:
+        entry = None
+
+    if entry and entry.get('mtime_ns') == stat.st_mtime_ns and entry.get('size') == stat.st_size:
+        return entry['config'], entry['warnings']
+
+    content = source.read_bytes()
+    digest = hashlib.sha256(content).hexdigest()
+    if entry and entry.get('sha256') == digest:
+        config, warnings = entry['config'], entry['warnings']
+    else:
+        try:
+            raw = yaml.load(content, Loader=YamlLoader)
+        except yaml.YAMLError as e:
+            raise ConfigError(config_file, [f"YAML parse error: {e}"]) from e
+        config, warnings = validate_config(raw, config_file)
+
+    if cache_file:
+        cache[key] = {
+            'schema': version,
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'sha256': digest,
+            'config': config,
+            'warnings': warnings
+        }
+        _save_cache(cache_file, cache)
+    return config, warnings
@@ -0,0 +1,368 @@
+"""
+Streaming content packs: catalog records read from JSON Lines or CSV spec files
+"""
+
+import asyncio
+import csv
+import gzip
+import json
+import math
+from dataclasses import dataclass
+from itertools import islice
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from utils.config_schema import Field, check_field
+from utils.templates import is_csharp_identifier
+
+# Looked up in this order for each kind, e.g. weapons.jsonl before weapons.csv
+SPEC_SUFFIXES = ('.jsonl', '.jsonl.gz', '.csv', '.csv.gz')
+
+# CSV list cells hold items separated by this, or a JSON array
+LIST_SEPARATOR = '|'
+
+
+class ContentError(ValueError):
+    """Raised for an invalid spec record when content.strict is set"""
+
+    def __init__(self, source: str, problems: List[str]):
+        self.source = source
+        self.problems = problems
+        super().__init__(f"Invalid content {source}: " + '; '.join(problems))
+
+
+@dataclass(frozen=True)
+class ContentKind:
+    key: str
+    fields: Dict[str, Field]
+    required: Tuple[str, ...]
+    # File name stems the agent derives from the key, one per output directory
+    stems: Callable[[str], Tuple[str, ...]]
+    # (field, derivation) of the C# class and enum member names the scripts declare
+    identifiers: Tuple[Tuple[str, Callable[[str], str]], ...] = ()
+
+
+def _text() -> Field:
+    return Field((str,))
+
+
+def _number() -> Field:
+    return Field((int, float), minimum=0)
+
+
+def _count() -> Field:
+    return Field((int,), minimum=0)
+
+
+def _strings() -> Field:
+    return Field((list,))
+
+
+# Fields use dotted paths for nested values; key names the output files
+CONTENT_KINDS: Dict[str, ContentKind] = {
+    'weapons': ContentKind(
+        key='name',
+        fields={
+            'name': _text(),
+            'type': _text(),
+            'damage': _number(),
+            'fire_rate': _number(),
+            'accuracy': _number(),
+            'range': _number(),
+            'special_features': _strings(),
+            'unlock_requirement': _text()
+        },
+        required=('name', 'type', 'damage', 'fire_rate', 'accuracy', 'range', 'special_features'),
+        stems=lambda name: (name.lower().replace(' ', '_'), name.replace(' ', '')),
+        identifiers=(('name', lambda name: name.replace(' ', '')), ('type', lambda type_: type_.replace(' ', '')))
+    ),
+    'gear': ContentKind(
+        key='name',
+        fields={
+            'name': _text(),
+            'type': _text(),
+            'function': _text(),
+            'protection': _number(),
+            'mobility_penalty': _number(),
+            'duration': _number(),
+            'cooldown': _number(),
+            'slots': _count(),
+            'special_features': _strings(),
+            'unlock_requirement': _text()
+        },
+        required=('name', 'type', 'special_features'),
+        stems=lambda name: (name.lower().replace(' ', '_'), name.replace(' ', '')),
+        identifiers=(('name', lambda name: name.replace(' ', '')),)
+    ),
+    'characters': ContentKind(
+        key='callsign',
+        fields={
+            'callsign': _text(),
+            'role': _text(),
+            'specialization': _text(),
+            'attributes.strength': _number(),
+            'attributes.agility': _number(),
+            'attributes.intelligence': _number(),
+            'attributes.accuracy': _number(),
+            'attributes.demolition': _number(),
+            'attributes.hacking': _number(),
+            'attributes.breach': _number(),
+            'personality.humor_level': _number(),
+            'personality.wit_level': _number(),
+            'personality.teamwork': _number(),
+            'personality.aggression': _number(),
+            'personality.loyalty': _number(),
+            'quotes': _strings()
+        },
+        required=(
+            'callsign', 'role',
+            'attributes.strength', 'attributes.agility', 'attributes.intelligence', 'attributes.accuracy',
+            'attributes.demolition', 'attributes.hacking', 'attributes.breach',
+            'personality.humor_level', 'personality.wit_level', 'personality.teamwork'
+        ),
+        stems=lambda callsign: (f"ai_{callsign.lower()}",),
+        identifiers=(('callsign', lambda callsign: f"{callsign}Character"),)
+    ),
+    'missions': ContentKind(
+        key='mission_id',
+        fields={
+            'mission_id': _text(),
+            'name': _text(),
+            'type': _text(),
+            'location': _text(),
+            'primary_objectives': _strings(),
+            'secondary_objectives': _strings(),
+            'enemy_types': _strings(),
+            'special_conditions': _strings()
+        },
+        required=('mission_id', 'name', 'type', 'location', 'primary_objectives', 'secondary_objectives',
+                  'enemy_types', 'special_conditions'),
+        stems=lambda mission_id: (mission_id, f"Mission_{mission_id}"),
+        identifiers=(('mission_id', lambda mission_id: f"Mission{mission_id}"),)
+    ),
+    'scenes': ContentKind(
+        key='name',
+        fields={
+            'name': _text(),
+            'type': _text(),
+            'environment': _text(),
+            'difficulty': _text(),
+            'objectives': _count(),
+            'enemy_count': _count(),
+            'special_features': _strings()
+        },
+        required=('name', 'type', 'enemy_count'),
+        stems=lambda name: (name.lower().replace(' ', '_'),)
+    )
+}
+
+_MISSING = object()
+
+
+def batched(records: Iterable, size: int) -> Iterator[List]:
+    """Split an iterable into lists of at most size items, pulling one list at a time"""
+    iterator = iter(records)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def _lookup(record: Dict, path: str) -> Any:
+    value = record
+    for name in path.split('.'):
+        if not isinstance(value, dict):
+            return _MISSING
+        value = value.get(name, _MISSING)
+    return value
+
+
+def validate_record(kind: str, record: Any) -> List[str]:
+    """Describe every reason a record cannot be generated; empty when it can"""
+    spec = CONTENT_KINDS[kind]
+    if not isinstance(record, dict):
+        return [f"record must be an object, got {type(record).__name__}"]
+
+    problems = []
+    for path, field in spec.fields.items():
+        value = _lookup(record, path)
+        if value is _MISSING:
+            if path in spec.required:
+                problems.append(f"{kind}.{path} is required")
+            continue
+        problem = check_field(kind, path, field, value)
+        if problem is None and list in field.types and not all(isinstance(item, str) for item in value):
+            problem = f"{kind}.{path} must be a list of strings"
+        if problem is None and float in field.types and not math.isfinite(value):
+            # Rendered as a C# float literal, which has no spelling for these
+            problem = f"{kind}.{path} must be a finite number, got {value!r}"
+        if problem:
+            problems.append(problem)
+
+    for path, derive in spec.identifiers:
+        value = record.get(path)
+        if isinstance(value, str) and not is_csharp_identifier(derive(value)):
+            problems.append(f"{kind}.{path} {value!r} does not make a valid C# identifier: {derive(value)!r}")
+
+    key = record.get(spec.key)
+    if isinstance(key, str) and (not key.strip() or '/' in key or '\\' in key or key.startswith('.')):
+        # The key becomes a file name, so it must not be empty or leave its directory
+        problems.append(f"{kind}.{spec.key} is not usable as a file name: {key!r}")
+    return problems
+
+
+def _parse_cell(field: Optional[Field], cell: str) -> Any:
+    """Convert a CSV cell to the type its field expects; unparseable cells are left for validation"""
+    if field is None or str in field.types:
+        return cell
+    if list in field.types:
+        if cell.startswith('['):
+            try:
+                return json.loads(cell)
+            except ValueError:
+                return cell
+        return [item.strip() for item in cell.split(LIST_SEPARATOR) if item.strip()]
+    try:
+        return int(cell)
+    except ValueError:
+        pass
+    if float in field.types:
+        try:
+            return float(cell)
+        except ValueError:
+            pass
+    return cell
+
+
+def _csv_record(row: Dict[Optional[str], Any], spec: ContentKind) -> Tuple[Dict, List[str]]:
+    """Build a record from a CSV row, nesting dotted column names"""
+    record = {}
+    problems = []
+    for column, cell in row.items():
+        if column is None:
+            problems.append(f"row has {len(cell)} more cells than the header has columns")
+            continue
+        if cell is None or cell == '':
+            continue
+        *parents, name = column.split('.')
+        target = record
+        for parent in parents:
+            target = target.setdefault(parent, {})
+            if not isinstance(target, dict):
+                problems.append(f"column {column} conflicts with column {parent}")
+                break
+        else:
+            target[name] = _parse_cell(spec.fields.get(column), cell)
+    return record, problems
+
+
+def _open_text(path: Path):
+    if path.suffix == '.gz':
+        return gzip.open(path, 'rt', encoding='utf-8', newline='')
+    return open(path, 'r', encoding='utf-8', newline='')
+
+
+def read_specs(path: Path, kind: str) -> Iterator[Tuple[int, Any, List[str]]]:
+    """Yield (line, record, problems) for each record of a spec file, one record at a time.
+
+    JSON Lines files hold one object per line; blank lines are skipped. CSV
+    files start with a header row naming the fields, with dotted names such
+    as attributes.strength for nested values. Empty cells are left out and
+    list cells separate their items with | unless they hold a JSON array.
+    """
+    spec = CONTENT_KINDS[kind]
+    with _open_text(path) as f:
+        if path.name.endswith(('.csv', '.csv.gz')):
+            reader = csv.DictReader(f)
+            for row in reader:
+                record, problems = _csv_record(row, spec)
+                yield reader.line_num, record, problems or validate_record(kind, record)
+            return
+
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield line_number, None, [f"invalid JSON: {e}"]
+                continue
+            yield line_number, record, validate_record(kind, record)
+
+
+class ContentPack:
+    """Catalog records for the content agents, streamed from the spec files in content.pack_dir.
+
+    A kind without a spec file falls back to the agent's built-in catalog.
+    Spec records are read and validated lazily and run_batched hands them
+    to the agent batch_size at a time, so packs of any size are processed
+    with a bounded number of records in memory. Invalid records are logged
+    and skipped, or raise ContentError when content.strict is set.
+    """
+
+    def __init__(self, config: Dict, logger):
+        content_config = config.get('content', {})
+        pack_dir = content_config.get('pack_dir') or ''
+        self.pack_dir = Path(pack_dir) if pack_dir else None
+        self.batch_size = content_config.get('batch_size', 256)
+        self.strict = content_config.get('strict', False)
+        self.logger = logger
+
+    def spec_file(self, kind: str) -> Optional[Path]:
+        """The pack's spec file for a kind, if it has one"""
+        if self.pack_dir is None:
+            return None
+        for suffix in SPEC_SUFFIXES:
+            path = self.pack_dir / f"{kind}{suffix}"
+            if path.is_file():
+                return path
+        return None
+
+    def records(self, kind: str, default: List[Dict]) -> Iterable[Dict]:
+        """Records of a kind from the pack, or the built-in catalog when the pack has none"""
+        path = self.spec_file(kind)
+        return default if path is None else self.stream(kind, path)
+
+    def stream(self, kind: str, path: Path) -> Iterator[Dict]:
+        """Yield the valid records of a spec file, rejecting records whose files an earlier one writes"""
+        spec = CONTENT_KINDS[kind]
+        claimed: Dict[Tuple[int, str], Tuple[int, str]] = {}
+        loaded = skipped = 0
+        for line, record, problems in read_specs(path, kind):
+            if not problems:
+                key = record[spec.key]
+                # Compared case-insensitively, as file names are on Windows and macOS
+                stems = [(index, stem.casefold()) for index, stem in enumerate(spec.stems(key))]
+                owner = next((claimed[stem] for stem in stems if stem in claimed), None)
+                if owner is not None:
+                    problems = [f"{spec.key} {key!r} writes the same files as {owner[1]!r} on line {owner[0]}"]
+                else:
+                    claimed.update((stem, (line, key)) for stem in stems)
+            if problems:
+                source = f"{path}:{line}"
+                if self.strict:
+                    raise ContentError(source, problems)
+                self.logger.warning(f"Skipping invalid {kind} record at {source}: {'; '.join(problems)}")
+                skipped += 1
+                continue
+            loaded += 1
+            yield record
+        summary = f"Loaded {loaded} {kind} from {path}"
+        self.logger.info(f"{summary} ({skipped} invalid skipped)" if skipped else summary)
+
+    async def run_batched(self, records: Iterable[Dict], handle_batch: Callable[[List[Dict]], Awaitable]) -> int:
+        """Hand the records to handle_batch batch_size at a time, returning how many were handled.
+
+        Each batch is read and validated on a worker thread, so parsing a
+        large spec file does not block the other agents' tasks.
+        """
+        loop = asyncio.get_running_loop()
+        batches = batched(records, self.batch_size)
+        handled = 0
+        while True:
+            batch = await loop.run_in_executor(None, next, batches, None)
+            if batch is None:
+                return handled
+            await handle_batch(batch)
+            handled += len(batch)
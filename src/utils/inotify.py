@@ -0,0 +1,104 @@
+"""
+Minimal inotify binding for watching generated output directories
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+IN_Q_OVERFLOW = 0x00004000
+
+IN_NONBLOCK = 0o4000
+IN_CLOEXEC = 0o2000000
+
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_MOVED_FROM | IN_CREATE | IN_DELETE | IN_DELETE_SELF
+
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class InotifyWatcher:
+    def __init__(self):
+        if not sys.platform.startswith('linux'):
+            raise RuntimeError("inotify watching is only available on Linux")
+
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}
+        self.overflowed = False
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def add_watch(self, path: Path, mask: int = WATCH_MASK) -> int:
+        """Watch a single directory"""
+        wd = self._libc.inotify_add_watch(self.fd, os.fsencode(str(path)), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        self.watches[wd] = Path(path)
+        return wd
+
+    def add_tree(self, root: Path, mask: int = WATCH_MASK):
+        """Watch a directory and every directory below it"""
+        self.add_watch(root, mask)
+        for dirpath, dirnames, _ in os.walk(root):
+            for dirname in dirnames:
+                self.add_watch(Path(dirpath) / dirname, mask)
+
+    def read_events(self) -> List[Tuple[Path, int]]:
+        """Read pending events as (path, mask) pairs, watching new directories"""
+        events = []
+        while True:
+            try:
+                buffer = os.read(self.fd, 64 * 1024)
+            except OSError as e:
+                if e.errno == errno.EAGAIN:
+                    break
+                raise
+            if not buffer:
+                break
+
+            offset = 0
+            while offset < len(buffer):
+                wd, mask, _, name_length = _EVENT_HEADER.unpack_from(buffer, offset)
+                offset += _EVENT_HEADER.size
+                name = buffer[offset:offset + name_length].rstrip(b'\0')
+                offset += name_length
+
+                if mask & IN_IGNORED:
+                    self.watches.pop(wd, None)
+                    continue
+                if mask & IN_Q_OVERFLOW:
+                    self.overflowed = True
+                    continue
+                if wd not in self.watches:
+                    continue
+
+                path = self.watches[wd] / os.fsdecode(name) if name else self.watches[wd]
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO):
+                    # Files can land in a new directory before its watch exists
+                    self.add_tree(path)
+                    for dirpath, _, filenames in os.walk(path):
+                        events.extend((Path(dirpath) / filename, IN_CLOSE_WRITE) for filename in filenames)
+                    continue
+                events.append((path, mask))
+        return events
+
+    def close(self):
+        if self.fd >= 0:
+            os.close(self.fd)
+            self.fd = -1
@@ -0,0 +1,305 @@
+"""
+Streaming analysis of development cycle logs
+
+Every stage is a generator, so arbitrarily large (and gzipped) log archives
+are processed line by line; only open spans and fixed-size histograms are
+kept in memory.
+"""
+
+import gzip
+import json
+import math
+import re
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+LOG_PATTERNS = ('*.log', '*.jsonl', '*.log.gz', '*.jsonl.*.gz', '*.jsonl.gz')
+
+_ROTATED_SEGMENT = re.compile(r'^(.*)\.(\d+)(?:\.gz)?$')
+_TEXT_LINE = re.compile(r'^(\d{4}-\d\d-\d\d \d\d:\d\d:\d\d(?:[.,]\d+)?) \| (\w+)\s*\| (.*)$')
+
+_RUN_START = re.compile(r'=== Ghost: Black Ops AI System Initialization ===')
+_PHASE_START = re.compile(r'Executing development phase: (\w+)')
+_PHASE_END = re.compile(r'Phase (\w+) completed: (\d+)/(\d+) tasks successful')
+_TASK_START = re.compile(r'Starting task (\S+)')
+_TASK_END = re.compile(r'Task (\S+) (completed in|failed after) ([\d.]+)s')
+_TASK_SKIPPED = re.compile(r'Task (\S+) skipped:')
+
+
+@dataclass
+class LogEvent:
+    source: str
+    timestamp: float
+    kind: str
+    name: str = ''
+    duration: Optional[float] = None
+    succeeded: bool = True
+
+
+@dataclass
+class Span:
+    run: int
+    kind: str
+    name: str
+    duration: float
+    succeeded: bool = True
+
+
+def _chronological_key(path: Path):
+    """Order rotated segments (log.3.gz, log.2.gz, log.1.gz) before the live file"""
+    match = _ROTATED_SEGMENT.match(path.name)
+    if match:
+        return match.group(1), 0, -int(match.group(2))
+    return path.name, 1, 0
+
+
+def find_log_files(paths: Iterable[str]) -> List[Path]:
+    """Expand files and directories into a chronologically sorted list of log files"""
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            found = {f for pattern in LOG_PATTERNS for f in path.glob(pattern)}
+            files.extend(sorted(found, key=_chronological_key))
+        elif path.exists():
+            files.append(path)
+    return files
+
+
+def iter_lines(files: Iterable[Path]) -> Iterator[Tuple[str, str]]:
+    """Yield (source, line) pairs from plain or gzipped log files"""
+    for path in files:
+        opener = gzip.open if path.suffix == '.gz' else open
+        with opener(path, 'rt', encoding='utf-8', errors='replace') as f:
+            for line in f:
+                yield str(path), line.rstrip('\n')
+
+
+def _parse_timestamp(value: str) -> float:
+    return datetime.fromisoformat(value.replace(',', '.')).timestamp()
+
+
+def _message_event(source: str, timestamp: float, message: str,
+                   duration: Optional[float] = None) -> Optional[LogEvent]:
+    """Classify a log message into a span boundary event"""
+    if _RUN_START.search(message):
+        return LogEvent(source, timestamp, 'run_start')
+    match = _TASK_END.search(message)
+    if match:
+        logged = duration if duration is not None else float(match.group(3))
+        return LogEvent(source, timestamp, 'task_end', match.group(1), logged,
+                        match.group(2) == 'completed in')
+    match = _TASK_START.search(message)
+    if match:
+        return LogEvent(source, timestamp, 'task_start', match.group(1))
+    match = _TASK_SKIPPED.search(message)
+    if match:
+        return LogEvent(source, timestamp, 'task_skipped', match.group(1), succeeded=False)
+    match = _PHASE_START.search(message)
+    if match:
+        return LogEvent(source, timestamp, 'phase_start', match.group(1))
+    match = _PHASE_END.search(message)
+    if match:
+        return LogEvent(source, timestamp, 'phase_end', match.group(1),
+                        succeeded=match.group(2) == match.group(3))
+    return None
+
+
+def parse_events(lines: Iterable[Tuple[str, str]]) -> Iterator[LogEvent]:
+    """Turn text or JSON-lines log lines into span boundary events"""
+    for source, line in lines:
+        if line.startswith('{'):
+            try:
+                entry = json.loads(line)
+                timestamp = _parse_timestamp(entry['timestamp'])
+            except (ValueError, KeyError, TypeError):
+                continue
+            event = _message_event(source, timestamp, entry.get('message', ''), entry.get('duration'))
+        else:
+            match = _TEXT_LINE.match(line)
+            if not match:
+                continue
+            event = _message_event(source, _parse_timestamp(match.group(1)), match.group(3))
+        if event is not None:
+            yield event
+
+
+def build_spans(events: Iterable[LogEvent]) -> Iterator[Span]:
+    """Pair start and end events into phase and task spans.
+
+    A new run begins at each system initialization banner and at each new
+    plain-text log file; JSON-lines segments are continuous. Logs written
+    before phases announced their start fall back to the end of the
+    previous phase. A run whose banner was already seen in another file
+    (the text and JSON-lines copies of the same run) is only counted once.
+    """
+    run = -1
+    source = None
+    seen_runs = set()
+    duplicate = False
+    run_started = None
+    last_phase_end = None
+    open_phases = {}
+    open_tasks = {}
+
+    for event in events:
+        new_text_file = event.source != source and '.jsonl' not in event.source
+        if source is None or new_text_file or event.kind == 'run_start':
+            source = event.source
+            run_started = last_phase_end = event.timestamp
+            open_phases.clear()
+            open_tasks.clear()
+            duplicate = False
+            if event.kind == 'run_start':
+                run_key = round(event.timestamp * 1000)
+                duplicate = run_key in seen_runs
+                seen_runs.add(run_key)
+            if not duplicate:
+                run += 1
+        if duplicate:
+            continue
+
+        if event.kind == 'phase_start':
+            open_phases[event.name] = event.timestamp
+        elif event.kind == 'phase_end':
+            started = open_phases.pop(event.name, last_phase_end or run_started)
+            last_phase_end = event.timestamp
+            yield Span(run, 'phase', event.name, event.timestamp - started, event.succeeded)
+        elif event.kind == 'task_start':
+            open_tasks[event.name] = event.timestamp
+        elif event.kind == 'task_end':
+            started = open_tasks.pop(event.name, event.timestamp)
+            duration = event.duration if event.duration is not None else event.timestamp - started
+            yield Span(run, 'task', event.name, duration, event.succeeded)
+        elif event.kind == 'task_skipped':
+            open_tasks.pop(event.name, None)
+            yield Span(run, 'task', event.name, 0.0, False)
+
+
+class DurationHistogram:
+    """Fixed-size log-bucketed histogram for streaming percentiles.
+
+    Buckets grow geometrically, so a percentile is accurate to within the
+    bucket growth factor regardless of how many samples are added.
+    """
+
+    def __init__(self, minimum: float = 1e-6, maximum: float = 1e5, growth: float = 1.05):
+        self.minimum = minimum
+        self.growth = growth
+        self._log_growth = math.log(growth)
+        self.buckets = [0] * (int(math.log(maximum / minimum) / self._log_growth) + 2)
+        self.count = 0
+        self.failures = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def add(self, value: float, succeeded: bool = True):
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+        if not succeeded:
+            self.failures += 1
+        if value <= self.minimum:
+            index = 0
+        else:
+            index = min(len(self.buckets) - 1, int(math.log(value / self.minimum) / self._log_growth) + 1)
+        self.buckets[index] += 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, pct: float) -> float:
+        """Return the upper bound of the bucket holding the pct-th sample"""
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(self.count * pct / 100))
+        seen = 0
+        for index, bucket in enumerate(self.buckets):
+            seen += bucket
+            if seen >= rank:
+                upper = self.minimum * self.growth ** index
+                return min(max(upper, self.min), self.max)
+        return self.max
+
+
+class SpanStatistics:
+    """Aggregate span durations per phase and per task"""
+
+    def __init__(self):
+        self.phases: Dict[str, DurationHistogram] = {}
+        self.tasks: Dict[str, DurationHistogram] = {}
+        self.runs = 0
+
+    def observe(self, spans: Iterable[Span]) -> Iterator[Span]:
+        """Record spans while passing them further down the pipeline"""
+        for span in spans:
+            self.add(span)
+            yield span
+
+    def add(self, span: Span):
+        self.runs = max(self.runs, span.run + 1)
+        table = self.phases if span.kind == 'phase' else self.tasks
+        histogram = table.get(span.name)
+        if histogram is None:
+            histogram = table[span.name] = DurationHistogram()
+        histogram.add(span.duration, span.succeeded)
+
+    def report(self, percentiles: Iterable[float] = (50, 90, 95, 99)) -> List[str]:
+        """Format a percentile table for phases and tasks"""
+        percentiles = list(percentiles)
+        header = (f"{'name':<52} {'count':>6} {'fail':>5} {'mean':>9} "
+                  + ' '.join(f"{'p' + format(p, 'g'):>9}" for p in percentiles)
+                  + f" {'max':>9}")
+        lines = [f"Analyzed {self.runs} runs"]
+        for title, table in (('Phases', self.phases), ('Tasks', self.tasks)):
+            if not table:
+                continue
+            lines.append("")
+            lines.append(f"=== {title} (seconds) ===")
+            lines.append(header)
+            ranked = sorted(table.items(), key=lambda item: item[1].total, reverse=True)
+            for name, histogram in ranked:
+                lines.append(
+                    f"{name:<52} {histogram.count:>6} {histogram.failures:>5} {histogram.mean:>9.3f} "
+                    + ' '.join(f"{histogram.percentile(p):>9.3f}" for p in percentiles)
+                    + f" {histogram.max:>9.3f}"
+                )
+        return lines
+
+    def to_dict(self, percentiles: Iterable[float] = (50, 90, 95, 99)) -> Dict:
+        percentiles = list(percentiles)
+
+        def describe(histogram: DurationHistogram) -> Dict:
+            summary = {
+                'count': histogram.count,
+                'failures': histogram.failures,
+                'mean': histogram.mean,
+                'max': histogram.max
+            }
+            summary.update({f"p{p:g}": histogram.percentile(p) for p in percentiles})
+            return summary
+
+        return {
+            'runs': self.runs,
+            'phases': {name: describe(h) for name, h in self.phases.items()},
+            'tasks': {name: describe(h) for name, h in self.tasks.items()}
+        }
+
+
+def run_totals(spans: Iterable[Span]) -> Iterator[Tuple[int, Dict[str, float]]]:
+    """Yield per-run phase durations as each run finishes"""
+    current = None
+    totals = {}
+    for span in spans:
+        if span.run != current:
+            if totals:
+                yield current, totals
+            current, totals = span.run, {}
+        if span.kind == 'phase':
+            totals[span.name] = totals.get(span.name, 0.0) + span.duration
+    if totals:
+        yield current, totals
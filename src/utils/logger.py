@@ -2,22 +2,222 @@
 Advanced logging system for Ghost: Black Ops AI
 """
 
+import atexit
+import contextvars
+import gzip
+import json
 import logging
+import os
+import queue
+import shutil
 import sys
-from datetime import datetime
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import BaseRotatingHandler, QueueHandler, QueueListener, RotatingFileHandler
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+CONTEXT_FIELDS = ('agent', 'task', 'phase', 'duration')
+
+_log_context = contextvars.ContextVar('log_context', default={})
+
+
+@contextmanager
+def log_context(**fields):
+    """Attach agent/task/phase fields to every record logged in this context"""
+    token = _log_context.set({**_log_context.get(), **fields})
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class LogContextFilter(logging.Filter):
+    """Copy the current log context onto records when they are created"""
+    
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = _log_context.get()
+        for field in CONTEXT_FIELDS:
+            if not hasattr(record, field):
+                setattr(record, field, context.get(field))
+        return True
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Format records as one JSON object per line"""
+    
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname
+        }
+        for field in CONTEXT_FIELDS:
+            entry[field] = getattr(record, field, None)
+        entry['message'] = record.getMessage()
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class CompressingRotatingFileHandler(RotatingFileHandler):
+    """RotatingFileHandler that gzips rotated segments on a background thread"""
+    
+    def __init__(self, filename: str, max_bytes: int, backup_count: int):
+        super().__init__(filename, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+        self.namer = lambda name: name + '.gz'
+        self.rotator = self._compress_in_background
+        self._compressor = None
+    
+    def doRollover(self):
+        # Segments are renamed during rollover, so the previous one must be done
+        if self._compressor is not None:
+            self._compressor.join()
+        super().doRollover()
+    
+    def _compress_in_background(self, source: str, dest: str):
+        pending = f"{dest}.pending"
+        os.replace(source, pending)
+        self._compressor = threading.Thread(
+            target=self._compress, args=(pending, dest), name="log-compressor", daemon=True
+        )
+        self._compressor.start()
+    
+    @staticmethod
+    def _compress(pending: str, dest: str):
+        with open(pending, 'rb') as src, gzip.open(f"{dest}.tmp", 'wb') as dst:
+            shutil.copyfileobj(src, dst)
+        os.replace(f"{dest}.tmp", dest)
+        os.remove(pending)
+    
+    def close(self):
+        super().close()
+        if self._compressor is not None:
+            self._compressor.join()
+
+
+class DroppingQueueHandler(QueueHandler):
+    """QueueHandler that counts and drops records when the queue is full"""
+    
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+    
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class BatchingQueueListener(QueueListener):
+    """QueueListener that writes records to its handlers in batches.
+    
+    A batch is written once it holds flush_size records or its oldest
+    record has waited flush_interval seconds, with a single write and
+    flush per stream handler instead of one per record.
+    """
+    
+    def __init__(self, log_queue: queue.Queue, *handlers, flush_size: int = 64,
+                 flush_interval: float = 0.5):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+    
+    def enqueue_sentinel(self):
+        # Block rather than fail when the queue is full at shutdown
+        self.queue.put(self._sentinel)
+    
+    def _monitor(self):
+        batch = []
+        deadline = 0.0
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                record = self.queue.get(True, timeout)
+            except queue.Empty:
+                # The oldest record waited flush_interval; the sentinel is None
+                # too, so the timeout must not fall through to the check below
+                self._write_batch(batch)
+                batch = []
+                continue
+            
+            if record is self._sentinel:
+                self._write_batch(batch)
+                break
+            if not batch:
+                deadline = time.monotonic() + self.flush_interval
+            batch.append(self.prepare(record))
+            if len(batch) >= self.flush_size or time.monotonic() >= deadline:
+                self._write_batch(batch)
+                batch = []
+    
+    def _write_batch(self, batch: List[logging.LogRecord]):
+        """Write a batch of records to every handler"""
+        if not batch:
+            return
+        for handler in self.handlers:
+            records = [record for record in batch if record.levelno >= handler.level]
+            if not records:
+                continue
+            if not isinstance(handler, logging.StreamHandler):
+                for record in records:
+                    handler.handle(record)
+                continue
+            
+            lines = []
+            for record in records:
+                try:
+                    lines.append(handler.format(record) + handler.terminator)
+                except Exception:
+                    handler.handleError(record)
+            handler.acquire()
+            try:
+                if isinstance(handler, BaseRotatingHandler) and handler.shouldRollover(records[0]):
+                    handler.doRollover()
+                if handler.stream is None and isinstance(handler, logging.FileHandler):
+                    handler.stream = handler._open()
+                handler.stream.write(''.join(lines))
+                handler.flush()
+            except Exception:
+                handler.handleError(records[-1])
+            finally:
+                handler.release()
+
 
 class GameLogger:
-    def __init__(self, log_level: str = "INFO", log_file: Optional[str] = None):
+    def __init__(self, log_level: str = "INFO", log_file: Optional[str] = None,
+                 non_blocking: bool = False, queue_size: int = 10000,
+                 flush_size: int = 64, flush_interval: float = 0.5,
+                 json_log: Optional[str] = None, json_max_bytes: int = 10 * 1024 * 1024,
+                 json_backup_count: int = 5, keep_text_logs: Optional[int] = None):
         self.log_level = log_level
         self.log_file = log_file or f"logs/ghost_black_ops_{datetime.now().strftime('%Y%m%d_%H%M%S')}.log"
+        self.non_blocking = non_blocking
+        self.queue_size = queue_size
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.json_log = json_log
+        self.json_max_bytes = json_max_bytes
+        self.json_backup_count = json_backup_count
+        self.queue_handler = None
+        self.listener = None
         
         # Create logs directory
         Path("logs").mkdir(exist_ok=True)
+        if keep_text_logs is not None:
+            self._prune_text_logs(keep_text_logs)
         
         self._setup_logger()
     
+    @staticmethod
+    def _prune_text_logs(keep: int):
+        """Delete all but the newest plain-text run logs"""
+        run_logs = sorted(Path("logs").glob("ghost_black_ops_*.log"))
+        for old_log in run_logs[:max(0, len(run_logs) - keep)]:
+            old_log.unlink(missing_ok=True)
+    
     def _setup_logger(self):
         """Setup logging configuration"""
         self.logger = logging.getLogger("GhostBlackOps")
@@ -25,10 +225,12 @@ class GameLogger:
         
         # Clear any existing handlers
         self.logger.handlers.clear()
+        self.logger.filters.clear()
+        self.logger.addFilter(LogContextFilter())
         
         # Formatter
         formatter = logging.Formatter(
-            '%(asctime)s | %(levelname)-8s | %(message)s',
+            '%(asctime)s.%(msecs)03d | %(levelname)-8s | %(message)s',
             datefmt='%Y-%m-%d %H:%M:%S'
         )
         
@@ -36,13 +238,60 @@ class GameLogger:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(self._get_log_level())
         console_handler.setFormatter(formatter)
-        self.logger.addHandler(console_handler)
         
         # File handler
         file_handler = logging.FileHandler(self.log_file)
         file_handler.setLevel(logging.DEBUG)
         file_handler.setFormatter(formatter)
-        self.logger.addHandler(file_handler)
+        handlers = [console_handler, file_handler]
+        
+        # Structured sink for downstream tools
+        if self.json_log:
+            Path(self.json_log).parent.mkdir(parents=True, exist_ok=True)
+            json_handler = CompressingRotatingFileHandler(
+                self.json_log, self.json_max_bytes, self.json_backup_count
+            )
+            json_handler.setLevel(logging.DEBUG)
+            json_handler.setFormatter(JsonLinesFormatter())
+            handlers.append(json_handler)
+        
+        if not self.non_blocking:
+            for handler in handlers:
+                self.logger.addHandler(handler)
+            return
+        
+        # Agents only enqueue records; a listener thread does the I/O
+        log_queue = queue.Queue(maxsize=self.queue_size)
+        self.queue_handler = DroppingQueueHandler(log_queue)
+        self.logger.addHandler(self.queue_handler)
+        self.listener = BatchingQueueListener(
+            log_queue, *handlers,
+            flush_size=self.flush_size,
+            flush_interval=self.flush_interval
+        )
+        self.listener.start()
+        atexit.register(self.close)
+    
+    @property
+    def dropped_messages(self) -> int:
+        """Number of records dropped because the log queue was full"""
+        return self.queue_handler.dropped if self.queue_handler else 0
+    
+    def close(self):
+        """Drain the log queue and stop the listener thread"""
+        if self.listener is None:
+            return
+        listener, self.listener = self.listener, None
+        listener.stop()
+        if self.dropped_messages:
+            record = self.logger.makeRecord(
+                self.logger.name, logging.WARNING, __file__, 0,
+                f"Log queue full: dropped {self.dropped_messages} messages", None, None
+            )
+            for handler in listener.handlers:
+                handler.handle(record)
+        for handler in listener.handlers:
+            handler.close()
     
     def _get_log_level(self):
         """Convert string log level to logging constant"""
@@ -55,34 +304,34 @@ class GameLogger:
         }
         return levels.get(self.log_level.upper(), logging.INFO)
     
-    def debug(self, message: str):
+    def debug(self, message: str, **fields):
         """Log debug message"""
-        self.logger.debug(message)
+        self.logger.debug(message, extra=fields)
     
-    def info(self, message: str):
+    def info(self, message: str, **fields):
         """Log info message"""
-        self.logger.info(message)
+        self.logger.info(message, extra=fields)
     
-    def warning(self, message: str):
+    def warning(self, message: str, **fields):
         """Log warning message"""
-        self.logger.warning(message)
+        self.logger.warning(message, extra=fields)
     
-    def error(self, message: str):
+    def error(self, message: str, **fields):
         """Log error message"""
-        self.logger.error(message)
+        self.logger.error(message, extra=fields)
     
-    def critical(self, message: str):
+    def critical(self, message: str, **fields):
         """Log critical message"""
-        self.logger.critical(message)
+        self.logger.critical(message, extra=fields)
     
-    def success(self, message: str):
+    def success(self, message: str, **fields):
         """Log success message (custom level)"""
-        self.logger.info(f"✅ SUCCESS: {message}")
+        self.logger.info(f"✅ SUCCESS: {message}", extra=fields)
     
-    def system(self, message: str):
+    def system(self, message: str, **fields):
         """Log system message (custom level)"""
-        self.logger.info(f"🖥️  SYSTEM: {message}")
+        self.logger.info(f"🖥️  SYSTEM: {message}", extra=fields)
     
-    def agent(self, message: str):
+    def agent(self, message: str, **fields):
         """Log agent message (custom level)"""
-        self.logger.info(f"🤖 AGENT: {message}")
+        self.logger.info(f"🤖 AGENT: {message}", extra=fields)
@@ -0,0 +1,108 @@
+"""
+Isolated workspaces and repeated timing shared by the benchmarks and the autotuner
+"""
+
+import os
+import shutil
+import statistics
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, List
+
+from utils.artifact_writer import ArtifactWriter
+from utils.build_cache import BuildCache
+from utils.render_pool import RenderPool
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    runs: int
+    median: float
+    p95: float
+    peak_alloc: int
+    files_written: int
+    samples: List[float] = field(default_factory=list)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+@contextmanager
+def workspace(prefix: str = 'ghost_bench_'):
+    """Run inside a fresh temporary project root with fresh shared writers.
+
+    Agents write relative to the working directory, and the writer, build
+    cache and render pool are process-wide, so all are reset for every
+    workspace.
+    """
+    previous = os.getcwd()
+    root = tempfile.mkdtemp(prefix=prefix)
+    ArtifactWriter._instance = None
+    BuildCache._shared.clear()
+    RenderPool._instance = None
+    os.chdir(root)
+    try:
+        yield Path(root)
+    finally:
+        os.chdir(previous)
+        if ArtifactWriter._instance is not None:
+            ArtifactWriter._instance.close()
+        ArtifactWriter._instance = None
+        BuildCache._shared.clear()
+        if RenderPool._instance is not None:
+            RenderPool._instance.close()
+        RenderPool._instance = None
+        shutil.rmtree(root, ignore_errors=True)
+
+
+async def measure(name: str, setup: Callable[[], Awaitable[Dict]],
+                  target: Callable[[Dict], Awaitable], repeat: int,
+                  warmup: int = 0, trace_memory: bool = True) -> BenchmarkResult:
+    """Time target(state) after setup() in a fresh workspace per run.
+
+    The first warmup runs are discarded so one-off costs such as module
+    imports do not land in a sample. With trace_memory, one extra run
+    records peak traced allocations, kept separate so tracemalloc overhead
+    does not distort the timings.
+    """
+    samples = []
+    files_written = 0
+    peak_alloc = 0
+    runs = warmup + repeat + (1 if trace_memory else 0)
+    for run in range(runs):
+        with workspace():
+            state = await setup()
+            writer = ArtifactWriter.shared(state.get('config', {}))
+            files_before = writer.stats['files']
+            tracing = trace_memory and run == runs - 1
+            if tracing:
+                tracemalloc.start()
+            started = time.perf_counter()
+            await target(state)
+            await writer.flush()
+            elapsed = time.perf_counter() - started
+            if tracing:
+                peak_alloc = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            elif run >= warmup:
+                samples.append(elapsed)
+            files_written = writer.stats['files'] - files_before
+
+    return BenchmarkResult(
+        name=name,
+        runs=repeat,
+        median=statistics.median(samples),
+        p95=percentile(samples, 95),
+        peak_alloc=peak_alloc,
+        files_written=files_written,
+        samples=samples
+    )
@@ -0,0 +1,87 @@
+"""
+Memory-budget admission control for scheduled tasks
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Iterable, Tuple
+
+import psutil
+
+GB = 1024 ** 3
+MB = 1024 ** 2
+
+
+class MemoryAdmission:
+    """Decide whether starting a task keeps the process within its memory budget.
+
+    A task's footprint is estimated from an exponentially weighted average
+    of what earlier runs of the same task added to the process, persisted
+    between runs. A task is admitted when the current RSS plus the
+    estimates of every running task and of the candidate stays within both
+    system.max_memory_gb and the memory the OS reports as available.
+    Estimates of running tasks are counted in full even though part of
+    their footprint is already in the RSS, which errs on the side of waiting.
+    """
+
+    def __init__(self, config: Dict):
+        system_config = config.get('system', {})
+        ai_config = config.get('ai', {})
+        self.enabled = ai_config.get('memory_admission', True)
+        self.budget = system_config.get('max_memory_gb', 6) * GB
+        self.headroom = ai_config.get('memory_headroom_gb', 0.5) * GB
+        self.default_estimate = ai_config.get('default_task_memory_mb', 64) * MB
+        self.smoothing = ai_config.get('memory_estimate_smoothing', 0.3)
+        self.history_path = Path(ai_config.get('memory_history_path', 'output/.task_memory.json'))
+
+        self.process = psutil.Process()
+        self.estimates: Dict[str, float] = {}
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.history_path, 'r') as f:
+                self.estimates = {name: float(value) for name, value in json.load(f).items()}
+        except (OSError, ValueError, AttributeError):
+            self.estimates = {}
+
+    def estimate(self, task: str) -> float:
+        """Expected bytes a task adds to the process"""
+        return self.estimates.get(task, self.default_estimate)
+
+    def observe(self, task: str, footprint: int):
+        """Fold a measured footprint into the task's estimate"""
+        footprint = max(0, footprint)
+        previous = self.estimates.get(task)
+        if previous is None:
+            self.estimates[task] = float(footprint)
+        else:
+            self.estimates[task] = previous + self.smoothing * (footprint - previous)
+        self._dirty = True
+
+    def limit(self) -> Tuple[int, float]:
+        """Return (current RSS, bytes the process may grow to)"""
+        rss = self.process.memory_info().rss
+        available = psutil.virtual_memory().available - self.headroom
+        return rss, min(self.budget, rss + available)
+
+    def admits(self, task: str, running: Iterable[str]) -> Tuple[bool, float, float]:
+        """Check a candidate task, returning (admitted, projected bytes, limit)"""
+        if not self.enabled:
+            return True, 0.0, 0.0
+        rss, limit = self.limit()
+        projected = rss + sum(self.estimate(name) for name in running) + self.estimate(task)
+        return projected <= limit, projected, limit
+
+    def save(self):
+        """Persist footprint estimates for the next run"""
+        if not self._dirty:
+            return
+        self.history_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = self.history_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(self.estimates, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.history_path)
+        self._dirty = False
@@ -0,0 +1,110 @@
+"""
+Per-phase cProfile capture with pstats dumps and folded stacks
+"""
+
+import cProfile
+import pstats
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+MAX_STACK_DEPTH = 128
+MIN_FOLDED_US = 1
+
+
+def _label(func: Tuple[str, int, str]) -> str:
+    """Render a pstats function key as module:function"""
+    filename, lineno, name = func
+    if filename == '~':
+        return name.strip('<>')
+    return f"{Path(filename).stem}:{name}:{lineno}"
+
+
+def folded_stacks(stats: pstats.Stats) -> Dict[str, int]:
+    """Rebuild flamegraph folded stacks (microseconds) from a pstats call graph.
+
+    cProfile keeps caller/callee edges rather than whole stacks, so a
+    function's time is split across its callers in proportion to the time
+    each caller spent in it. The result is exact for tree-shaped call graphs
+    and a close approximation otherwise.
+    """
+    entries = stats.stats
+    callees: Dict[tuple, List[tuple]] = {func: [] for func in entries}
+    for func, (_, _, _, _, callers) in entries.items():
+        for caller in callers:
+            if caller in callees:
+                callees[caller].append(func)
+
+    folded: Dict[str, int] = {}
+
+    def walk(func, stack: List[str], on_stack: set, scale: float):
+        _, _, own_time, total_time, _ = entries[func]
+        frames = stack + [_label(func)]
+        self_us = int(own_time * scale * 1e6)
+        if self_us >= MIN_FOLDED_US:
+            key = ';'.join(frames)
+            folded[key] = folded.get(key, 0) + self_us
+        if len(frames) >= MAX_STACK_DEPTH:
+            return
+        for callee in callees[func]:
+            if callee in on_stack:
+                continue
+            callee_total = entries[callee][3]
+            edge_total = entries[callee][4][func][3]
+            if callee_total <= 0 or edge_total * scale * 1e6 < MIN_FOLDED_US:
+                continue
+            on_stack.add(callee)
+            walk(callee, frames, on_stack, scale * edge_total / callee_total)
+            on_stack.discard(callee)
+
+    roots = [func for func, entry in entries.items() if not entry[4]]
+    for root in roots:
+        walk(root, [], {root}, 1.0)
+    return folded
+
+
+class PhaseProfiler:
+    def __init__(self, logger, output_dir: str = "profiles", top_n: int = 15):
+        self.logger = logger
+        self.output_dir = Path(output_dir)
+        self.top_n = top_n
+
+    @contextmanager
+    def profile(self, name: str):
+        """Profile the enclosed block and write name.pstats and name.folded"""
+        profiler = cProfile.Profile()
+        profiler.enable()
+        try:
+            yield profiler
+        finally:
+            profiler.disable()
+            self._save(name, profiler)
+
+    def _save(self, name: str, profiler: cProfile.Profile):
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        stats = pstats.Stats(profiler)
+        if not stats.stats:
+            return
+
+        pstats_path = self.output_dir / f"{name}.pstats"
+        stats.dump_stats(str(pstats_path))
+
+        folded_path = self.output_dir / f"{name}.folded"
+        with open(folded_path, 'w') as f:
+            for stack, micros in sorted(folded_stacks(stats).items()):
+                f.write(f"{stack} {micros}\n")
+
+        self.report(name, stats)
+        self.logger.info(f"Profile for {name} written to {pstats_path} and {folded_path}")
+
+    def report(self, name: str, stats: pstats.Stats):
+        """Log the functions with the most own time"""
+        ranked = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+        total = stats.total_tt
+        self.logger.info(f"=== Profile: {name} ({total * 1000:.1f}ms profiled) ===")
+        for rank, (func, (_, calls, own_time, total_time, _)) in enumerate(ranked[:self.top_n], 1):
+            share = own_time / total * 100 if total else 0.0
+            self.logger.info(
+                f"  {rank:>2}. {_label(func):<60} own {own_time * 1000:8.1f}ms ({share:4.1f}%)  "
+                f"cum {total_time * 1000:8.1f}ms  calls {calls}"
+            )
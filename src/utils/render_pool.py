@@ -0,0 +1,151 @@
+"""
+Process-pool execution for CPU-bound script rendering
+"""
+
+import asyncio
+import math
+import os
+import sys
+from typing import Any, Callable, Dict, List, Tuple
+
+RENDER_MODES = ('inline', 'process')
+
+
+def _init_worker(parent_path: List[str]):
+    """Give spawned workers the parent's import path so renderers can be unpickled"""
+    sys.path[:] = parent_path
+
+
+def render_batch(jobs: List[Tuple[Callable, tuple]]) -> List[Tuple[bool, Any]]:
+    """Run renderers in a worker, returning (succeeded, result or exception) per job"""
+    results = []
+    for func, args in jobs:
+        try:
+            results.append((True, func(*args)))
+        except Exception as e:
+            results.append((False, e))
+    return results
+
+
+class RenderPool:
+    """Run pure renderer functions inline or on a process pool.
+
+    Rendering C# from templates is string building that holds the GIL, so
+    it only runs in parallel across processes. Renderers must be
+    module-level functions of picklable arguments. Calls made in the same
+    event-loop iteration are collected and split into one chunk per worker,
+    so the per-call pickling round trip is paid once per chunk. Writing the
+    rendered text stays with the ArtifactWriter.
+    """
+
+    _instance = None
+
+    def __init__(self, mode: str = 'inline', process_workers: int = 0, batch_size: int = 64):
+        self.mode = mode
+        self.process_workers = process_workers or os.cpu_count() or 1
+        self.batch_size = batch_size
+        self.stats = {'renders': 0, 'batches': 0}
+
+        self._executor = None
+        self._pending = []
+        self._flush_handle = None
+
+    @classmethod
+    def shared(cls, config: Dict) -> 'RenderPool':
+        """Return the process-wide renderer configured from the render section"""
+        if cls._instance is None:
+            render_config = config.get('render', {})
+            cls._instance = cls(
+                mode=render_config.get('mode', 'inline'),
+                process_workers=render_config.get('process_workers', 0),
+                batch_size=render_config.get('batch_size', 64)
+            )
+        return cls._instance
+
+    async def render(self, func: Callable[..., str], *args) -> str:
+        """Return func(*args), computed in a worker process in process mode"""
+        self.stats['renders'] += 1
+        if self.mode != 'process':
+            return func(*args)
+        return await self._submit(func, args)
+
+    async def render_many(self, func: Callable[..., List[str]], records: List, *args) -> List[str]:
+        """Return func(records, *args) for a batch renderer such as render_weapon_scripts.
+
+        In process mode the records are split into one chunk per worker, at
+        most batch_size records each, and the results joined in order.
+        """
+        self.stats['renders'] += len(records)
+        if not records:
+            return []
+        if self.mode != 'process':
+            return func(records, *args)
+
+        chunk_size = min(self.batch_size, math.ceil(len(records) / self.process_workers))
+        chunks = await asyncio.gather(*(
+            self._submit(func, (records[start:start + chunk_size],) + args)
+            for start in range(0, len(records), chunk_size)
+        ))
+        return [result for chunk in chunks for result in chunk]
+
+    async def _submit(self, func: Callable, args: tuple) -> Any:
+        """Queue a call for the next flush to the process pool"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((func, args, future))
+        if len(self._pending) >= self.batch_size * self.process_workers:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_soon(self._flush)
+        return await future
+
+    def _pool(self):
+        if self._executor is None:
+            from concurrent.futures import ProcessPoolExecutor
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.process_workers,
+                initializer=_init_worker,
+                initargs=(list(sys.path),)
+            )
+        return self._executor
+
+    def _flush(self):
+        """Split pending renders into one chunk per worker and submit them"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        pending, self._pending = self._pending, []
+        chunk_size = min(self.batch_size, math.ceil(len(pending) / self.process_workers))
+        loop = asyncio.get_running_loop()
+        pool = self._pool()
+        for start in range(0, len(pending), chunk_size):
+            chunk = pending[start:start + chunk_size]
+            job = loop.run_in_executor(pool, render_batch, [(func, args) for func, args, _ in chunk])
+            job.add_done_callback(lambda done, chunk=chunk: self._resolve(done, chunk))
+            self.stats['batches'] += 1
+
+    @staticmethod
+    def _resolve(job: asyncio.Future, chunk: List[Tuple[Callable, tuple, asyncio.Future]]):
+        """Complete the futures of a rendered chunk"""
+        if job.cancelled() or job.exception() is not None:
+            error = asyncio.CancelledError() if job.cancelled() else job.exception()
+            for _, _, future in chunk:
+                if not future.done():
+                    future.set_exception(error)
+            return
+        for (_, _, future), (succeeded, value) in zip(chunk, job.result()):
+            if future.done():
+                continue
+            if succeeded:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+    def close(self):
+        """Shut down the worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,155 @@
+"""
+Event-loop stall detector
+
+A heartbeat callback on the event loop records when the loop last ran; a
+watchdog thread notices when the heartbeat is late and captures the loop
+thread's stack while it is still blocked.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+
+
+@dataclass
+class Stall:
+    task: str
+    location: str
+    blocking_call: str
+    stack: List[str]
+    duration: float = 0.0
+
+
+@dataclass
+class StallOffender:
+    location: str
+    task: str
+    blocking_call: str
+    count: int = 0
+    total: float = 0.0
+    worst: float = 0.0
+    stack: List[str] = field(default_factory=list)
+
+
+class StallDetector:
+    def __init__(self, logger, threshold: float = 0.1, interval: float = 0.02,
+                 report_count: int = 10):
+        self.logger = logger
+        self.threshold = threshold
+        self.interval = interval
+        self.report_count = report_count
+        self.stalls: List[Stall] = []
+        self.max_lag = 0.0
+
+        self._loop = None
+        self._loop_thread_id = None
+        self._last_beat = 0.0
+        self._handle = None
+        self._pending: Optional[Stall] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._watchdog = None
+
+    def start(self):
+        """Start the heartbeat on the running loop and the watchdog thread"""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._handle = self._loop.call_later(self.interval, self._beat)
+        self._stop.clear()
+        self._watchdog = threading.Thread(target=self._watch, name="stall-watchdog", daemon=True)
+        self._watchdog.start()
+
+    def stop(self):
+        """Stop monitoring"""
+        self._stop.set()
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+        if self._watchdog is not None:
+            self._watchdog.join()
+            self._watchdog = None
+
+    def _beat(self):
+        """Heartbeat callback; its lateness is the loop's lag"""
+        now = time.monotonic()
+        lag = now - self._last_beat - self.interval
+        self.max_lag = max(self.max_lag, lag)
+        with self._lock:
+            self._last_beat = now
+            stall, self._pending = self._pending, None
+        if stall is not None:
+            stall.duration = lag
+            self.stalls.append(stall)
+        self._handle = self._loop.call_later(self.interval, self._beat)
+
+    def _watch(self):
+        """Capture the loop thread's stack once per stall"""
+        while not self._stop.wait(self.interval / 2):
+            with self._lock:
+                blocked_for = time.monotonic() - self._last_beat - self.interval
+                if blocked_for < self.threshold or self._pending is not None:
+                    continue
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is None:
+                    continue
+                self._pending = self._describe(frame)
+
+    def _describe(self, frame) -> Stall:
+        """Summarise where the loop thread is blocked"""
+        summary = traceback.extract_stack(frame)
+        stack = [f"{Path(entry.filename).name}:{entry.lineno} {entry.name}" for entry in summary]
+
+        location = stack[-1]
+        for entry in reversed(summary):
+            path = Path(entry.filename).resolve()
+            if PROJECT_ROOT in path.parents and path.name != Path(__file__).name:
+                location = f"{path.relative_to(PROJECT_ROOT).as_posix()}:{entry.lineno} {entry.name}"
+                break
+
+        task = asyncio.current_task(self._loop)
+        task_name = 'event loop callback'
+        if task is not None:
+            task_name = getattr(task.get_coro(), '__qualname__', task.get_name())
+
+        return Stall(task=task_name, location=location, blocking_call=stack[-1], stack=stack[-8:])
+
+    def offenders(self) -> List[StallOffender]:
+        """Group stalls by blocking location, worst total first"""
+        grouped: Dict[str, StallOffender] = {}
+        for stall in self.stalls:
+            offender = grouped.get(stall.location)
+            if offender is None:
+                offender = grouped[stall.location] = StallOffender(
+                    stall.location, stall.task, stall.blocking_call, stack=stall.stack
+                )
+            offender.count += 1
+            offender.total += stall.duration
+            offender.worst = max(offender.worst, stall.duration)
+        return sorted(grouped.values(), key=lambda o: o.total, reverse=True)
+
+    def report(self):
+        """Log the worst blocking locations seen during the run"""
+        if not self.stalls:
+            self.logger.info(
+                f"Stall detector: no event-loop stalls over {self.threshold * 1000:.0f}ms "
+                f"(max lag {self.max_lag * 1000:.1f}ms)"
+            )
+            return
+        total = sum(stall.duration for stall in self.stalls)
+        self.logger.warning(
+            f"=== Event-loop stalls: {len(self.stalls)} over {self.threshold * 1000:.0f}ms, "
+            f"{total * 1000:.0f}ms blocked in total ==="
+        )
+        for rank, offender in enumerate(self.offenders()[:self.report_count], 1):
+            self.logger.warning(
+                f"  {rank}. {offender.location}  {offender.count}x  total {offender.total * 1000:.0f}ms  "
+                f"worst {offender.worst * 1000:.0f}ms  in {offender.task} -> {offender.blocking_call}"
+            )
@@ -2,11 +2,30 @@
 System validation for Ghost: Black Ops AI requirements
 """
 
+import hashlib
+import json
+import os
 import platform
 import psutil
 import sys
 from pathlib import Path
 
+def host_fingerprint() -> str:
+    """Identify the hardware a tuning profile was measured on.
+    
+    Only cheap, stable properties are used; the processor name is left out
+    because reading it spawns a subprocess on some platforms.
+    """
+    host = {
+        'platform': platform.system(),
+        'machine': platform.machine(),
+        'node': platform.node(),
+        'cpus': os.cpu_count(),
+        'memory_gb': round(psutil.virtual_memory().total / (1024**3)),
+        'python': platform.python_version()
+    }
+    return hashlib.sha256(json.dumps(host, sort_keys=True).encode()).hexdigest()[:16]
+
 class SystemValidator:
     def __init__(self):
         self.system_info = self._gather_system_info()
@@ -0,0 +1,122 @@
+"""
+Precompiled text templates for generated Unity C# sources
+"""
+
+import keyword
+import re
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List
+
+# {{ name }} slots; single braces are ordinary C# text
+PLACEHOLDER = re.compile(r'\{\{\s*(\w+)\s*\}\}')
+
+CSHARP_IDENTIFIER = re.compile(r'[A-Za-z_][A-Za-z0-9_]*\Z')
+CSHARP_KEYWORDS = frozenset('''
+    abstract as base bool break byte case catch char checked class const continue decimal default
+    delegate do double else enum event explicit extern false finally fixed float for foreach goto if
+    implicit in int interface internal is lock long namespace new null object operator out override
+    params private protected public readonly ref return sbyte sealed short sizeof stackalloc static
+    string struct switch this throw true try typeof uint ulong unchecked unsafe ushort using virtual
+    void volatile while
+'''.split())
+
+# Characters that cannot appear unescaped inside a C# string literal
+_CSHARP_SPECIAL = re.compile(r'[\\"\r\n\u0085\u2028\u2029]')
+_CSHARP_ESCAPES = str.maketrans({
+    '\\': '\\\\', '"': '\\"', '\r': '\\r', '\n': '\\n',
+    '\u0085': '\\u0085', '\u2028': '\\u2028', '\u2029': '\\u2029'
+})
+
+
+class CompiledTemplate:
+    """A template parsed once into literal text and named slots.
+
+    Compiling generates Python functions whose bodies are a single f-string
+    over the parts, so rendering builds the output in one pass (CPython
+    joins all the pieces at once) instead of by repeated concatenation,
+    and formats values exactly as f-string fields would. Repeated blocks
+    are rendered by join_rows into a list that is joined once.
+    """
+
+    __slots__ = ('source', 'fields', '_render', '_join_rows')
+
+    def __init__(self, source: str):
+        self.source = source
+        # split() alternates literal text and slot names: text, name, text, ...
+        parts = PLACEHOLDER.split(source)
+        self.fields = tuple(dict.fromkeys(parts[1::2]))
+        invalid = [name for name in self.fields
+                   if not name.isidentifier() or keyword.iskeyword(name) or name.startswith('_')]
+        if invalid:
+            raise ValueError(f"Template slot names must be public identifiers: {', '.join(invalid)}")
+
+        row_target = ''.join(f'{name}, ' for name in self.fields) or '_'
+        code = (
+            f"def render(_values):\n"
+            f"    return {self._fstring(parts, lambda name: f'_values[{name!r}]')}\n"
+            f"def join_rows(_rows):\n"
+            f"    return ''.join([{self._fstring(parts, str)} for {row_target} in _rows])\n"
+        )
+        namespace = {}
+        exec(compile(code, '<template>', 'exec'), namespace)
+        self._render = namespace['render']
+        self._join_rows = namespace['join_rows']
+
+    @staticmethod
+    def _fstring(parts: List[str], slot: Callable[[str], str]) -> str:
+        """Python source of one implicitly concatenated f-string over the parts"""
+        pieces = []
+        for index, part in enumerate(parts):
+            if index % 2:
+                pieces.append(f'f"{{{slot(part)}}}"')
+            elif part:
+                pieces.append('f' + repr(part.replace('{', '{{').replace('}', '}}')))
+        return '(' + ' '.join(pieces or ["''"]) + ')'
+
+    def render(self, values: Dict) -> str:
+        """Render one record"""
+        return self._render(values)
+
+    def render_many(self, records: Iterable[Dict]) -> List[str]:
+        """Render every record in one call"""
+        render = self._render
+        return [render(values) for values in records]
+
+    def join(self, records: Iterable[Dict], separator: str = '') -> str:
+        """Render every record and join the results"""
+        return separator.join(self.render_many(records))
+
+    def join_rows(self, rows: Iterable[tuple]) -> str:
+        """Render tuples holding the slot values in self.fields order and concatenate them.
+
+        The fast path for repeated blocks such as switch cases, where building
+        a dict per row would cost more than rendering it; zip() and
+        enumerate() produce suitable rows directly.
+        """
+        return self._join_rows(rows)
+
+
+def is_csharp_identifier(name: str) -> bool:
+    """Check that name can be used as a C# class or enum member name"""
+    return bool(CSHARP_IDENTIFIER.match(name)) and name not in CSHARP_KEYWORDS
+
+
+def csharp_string(value: str) -> str:
+    """Escape text for the inside of a C# string literal (or a // comment)"""
+    return value.translate(_CSHARP_ESCAPES) if _CSHARP_SPECIAL.search(value) else value
+
+
+def csharp_interpolated(value: str) -> str:
+    """Escape text for the inside of a C# $"..." interpolated string literal"""
+    return csharp_string(value).replace('{', '{{').replace('}', '}}')
+
+
+def csharp_string_list(values: Iterable[str]) -> str:
+    """Render values as the items of a C# string list initializer"""
+    return ', '.join([f'"{csharp_string(value)}"' for value in values])
+
+
+@lru_cache(maxsize=None)
+def compile_template(source: str) -> CompiledTemplate:
+    """Compile a template, returning the cached compiled form for repeated sources"""
+    return CompiledTemplate(source)
@@ -0,0 +1,169 @@
+"""
+Chrome trace-event spans for director tasks and helper sub-tasks
+
+Traces are written in the Trace Event Format and open directly in
+Perfetto (ui.perfetto.dev) or chrome://tracing.
+"""
+
+import asyncio
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+class Tracer:
+    _instance = None
+
+    def __init__(self):
+        self.enabled = False
+        self.events: List[Dict] = []
+        self.pid = os.getpid()
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+        self._task_lanes = {}
+        self._free_lanes = []
+        self._lane_count = 0
+        self._named_lanes = {}
+
+    @classmethod
+    def shared(cls) -> 'Tracer':
+        """Return the process-wide tracer"""
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def enable(self):
+        """Start recording spans"""
+        self.enabled = True
+        self._origin = time.perf_counter()
+        self.events.clear()
+        self._named_lanes.clear()
+
+    def _now(self) -> float:
+        """Microseconds since tracing was enabled"""
+        return (time.perf_counter() - self._origin) * 1e6
+
+    def _name_lane(self, lane, name: str):
+        """Label a lane once; callers hold the lock"""
+        if lane not in self._named_lanes:
+            self._named_lanes[lane] = name
+            self.events.append({
+                'ph': 'M', 'name': 'thread_name', 'pid': self.pid, 'tid': lane,
+                'args': {'name': name}
+            })
+
+    def _acquire_lane(self):
+        """Return the lane for the current asyncio task or thread.
+
+        Each asyncio task holds a lane while it has a span open, and lanes
+        are reused once released, so the number of lanes matches peak
+        concurrency rather than the number of tasks ever created.
+        """
+        try:
+            owner = asyncio.current_task()
+        except RuntimeError:
+            owner = None
+        if owner is None:
+            thread = threading.current_thread()
+            return thread.ident, None, thread.name
+
+        with self._lock:
+            entry = self._task_lanes.get(owner)
+            if entry is None:
+                if self._free_lanes:
+                    lane = self._free_lanes.pop()
+                else:
+                    self._lane_count += 1
+                    lane = self._lane_count
+                    self._name_lane(lane, f"async lane {lane}")
+                entry = self._task_lanes[owner] = [lane, 0]
+            entry[1] += 1
+        return entry[0], owner, None
+
+    def _release_lane(self, owner):
+        if owner is None:
+            return
+        with self._lock:
+            entry = self._task_lanes[owner]
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._task_lanes[owner]
+                self._free_lanes.append(entry[0])
+
+    @contextmanager
+    def span(self, name: str, category: str = 'task', args: Optional[Dict] = None):
+        """Record a complete event around the enclosed block"""
+        if not self.enabled:
+            yield
+            return
+        lane, owner, thread_name = self._acquire_lane()
+        started = self._now()
+        try:
+            yield
+        finally:
+            event = {
+                'ph': 'X', 'name': name, 'cat': category, 'pid': self.pid, 'tid': lane,
+                'ts': started, 'dur': self._now() - started
+            }
+            if args:
+                event['args'] = args
+            with self._lock:
+                if thread_name is not None:
+                    self._name_lane(lane, thread_name)
+                self.events.append(event)
+            self._release_lane(owner)
+
+    def add_span(self, name: str, category: str, started: float, finished: float,
+                 lane_name: str, args: Optional[Dict] = None):
+        """Record a span measured elsewhere (perf_counter values) on a named lane"""
+        if not self.enabled:
+            return
+        event = {
+            'ph': 'X', 'name': name, 'cat': category, 'pid': self.pid, 'tid': 0,
+            'ts': (started - self._origin) * 1e6, 'dur': (finished - started) * 1e6
+        }
+        if args:
+            event['args'] = args
+        with self._lock:
+            self._name_lane(0, lane_name)
+            self.events.append(event)
+
+    def save(self, path: str) -> Optional[Path]:
+        """Write recorded spans as a trace-event JSON file"""
+        if not self.events:
+            return None
+        trace_path = Path(path)
+        trace_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            trace = {'traceEvents': list(self.events), 'displayTimeUnit': 'ms'}
+        temp_path = trace_path.with_suffix('.tmp')
+        with open(temp_path, 'w') as f:
+            json.dump(trace, f)
+        os.replace(temp_path, trace_path)
+        return trace_path
+
+
+def traced(category: str = 'helper', detail_key: str = 'name'):
+    """Trace an async method as a span named Class.method.
+
+    When the first argument is a dict carrying detail_key (a weapon, scene
+    or mission definition), its value is attached to the span.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        async def wrapper(self, *args, **kwargs):
+            tracer = Tracer.shared()
+            if not tracer.enabled:
+                return await func(self, *args, **kwargs)
+            span_args = {}
+            if args and isinstance(args[0], dict) and detail_key in args[0]:
+                span_args[detail_key] = args[0][detail_key]
+            with tracer.span(f"{type(self).__name__}.{func.__name__}", category, span_args):
+                return await func(self, *args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,8 @@
+"""
+Shared test setup: make the src packages importable the way main.py does
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
@@ -0,0 +1,251 @@
+"""
+Tests for streaming content packs: spec parsing, validation and batching
+"""
+
+import asyncio
+import copy
+import gzip
+import json
+import logging
+import threading
+
+import pytest
+
+from game_agents.asset_generator import DEFAULT_WEAPONS
+from game_agents.character_creator import DEFAULT_TEAM_MEMBERS
+from utils.content_pack import ContentError, ContentPack, batched, read_specs, validate_record
+
+LOGGER = logging.getLogger("GhostBlackOps.tests")
+
+
+def weapon(**overrides):
+    record = copy.deepcopy(DEFAULT_WEAPONS[0])
+    record.update(overrides)
+    return record
+
+
+def write_jsonl(path, records):
+    path.write_text(''.join(json.dumps(record) + '\n' for record in records))
+    return path
+
+
+def pack(directory, **content):
+    return ContentPack({'content': dict(pack_dir=str(directory), **content)}, LOGGER)
+
+
+# validate_record
+
+def test_builtin_records_are_valid():
+    assert validate_record('weapons', weapon()) == []
+    assert validate_record('characters', DEFAULT_TEAM_MEMBERS[0]) == []
+
+
+def test_missing_required_fields_are_all_reported():
+    record = weapon()
+    del record['damage'], record['range']
+    assert validate_record('weapons', record) == ['weapons.damage is required', 'weapons.range is required']
+
+
+def test_optional_fields_may_be_missing():
+    record = weapon()
+    del record['unlock_requirement']
+    assert validate_record('weapons', record) == []
+
+
+@pytest.mark.parametrize('overrides, problem', [
+    ({'damage': 'lots'}, "weapons.damage must be float, got str 'lots'"),
+    ({'damage': True}, 'weapons.damage must be float, got True'),
+    ({'damage': -1}, 'weapons.damage must be at least 0, got -1'),
+    ({'damage': float('nan')}, 'weapons.damage must be a finite number, got nan'),
+    ({'special_features': 'Scope'}, "weapons.special_features must be list, got str 'Scope'"),
+    ({'special_features': ['Scope', 3]}, 'weapons.special_features must be a list of strings'),
+])
+def test_field_types_are_checked(overrides, problem):
+    assert validate_record('weapons', weapon(**overrides)) == [problem]
+
+
+def test_nested_fields_use_dotted_paths():
+    record = copy.deepcopy(DEFAULT_TEAM_MEMBERS[0])
+    del record['attributes']['hacking']
+    record['personality'] = 'cheerful'
+    problems = validate_record('characters', record)
+    assert 'characters.attributes.hacking is required' in problems
+    assert 'characters.personality.humor_level is required' in problems
+
+
+@pytest.mark.parametrize('name', ['', ' ', '../M4', 'a/b', 'a\\b', '.hidden'])
+def test_keys_that_are_not_file_names_are_rejected(name):
+    problems = validate_record('weapons', weapon(name=name))
+    assert f"weapons.name is not usable as a file name: {name!r}" in problems
+
+
+@pytest.mark.parametrize('overrides', [{'name': 'M4-A1'}, {'name': '1911'}, {'type': 'class'}])
+def test_derived_csharp_identifiers_are_checked(overrides):
+    field, value = next(iter(overrides.items()))
+    problems = validate_record('weapons', weapon(**overrides))
+    assert any(problem.startswith(f"weapons.{field} {value!r} does not make a valid C# identifier")
+               for problem in problems)
+
+
+def test_names_with_spaces_make_valid_identifiers():
+    assert validate_record('weapons', weapon(name='M4 A1', type='Battle Rifle')) == []
+
+
+def test_non_object_records_are_rejected():
+    assert validate_record('weapons', ['M4']) == ['record must be an object, got list']
+
+
+# read_specs
+
+def test_jsonl_skips_blank_lines_and_reports_bad_json(tmp_path):
+    path = tmp_path / 'weapons.jsonl'
+    path.write_text(json.dumps(weapon()) + '\n\n{not json\n' + json.dumps(weapon(name='M4')) + '\n')
+    rows = list(read_specs(path, 'weapons'))
+    assert [(line, problems) for line, _, problems in rows][0] == (1, [])
+    assert rows[1][0] == 3 and rows[1][2][0].startswith('invalid JSON')
+    assert rows[2][:2] == (4, weapon(name='M4'))
+
+
+def test_csv_cells_are_parsed_by_field_type(tmp_path):
+    path = tmp_path / 'characters.csv'
+    record = DEFAULT_TEAM_MEMBERS[0]
+    columns = ['callsign', 'role'] + [f"attributes.{key}" for key in record['attributes']] + \
+        [f"personality.{key}" for key in record['personality']] + ['quotes', 'notes']
+    cells = [record['callsign'], record['role']] + [str(value) for value in record['attributes'].values()] + \
+        [str(value) for value in record['personality'].values()] + [' | '.join(record['quotes']), '']
+    path.write_text(','.join(columns) + '\n' + ','.join(f'"{cell}"' for cell in cells) + '\n')
+
+    (line, parsed, problems), = read_specs(path, 'characters')
+    assert (line, problems) == (2, [])
+    assert parsed['attributes'] == record['attributes']
+    assert parsed['personality'] == record['personality']
+    assert parsed['quotes'] == record['quotes']
+    assert 'notes' not in parsed
+
+
+def test_csv_numbers_keep_int_and_float_types(tmp_path):
+    path = tmp_path / 'scenes.csv'
+    path.write_text('name,type,enemy_count,objectives\nDocks,stealth,25,x\n')
+    (_, parsed, problems), = read_specs(path, 'scenes')
+    assert parsed['enemy_count'] == 25 and isinstance(parsed['enemy_count'], int)
+    assert problems == ["scenes.objectives must be int, got str 'x'"]
+
+
+def test_csv_list_cells_accept_json_arrays(tmp_path):
+    path = tmp_path / 'scenes.csv'
+    path.write_text('name,type,enemy_count,special_features\nDocks,stealth,3,"[""a|b"", ""c""]"\n')
+    (_, parsed, _), = read_specs(path, 'scenes')
+    assert parsed['special_features'] == ['a|b', 'c']
+
+
+def test_csv_rows_with_extra_cells_are_rejected(tmp_path):
+    path = tmp_path / 'scenes.csv'
+    path.write_text('name,type,enemy_count\nDocks,stealth,3,surplus,more\n')
+    (_, _, problems), = read_specs(path, 'scenes')
+    assert problems == ['row has 2 more cells than the header has columns']
+
+
+def test_gzipped_specs_are_read(tmp_path):
+    path = tmp_path / 'weapons.jsonl.gz'
+    with gzip.open(path, 'wt') as f:
+        f.write(json.dumps(weapon()) + '\n')
+    assert [record for _, record, _ in read_specs(path, 'weapons')] == [weapon()]
+
+
+# ContentPack
+
+def test_kinds_without_a_spec_file_use_the_default(tmp_path):
+    default = [weapon()]
+    assert pack(tmp_path).records('weapons', default) is default
+    assert ContentPack({}, LOGGER).records('weapons', default) is default
+
+
+def test_invalid_records_are_skipped_and_logged(tmp_path, caplog):
+    write_jsonl(tmp_path / 'weapons.jsonl', [weapon(), weapon(name='M4', damage='lots'), weapon(name='M4')])
+    with caplog.at_level(logging.WARNING):
+        records = list(pack(tmp_path).records('weapons', []))
+    assert [record['name'] for record in records] == [weapon()['name'], 'M4']
+    assert 'weapons.jsonl:2' in caplog.text
+
+
+@pytest.mark.parametrize('first, second', [('AK 47', 'AK47'), ('AK 47', 'ak_47'), ('M4', 'm4')])
+def test_records_writing_the_same_files_are_duplicates(tmp_path, first, second):
+    write_jsonl(tmp_path / 'weapons.jsonl', [weapon(name=first), weapon(name=second)])
+    assert [record['name'] for record in pack(tmp_path).records('weapons', [])] == [first]
+
+
+def test_strict_packs_raise_on_the_first_invalid_record(tmp_path):
+    write_jsonl(tmp_path / 'weapons.jsonl', [weapon(), weapon(), weapon(name='M4-A1')])
+    records = pack(tmp_path, strict=True).records('weapons', [])
+    with pytest.raises(ContentError) as raised:
+        list(records)
+    assert raised.value.source.endswith('weapons.jsonl:2')
+    name = weapon()['name']
+    assert raised.value.problems == [f"name {name!r} writes the same files as {name!r} on line 1"]
+
+
+def test_jsonl_is_preferred_over_csv(tmp_path):
+    write_jsonl(tmp_path / 'weapons.jsonl', [weapon()])
+    (tmp_path / 'weapons.csv').write_text('name\nignored\n')
+    assert pack(tmp_path).spec_file('weapons') == tmp_path / 'weapons.jsonl'
+
+
+# batching
+
+@pytest.mark.parametrize('count, size, sizes', [(0, 3, []), (2, 3, [2]), (6, 3, [3, 3]), (7, 3, [3, 3, 1])])
+def test_batched_splits_into_fixed_size_lists(count, size, sizes):
+    assert [len(batch) for batch in batched(range(count), size)] == sizes
+
+
+def test_batched_pulls_lazily():
+    pulled = []
+
+    def source():
+        for item in range(10):
+            pulled.append(item)
+            yield item
+
+    batches = batched(source(), 4)
+    assert next(batches) == [0, 1, 2, 3]
+    assert pulled == [0, 1, 2, 3]
+
+
+def test_run_batched_awaits_each_batch_before_the_next(tmp_path):
+    content = pack(tmp_path, batch_size=2)
+    events = []
+
+    async def handle(batch):
+        events.append(('start', batch))
+        await asyncio.sleep(0)
+        events.append(('end', batch))
+
+    assert asyncio.run(content.run_batched(iter(range(5)), handle)) == 5
+    assert events == [('start', [0, 1]), ('end', [0, 1]), ('start', [2, 3]), ('end', [2, 3]),
+                      ('start', [4]), ('end', [4])]
+
+
+def test_run_batched_reads_records_off_the_event_loop_thread(tmp_path):
+    content = pack(tmp_path, batch_size=2)
+    readers = set()
+
+    def source():
+        for item in range(3):
+            readers.add(threading.get_ident())
+            yield item
+
+    async def handle(batch):
+        pass
+
+    assert asyncio.run(content.run_batched(source(), handle)) == 3
+    assert threading.get_ident() not in readers
+
+
+def test_run_batched_raises_strict_errors_from_the_reader(tmp_path):
+    write_jsonl(tmp_path / 'weapons.jsonl', [weapon(), weapon(damage='high')])
+    content = pack(tmp_path, strict=True)
+
+    async def handle(batch):
+        pass
+
+    with pytest.raises(ContentError):
+        asyncio.run(content.run_batched(content.records('weapons', []), handle))
@@ -0,0 +1,56 @@
+"""
+Tests for the batching log listener behind --async-logs
+"""
+
+import logging
+import queue
+import time
+
+from utils.logger import BatchingQueueListener
+
+
+class CollectingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return condition()
+
+
+def record(message):
+    return logging.LogRecord("GhostBlackOps.tests", logging.INFO, __file__, 0, message, None, None)
+
+
+def test_records_after_an_idle_gap_are_written():
+    log_queue = queue.Queue()
+    handler = CollectingHandler()
+    listener = BatchingQueueListener(log_queue, handler, flush_interval=0.05)
+    listener.start()
+    try:
+        log_queue.put(record('before'))
+        assert wait_for(lambda: handler.messages == ['before'])
+        # Idle for several flush intervals with nothing queued
+        time.sleep(0.2)
+        assert listener._thread.is_alive()
+        log_queue.put(record('after'))
+        assert wait_for(lambda: handler.messages == ['before', 'after'])
+    finally:
+        listener.stop()
+
+
+def test_stop_writes_records_still_batched():
+    log_queue = queue.Queue()
+    handler = CollectingHandler()
+    listener = BatchingQueueListener(log_queue, handler, flush_interval=60)
+    listener.start()
+    log_queue.put(record('pending'))
+    listener.stop()
+    assert handler.messages == ['pending']